@@ -0,0 +1,279 @@
+"""
+Multi-process sharded batch execution.
+
+Tasks from a JSONL dataset are spread across N worker processes. Each worker
+runs its own event loop with a bounded number of tasks in flight and one
+shared model client. All workers share a local SQLite store that holds the
+global request-rate token bucket and the per-task results, which are merged
+into results.jsonl at the end.
+
+Every task writes its transcripts to <output>/transcripts/<task id>-<hash>/, so an
+interrupted batch can be restarted: finished tasks are skipped and tasks that
+completed Phase 1 resume from their checkpoint.
+
+With --deferred, model calls go through the provider's Batch API instead
+(see utils.deferred): one worker advances many tasks in lock-step and each
+step's requests are submitted as one batch job. Much cheaper, much slower per
+task; meant for offline evaluation.
+
+Usage:
+    python batch.py dataset.jsonl --output runs/exp1 --workers 4 --in-flight 2
+    python batch.py dataset.jsonl --output runs/exp1 --deferred
+    python batch.py dataset.jsonl --output runs/exp1 --export runs/exp1/results.parquet
+"""
+import argparse
+import asyncio
+import hashlib
+import multiprocessing
+import re
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import (
+    MODEL_NAME,
+    GROUP_NAMES,
+    BATCH_WORKERS,
+    BATCH_MAX_IN_FLIGHT,
+    BATCH_REQUESTS_PER_MINUTE,
+    DEFERRED_MAX_IN_FLIGHT
+)
+from utils.batch_store import BatchStore
+from utils.dataset import load_dataset
+from utils.results_table import result_row, write_table
+
+
+DB_FILENAME = "batch.db"
+
+
+def _safe_name(task_id: str) -> str:
+    """Turn a dataset id into a safe directory name, unique per id ("a/b" and "a_b" differ)."""
+    digest = hashlib.sha1(task_id.encode('utf-8')).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9_.-]', '_', task_id) or 'task'}-{digest}"
+
+
+async def _run_worker(
+    worker_id: int,
+    items: List[Dict[str, Any]],
+    output_dir: Path,
+    max_in_flight: int,
+    requests_per_minute: float,
+    model_name: str,
+    pipelined: bool = False,
+    deferred: bool = False
+):
+    """Run one shard of tasks inside a worker process."""
+    from config import API_KEY, SystemConfig
+    from main import MultiAgentDebateSystem
+    from orchestration import PipelinedScheduler
+    from teams import GroupTeamPool
+    from utils.deferred import create_deferred_client
+    from utils.model_client import create_model_client
+    from utils.rate_limit import SharedRateLimiter, RateLimitedChatClient
+    from utils.workspace import WorkspaceManager
+
+    db_path = output_dir / DB_FILENAME
+    store = BatchStore(db_path)
+    limiter = SharedRateLimiter(db_path, requests_per_minute=requests_per_minute)
+
+    # One model client (and connection pool) per worker, shared by all its tasks
+    if deferred:
+        # Batch jobs are not subject to the per-minute request limit
+        model_client, transport = create_deferred_client(model_name, API_KEY)
+    else:
+        transport = None
+        model_client = RateLimitedChatClient(
+            create_model_client(model_name, API_KEY),
+            limiter
+        )
+    semaphore = asyncio.Semaphore(max_in_flight)
+    # Teams and systems must agree on the model (the pool checks its config)
+    config = SystemConfig().with_overrides(model_name=model_name)
+    # Teams are built once per worker and reset between tasks
+    team_pool = GroupTeamPool(
+        model_client,
+        work_dir=output_dir / "coding" / f"worker{worker_id}",
+        max_active=len(GROUP_NAMES) * max_in_flight,
+        config=config
+    )
+    workspaces = WorkspaceManager(
+        root=output_dir / "coding" / f"worker{worker_id}" / "runs",
+        pool_size=max_in_flight + 1
+    )
+
+    def create_system(item: Dict[str, Any]) -> MultiAgentDebateSystem:
+        name = _safe_name(item["id"])
+        return MultiAgentDebateSystem(
+            model_client=model_client,
+            config=config,
+            session_dir=output_dir / "transcripts" / name,
+            team_pool=team_pool,
+            workspaces=workspaces,
+            summary_only=True
+        )
+
+    def record_result(item: Dict[str, Any], result: Dict[str, Any]):
+        result = {"task": item["task"], **result}
+        row = result_row(result, task_id=item["id"], gold=item["gold"])
+        data = {key: value for key, value in row.items() if key not in ("id", "status")}
+        store.record(item["id"], item["index"], row["status"], data, worker=worker_id)
+        if row["status"] == "error":
+            print(f"[WORKER {worker_id}] Task {item['id']} failed: {(result['error'] or 'error').splitlines()[0]}")
+        else:
+            print(f"[WORKER {worker_id}] Task {item['id']} completed")
+
+    async def run_item(item: Dict[str, Any]):
+        async with semaphore:
+            try:
+                system = create_system(item)
+                try:
+                    result = await system.run(item["task"], verbose=False, resume=True)
+                finally:
+                    system.cleanup()
+            except Exception as e:
+                result = {"error": f"{e}\n{traceback.format_exc()}"}
+            record_result(item, result)
+
+    try:
+        if pipelined:
+            # Overlap Phase 1 of later tasks with Phase 2 of earlier ones
+            scheduler = PipelinedScheduler(
+                system_factory=create_system,
+                group_workers=len(GROUP_NAMES) * max_in_flight,
+                debate_workers=max_in_flight
+            )
+            await scheduler.run(items, on_result=record_result)
+        else:
+            await asyncio.gather(*[run_item(item) for item in items])
+    finally:
+        team_pool.cleanup()
+        await workspaces.wait_cleanup()
+        workspaces.cleanup()
+        if transport is not None:
+            stats = transport.stats()
+            print(f"[WORKER {worker_id}] {stats['requests']} model calls in {stats['batches']} batches "
+                  f"(mean batch size {stats['mean_batch_size']:.1f})")
+        await model_client.close()
+
+
+def _worker_main(worker_id: int, items: List[Dict[str, Any]], output_dir: Path,
+                 max_in_flight: int, requests_per_minute: float, model_name: str,
+                 pipelined: bool, deferred: bool):
+    """Process entry point for a worker."""
+    asyncio.run(_run_worker(worker_id, items, output_dir, max_in_flight,
+                            requests_per_minute, model_name, pipelined, deferred))
+
+
+def run_sharded(
+    dataset_path: Path,
+    output_dir: Path,
+    num_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    requests_per_minute: float = BATCH_REQUESTS_PER_MINUTE,
+    model_name: str = MODEL_NAME,
+    pipelined: bool = False,
+    export_path: Optional[Path] = None,
+    deferred: bool = False
+) -> Path:
+    """
+    Run a dataset across several worker processes and merge the results.
+
+    Args:
+        dataset_path: JSONL dataset (see utils.dataset.load_dataset)
+        output_dir: Directory for the store, transcripts, workspaces and results
+        num_workers: Number of worker processes (default: BATCH_WORKERS, or
+            1 when deferred so all tasks share the same batches)
+        max_in_flight: Concurrent tasks per worker (default: BATCH_MAX_IN_FLIGHT,
+            or DEFERRED_MAX_IN_FLIGHT when deferred)
+        requests_per_minute: Global model request rate across all workers
+        model_name: OpenAI model name
+        pipelined: Overlap Phase 1 and Phase 2 across tasks inside each worker
+            (see orchestration.pipeline.PipelinedScheduler)
+        export_path: Also write the results as a Parquet/Arrow table
+            (see utils.results_table; score it with evaluate.py)
+        deferred: Run model calls as Batch API jobs (see utils.deferred)
+
+    Returns:
+        Path to the merged results.jsonl
+    """
+    if num_workers is None:
+        num_workers = 1 if deferred else BATCH_WORKERS
+    if max_in_flight is None:
+        max_in_flight = DEFERRED_MAX_IN_FLIGHT if deferred else BATCH_MAX_IN_FLIGHT
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    store = BatchStore(output_dir / DB_FILENAME)
+
+    items = load_dataset(dataset_path)
+    done = store.completed_ids()
+    pending = [item for item in items if item["id"] not in done]
+    print(f"[BATCH] {len(items)} tasks, {len(done)} already completed, {len(pending)} to run")
+
+    num_workers = max(1, min(num_workers, len(pending)))
+    if pending:
+        # Spawn (not fork) so each worker starts with a clean event loop and clients
+        ctx = multiprocessing.get_context("spawn")
+        workers = [
+            ctx.Process(
+                target=_worker_main,
+                args=(i, pending[i::num_workers], output_dir, max_in_flight,
+                      requests_per_minute, model_name, pipelined, deferred),
+                name=f"batch-worker-{i}"
+            )
+            for i in range(num_workers)
+        ]
+        print(f"[BATCH] Starting {len(workers)} workers ({max_in_flight} tasks in flight each)")
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    results_path = store.export_jsonl(output_dir / "results.jsonl")
+    rows = store.results()
+    failed = sum(1 for row in rows if row["status"] != "ok")
+    print(f"[BATCH] Results merged into {results_path} ({failed} failed)")
+    if export_path:
+        for row in rows:
+            row.pop("index", None)
+            row.pop("worker", None)
+        table_path = write_table(rows, export_path)
+        print(f"[BATCH] Results table written to {table_path}")
+    return results_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a dataset across worker processes.")
+    parser.add_argument("dataset", type=Path, help="JSONL dataset")
+    parser.add_argument("--output", type=Path, default=Path("tmp/batch"), help="Output directory")
+    parser.add_argument("--workers", type=int,
+                        help=f"Worker processes (default: {BATCH_WORKERS}, 1 with --deferred)")
+    parser.add_argument("--in-flight", type=int,
+                        help=f"Concurrent tasks per worker (default: {BATCH_MAX_IN_FLIGHT}, "
+                             f"{DEFERRED_MAX_IN_FLIGHT} with --deferred)")
+    parser.add_argument("--rpm", type=float, default=BATCH_REQUESTS_PER_MINUTE,
+                        help="Global model requests per minute")
+    parser.add_argument("--model", default=MODEL_NAME, help="Model name")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Overlap Phase 1 and Phase 2 across tasks in each worker")
+    parser.add_argument("--export", type=Path,
+                        help="Also write results to this .parquet/.arrow file (needs pyarrow)")
+    parser.add_argument("--deferred", action="store_true",
+                        help="Submit model calls as Batch API jobs (cheaper, not interactive)")
+    args = parser.parse_args()
+
+    run_sharded(
+        dataset_path=args.dataset,
+        output_dir=args.output,
+        num_workers=args.workers,
+        max_in_flight=args.in_flight,
+        requests_per_minute=args.rpm,
+        model_name=args.model,
+        pipelined=args.pipeline,
+        export_path=args.export,
+        deferred=args.deferred
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Startup benchmark: time and memory from process start to the first model call.
+
+Every run starts a fresh interpreter (a cold start, as in a CLI run or a
+spawned batch worker), imports main, builds a MultiAgentDebateSystem and runs
+a task until the first request to the model, which is intercepted so no API
+call is made. Reported per run:
+
+- import:     `import main`
+- init:       MultiAgentDebateSystem(...)
+- first call: process start -> first model request
+- peak RSS:   maximum resident memory of the process at that point
+
+Usage:
+    python bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+BENCH_PREFIX = "BENCH "
+
+
+def _child(process_start: float):
+    """Measure one cold start (runs in a fresh interpreter)."""
+    import asyncio
+    import resource
+    import shutil
+    import tempfile
+
+    started = time.perf_counter()
+    from main import MultiAgentDebateSystem
+    imported = time.perf_counter()
+
+    from config import MODEL_NAME
+    from utils.model_client import ChatClientWrapper, create_model_client
+
+    timings = {"import": imported - started}
+
+    class FirstCallProbe(ChatClientWrapper):
+        """Reports the measurements on the first model request and exits."""
+
+        async def create(self, messages, **kwargs):
+            timings["first_call"] = time.time() - process_start
+            timings["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(BENCH_PREFIX + json.dumps(timings), flush=True)
+            shutil.rmtree(work_dir, ignore_errors=True)
+            os._exit(0)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_startup_"))
+    system = MultiAgentDebateSystem(
+        model_client=FirstCallProbe(create_model_client(MODEL_NAME, "sk-benchmark")),
+        work_dir=work_dir,
+        enable_logging=False
+    )
+    timings["init"] = time.perf_counter() - imported
+
+    asyncio.run(system.run("What is 2 + 2?", verbose=False, use_cache=False))
+    raise RuntimeError("The run finished without calling the model")
+
+
+def run_once() -> dict:
+    """Start one child process and return its measurements."""
+    process_start = time.time()
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", repr(process_start)],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(BENCH_PREFIX):
+            return json.loads(line[len(BENCH_PREFIX):])
+    raise RuntimeError(f"Benchmark run failed:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start to the first model call.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts")
+    parser.add_argument("--child", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        _child(args.child)
+        return
+
+    results = [run_once() for _ in range(args.runs)]
+
+    print(f"Cold start to first model call ({args.runs} runs, median / min / max)")
+    print("-" * 60)
+    for key, unit in (("import", "s"), ("init", "s"), ("first_call", "s"), ("peak_rss_mb", "MB")):
+        values = [r[key] for r in results]
+        print(f"  {key:<12} {statistics.median(values):8.3f} / {min(values):8.3f} / {max(values):8.3f} {unit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
 """Configuration module."""
 from .settings import *
+from .system import SystemConfig
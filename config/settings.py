@@ -10,24 +10,125 @@ load_dotenv()
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
-CODING_DIR = BASE_DIR / "coding"
-CODING_DIR.mkdir(exist_ok=True)
+CODING_DIR = BASE_DIR / "coding"  # created on first use
 
 # Model configuration
 MODEL_NAME = "gpt-4o"
 API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. a local stub server; None = api.openai.com
 
 # Agent configuration
 MAX_GROUP_MESSAGES = 15  # Maximum messages per group in Phase 1
 MAX_DEBATE_ROUNDS = 10     # Maximum debate rounds in Phase 2
 
+# Per-task budget (MultiAgentDebateSystem.run deadline / token_budget); None = unlimited.
+# When it runs out the task stops early and returns a degraded answer.
+TASK_DEADLINE_SECONDS = float(os.environ["TASK_DEADLINE"]) if os.getenv("TASK_DEADLINE") else None
+TASK_TOKEN_BUDGET = int(os.environ["TASK_TOKEN_BUDGET"]) if os.getenv("TASK_TOKEN_BUDGET") else None
+
 # Termination keywords
 REPORT_READY_KEYWORD = "REPORT_READY"
 CONSENSUS_REACHED_KEYWORD = "CONSENSUS_REACHED"
 
+# Stop the debate early once leader positions converge (orchestration/convergence.py)
+DEBATE_CONVERGENCE_ENABLED = True
+DEBATE_STABLE_ROUNDS = 2   # rounds without any position change before stopping
+
 # Group names
-GROUP_NAMES = ["Group1", "Group2", "Group3"]
+NUM_GROUPS = int(os.getenv("NUM_GROUPS", "3"))
+GROUP_NAMES = [f"Group{i}" for i in range(1, NUM_GROUPS + 1)]
+
+# Phase 2 with many groups (orchestration/tournament.py):
+# "flat" = one debate between all leaders, "tournament" = bracket debate,
+# "auto" = tournament when there are more groups than fit in one bracket
+DEBATE_MODE = os.getenv("DEBATE_MODE", "auto")
+TOURNAMENT_BRACKET_SIZE = 3
+
+# Phase 1 group execution: "selector" = free discussion picked turn by turn,
+# "plan" = the Leader plans subtasks that run concurrently first (teams/planner.py)
+GROUP_EXECUTION_MODE = os.getenv("GROUP_EXECUTION_MODE", "selector")
+PLAN_MAX_STEPS = 5
 
 # Code execution settings
 CODE_EXECUTION_TIMEOUT = 60  # seconds
 USE_VIRTUAL_ENV = False  # Set to True to use isolated virtual environments
+
+# "local": LocalCommandLineCodeExecutor, "sandbox": resource-limited (utils/sandbox.py)
+CODE_EXECUTION_MODE = os.getenv("CODE_EXECUTION_MODE", "local")
+SANDBOX_CPU_SECONDS = 30          # CPU time per execution
+SANDBOX_MEMORY_MB = 2048          # address space per process
+SANDBOX_MAX_PROCESSES = 16        # processes/threads a script may start (best effort, not for root)
+SANDBOX_MAX_FILE_MB = 256         # largest file a script may write
+SANDBOX_MAX_OUTPUT_CHARS = 20000  # output returned to the agent
+SANDBOX_CONCURRENCY = os.cpu_count() or 1  # executions running at once per process
+
+# Cache of deterministic code execution results (utils/exec_cache.py)
+EXEC_CACHE_ENABLED = os.getenv("EXEC_CACHE", "0") == "1"
+EXEC_CACHE_MAX_BYTES = 64 * 1024 * 1024  # total size of cached outputs
+
+# Per-run code workspaces (utils/workspace.py)
+WORKSPACE_USE_TMPFS = os.getenv("WORKSPACE_TMPFS", "0") == "1"  # place workspaces on /dev/shm
+WORKSPACE_POOL_SIZE = 4   # empty run directories kept ready
+WORKSPACE_KEEP = False    # keep workspaces after a run (debugging)
+SHARED_DATA_CACHE_DIR = Path(os.environ["SHARED_DATA_CACHE"]) if os.getenv("SHARED_DATA_CACHE") else None
+
+# Search backend for the Researcher ("serpapi" or "local")
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "serpapi")
+SEARCH_TOP_K = int(os.getenv("SEARCH_TOP_K", "3"))  # results returned per query
+LOCAL_INDEX_DIR = Path(os.getenv("LOCAL_INDEX_DIR", BASE_DIR / "index"))  # built by tools.local_index
+MULTI_SEARCH_MAX_QUERIES = 6   # queries accepted per multi_search_tool call
+MULTI_SEARCH_MAX_RESULTS = 10  # results in the merged multi-search digest
+
+# Task-level answer cache for repeated / paraphrased questions
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE", "0") == "1"
+ANSWER_CACHE_DIR = BASE_DIR / "tmp" / "answer_cache"
+# Minimum cosine similarity for a paraphrase hit (unset = exact matches only)
+ANSWER_CACHE_THRESHOLD = float(os.environ["ANSWER_CACHE_THRESHOLD"]) if os.getenv("ANSWER_CACHE_THRESHOLD") else None
+ANSWER_CACHE_MAX_ENTRIES = 100_000  # least-recently-used entries are evicted beyond this
+
+# Memory held by finished tasks (utils/messages.py)
+MESSAGE_SPILL_CHARS = 4096   # message content above this is stored on disk with the transcripts
+RESULTS_SUMMARY_ONLY = os.getenv("RESULTS_SUMMARY_ONLY", "0") == "1"  # drop messages from results once saved
+
+# Cost estimates in evaluation reports (evaluate.py, sweep.py), USD per 1M tokens
+# (cached_prompt: prompt tokens served from the provider's prompt cache)
+MODEL_PRICES_PER_1M = {
+    "gpt-4o": {"prompt": 2.50, "cached_prompt": 1.25, "completion": 10.00},
+    "gpt-4o-mini": {"prompt": 0.15, "cached_prompt": 0.075, "completion": 0.60},
+    "gpt-4.1": {"prompt": 2.00, "cached_prompt": 0.50, "completion": 8.00},
+    "gpt-4.1-mini": {"prompt": 0.40, "cached_prompt": 0.10, "completion": 1.60},
+}
+TOKEN_PRICES_PER_1M = MODEL_PRICES_PER_1M[MODEL_NAME]
+
+# Batch execution (batch.py)
+BATCH_WORKERS = os.cpu_count() or 1   # worker processes, each with its own event loop
+BATCH_MAX_IN_FLIGHT = 2               # tasks running concurrently inside one worker
+BATCH_REQUESTS_PER_MINUTE = 500       # model requests per minute across ALL workers
+
+# Deferred batch submission (utils/deferred.py, batch.py --deferred)
+DEFERRED_MAX_IN_FLIGHT = 1000           # tasks advanced in lock-step per worker
+DEFERRED_COLLECT_WINDOW = 2.0           # seconds without a new request before a batch is submitted
+DEFERRED_MAX_WAIT = 30.0                # longest a request waits for its batch to be submitted
+DEFERRED_MAX_BATCH_REQUESTS = 50_000    # provider limit on requests per batch
+DEFERRED_POLL_INTERVAL = float(os.getenv("DEFERRED_POLL_INTERVAL", "30"))  # seconds between status checks
+DEFERRED_COMPLETION_WINDOW = "24h"
+
+# Pipelined phase scheduler (orchestration/pipeline.py)
+PIPELINE_GROUP_WORKERS = 6   # Phase 1 group runs in flight across tasks
+PIPELINE_DEBATE_WORKERS = 2  # Phase 2 debates in flight across tasks
+PIPELINE_DEBATE_QUEUE = 2    # tasks that may wait for a debate before group workers block
+
+# Configuration sweeps (sweep.py)
+SWEEP_MAX_IN_FLIGHT = 4          # (config, task) runs in flight at once
+SWEEP_LLM_CACHE_ENTRIES = 100_000  # model responses shared between configs
+
+# HTTP job service (python -m service)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_WORKERS = 4                                 # jobs running concurrently
+SERVICE_DATA_DIR = BASE_DIR / "tmp" / "service"     # job database and transcripts
+SERVICE_EVENT_HISTORY = 1000                        # finished jobs whose progress events are kept in memory
+
+# Debugging: event-loop stall detection
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR", "0") == "1"
+LOOP_STALL_THRESHOLD = 0.1  # seconds a callback may block the loop before it is reported
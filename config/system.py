@@ -0,0 +1,82 @@
+"""
+Per-instance system configuration.
+
+The module constants in settings.py are the defaults. A SystemConfig carries
+the settings that shape a run (model, groups, message caps, debate protocol,
+code execution), so several configurations can run side by side in one
+process, e.g. in a sweep (see sweep.py).
+"""
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from .settings import (
+    MODEL_NAME,
+    GROUP_NAMES,
+    MAX_GROUP_MESSAGES,
+    MAX_DEBATE_ROUNDS,
+    DEBATE_CONVERGENCE_ENABLED,
+    DEBATE_STABLE_ROUNDS,
+    DEBATE_MODE,
+    TOURNAMENT_BRACKET_SIZE,
+    GROUP_EXECUTION_MODE,
+    PLAN_MAX_STEPS,
+    CODE_EXECUTION_MODE,
+    CODE_EXECUTION_TIMEOUT
+)
+
+
+@dataclass(frozen=True)
+class SystemConfig:
+    """Settings of one MultiAgentDebateSystem (defaults from config/settings.py)."""
+    model_name: str = MODEL_NAME
+    group_names: List[str] = field(default_factory=lambda: list(GROUP_NAMES))
+    max_group_messages: int = MAX_GROUP_MESSAGES
+    max_debate_rounds: int = MAX_DEBATE_ROUNDS
+    debate_early_stop: bool = DEBATE_CONVERGENCE_ENABLED
+    debate_stable_rounds: int = DEBATE_STABLE_ROUNDS
+    debate_mode: str = DEBATE_MODE                # "auto", "flat" or "tournament"
+    tournament_bracket_size: int = TOURNAMENT_BRACKET_SIZE
+    group_execution_mode: str = GROUP_EXECUTION_MODE  # "selector" or "plan"
+    plan_max_steps: int = PLAN_MAX_STEPS
+    code_execution_mode: str = CODE_EXECUTION_MODE    # "local" or "sandbox"
+    code_execution_timeout: int = CODE_EXECUTION_TIMEOUT
+
+    @property
+    def use_tournament(self) -> bool:
+        """Whether Phase 2 runs as a bracket tournament."""
+        return self.debate_mode == "tournament" or (
+            self.debate_mode == "auto" and len(self.group_names) > self.tournament_bracket_size
+        )
+
+    def with_overrides(self, **overrides: Any) -> "SystemConfig":
+        """
+        Return a copy with some settings changed.
+
+        Besides the field names, num_groups=N is accepted as a shorthand for
+        group_names=["Group1", ..., "GroupN"].
+        """
+        num_groups = overrides.pop("num_groups", None)
+        if num_groups is not None:
+            overrides["group_names"] = [f"Group{i}" for i in range(1, int(num_groups) + 1)]
+        unknown = set(overrides) - {f.name for f in dataclasses.fields(self)}
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        return dataclasses.replace(self, **overrides)
+
+    def diff(self, other: "SystemConfig" = None) -> Dict[str, Any]:
+        """Settings that differ from another config (default: the defaults)."""
+        other = other or SystemConfig()
+        changed = {}
+        for f in dataclasses.fields(self):
+            value = getattr(self, f.name)
+            if value != getattr(other, f.name):
+                changed[f.name] = value
+        if "group_names" in changed:
+            changed["num_groups"] = len(changed.pop("group_names"))
+        return changed
+
+    @property
+    def label(self) -> str:
+        """Short name listing the settings changed from the defaults."""
+        return ",".join(f"{key}={value}" for key, value in self.diff().items()) or "default"
@@ -0,0 +1,49 @@
+"""
+Score exported results against gold answers.
+
+Reads a Parquet/Arrow table written by batch.py --export (or a batch
+results.jsonl) and reports accuracy, agreement rates, and token, cost and
+latency percentiles.
+
+Usage:
+    python evaluate.py runs/exp1/results.parquet
+    python evaluate.py runs/exp1/results.parquet --json
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from config import TOKEN_PRICES_PER_1M
+from utils.evaluation import evaluate, format_report
+from utils.results_table import TEXT_COLUMNS, read_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate exported results against gold answers.")
+    parser.add_argument("results", type=Path, help="Results file (.parquet, .arrow or .jsonl)")
+    parser.add_argument("--prompt-price", type=float, default=TOKEN_PRICES_PER_1M["prompt"],
+                        help="USD per 1M prompt tokens")
+    parser.add_argument("--cached-prompt-price", type=float, default=TOKEN_PRICES_PER_1M["cached_prompt"],
+                        help="USD per 1M prompt tokens served from the provider's prompt cache")
+    parser.add_argument("--completion-price", type=float, default=TOKEN_PRICES_PER_1M["completion"],
+                        help="USD per 1M completion tokens")
+    parser.add_argument("--json", action="store_true", help="Print the metrics as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    columns = read_table(args.results, exclude=TEXT_COLUMNS)
+    metrics = evaluate(columns, prices={"prompt": args.prompt_price,
+                                        "cached_prompt": args.cached_prompt_price,
+                                        "completion": args.completion_price})
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(metrics, indent=2))
+    else:
+        print(format_report(metrics))
+        print(f"\n[EVAL] {metrics['tasks']} rows evaluated in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
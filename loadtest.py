@@ -0,0 +1,427 @@
+"""
+Load and soak test through the real HTTP client path.
+
+Starts the stub LLM (service/stub_llm.py) in its own process, or uses a
+running OpenAI-compatible endpoint, and drives MultiAgentDebateSystem runs
+through the real OpenAIChatCompletionClient at increasing concurrency
+levels. Unlike in-process mocks this exercises HTTP connection pooling,
+retries on 429/500 and client lifecycle (--client per-task creates and
+closes a client for every run).
+
+Reported per level: throughput, task and model-call p50/p99 latency, model
+call errors, open connections (client side and as seen by the stub) and
+resident memory. A time series of the same measurements is written to
+--output for soak runs.
+
+Usage:
+    python loadtest.py --levels 1,4,16 --tasks 32 --latency-ms 300 --latency-dist lognormal \\
+        --rate-limit-rate 0.02 --error-rate 0.01 --tool-call-rate 0.2
+    python loadtest.py --levels 8 --duration 1800 --output soak.csv   # 30-minute soak
+    python loadtest.py --base-url http://127.0.0.1:9000/v1 --levels 4,8
+"""
+import argparse
+import asyncio
+import contextlib
+import csv
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+import numpy as np
+
+from config import MODEL_NAME
+from service.stub_llm import add_behavior_arguments, behavior_argv
+from utils.model_client import ChatClientWrapper, create_model_client
+
+
+DEFAULT_TASK = "Is 2 + 2 = 4? Answer yes or no."
+
+
+def _say(message: str):
+    """Harness output (system output is silenced during runs unless --verbose)."""
+    print(message, file=sys.__stdout__, flush=True)
+
+
+def rss_mb() -> float:
+    """Current resident memory of this process in MB."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def open_connections(port: int) -> Optional[int]:
+    """
+    Established TCP connections from this process to a port (Linux only).
+
+    Returns:
+        The count, or None when /proc is not available
+    """
+    try:
+        inodes = set()
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                target = os.readlink(f"/proc/self/fd/{fd}")
+            except OSError:
+                continue
+            if target.startswith("socket:["):
+                inodes.add(target[8:-1])
+
+        count = 0
+        for table in ("/proc/self/net/tcp", "/proc/self/net/tcp6"):
+            if not os.path.exists(table):
+                continue
+            with open(table) as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    remote_port = int(fields[2].rsplit(":", 1)[1], 16)
+                    if fields[3] == "01" and remote_port == port and fields[9] in inodes:
+                        count += 1
+        return count
+    except OSError:
+        return None
+
+
+class CallRecorder(ChatClientWrapper):
+    """Records the duration and outcome of every model call."""
+
+    def __init__(self, inner, stats: "LevelStats"):
+        super().__init__(inner)
+        self.stats = stats
+
+    async def create(self, messages, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = await self.inner.create(messages, **kwargs)
+        except Exception as e:
+            self.stats.call_errors[type(e).__name__] = self.stats.call_errors.get(type(e).__name__, 0) + 1
+            raise
+        self.stats.call_seconds.append(time.perf_counter() - started)
+        return result
+
+
+@dataclass
+class LevelStats:
+    """Measurements of one concurrency level."""
+    concurrency: int
+    started: float = 0.0
+    elapsed: float = 0.0
+    in_flight: int = 0
+    task_seconds: List[float] = field(default_factory=list)
+    failed: int = 0
+    call_seconds: List[float] = field(default_factory=list)
+    call_errors: Dict[str, int] = field(default_factory=dict)
+    peak_client_connections: int = 0
+    peak_stub_connections: int = 0
+    peak_rss_mb: float = 0.0
+    end_rss_mb: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        done = len(self.task_seconds)
+        tasks = np.array(self.task_seconds) if done else np.zeros(1)
+        calls = np.array(self.call_seconds) if self.call_seconds else np.zeros(1)
+        return {
+            "concurrency": self.concurrency,
+            "tasks": done,
+            "failed": self.failed,
+            "tasks_per_min": done / self.elapsed * 60 if self.elapsed else 0.0,
+            "calls_per_s": len(self.call_seconds) / self.elapsed if self.elapsed else 0.0,
+            "task_p50": float(np.percentile(tasks, 50)),
+            "task_p99": float(np.percentile(tasks, 99)),
+            "call_p50": float(np.percentile(calls, 50)),
+            "call_p99": float(np.percentile(calls, 99)),
+            "call_errors": sum(self.call_errors.values()),
+            "client_connections": self.peak_client_connections,
+            "stub_connections": self.peak_stub_connections,
+            "peak_rss_mb": self.peak_rss_mb,
+            "end_rss_mb": self.end_rss_mb,
+        }
+
+
+class LoadTest:
+    """Runs the concurrency levels and samples the process while they run."""
+
+    def __init__(
+        self,
+        base_url: str,
+        model_name: str = MODEL_NAME,
+        client_mode: str = "shared",
+        task: str = DEFAULT_TASK,
+        sample_interval: float = 1.0
+    ):
+        """
+        Initialize the harness.
+
+        Args:
+            base_url: OpenAI-compatible endpoint (".../v1")
+            model_name: Model name sent with every request
+            client_mode: "shared" (one client and connection pool for all runs)
+                or "per-task" (a new client per run, closed afterwards)
+            task: Task text (each run appends its number, so no two are identical)
+            sample_interval: Seconds between time-series samples
+        """
+        self.base_url = base_url
+        self.model_name = model_name
+        self.client_mode = client_mode
+        self.task = task
+        self.sample_interval = sample_interval
+        self.port = urlsplit(base_url).port or 80
+        self.stats_url = base_url.rsplit("/v1", 1)[0] + "/stats"
+        self.samples: List[Dict[str, Any]] = []
+        self._task_number = 0
+
+    async def _stub_stats(self, http: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+        try:
+            response = await http.get(self.stats_url, headers={"Connection": "close"})
+            return response.json() if response.status_code == 200 else None
+        except httpx.HTTPError:
+            return None
+
+    async def _sample(self, level: LevelStats, start: float):
+        """Record one time-series point."""
+        async with httpx.AsyncClient(timeout=5) as http:
+            stub = await self._stub_stats(http)
+        client_connections = open_connections(self.port)
+        # The stats request itself is one of the stub's connections
+        stub_connections = stub["active_connections"] - 1 if stub else None
+        rss = rss_mb()
+
+        level.peak_client_connections = max(level.peak_client_connections, client_connections or 0)
+        level.peak_stub_connections = max(level.peak_stub_connections, stub_connections or 0)
+        level.peak_rss_mb = max(level.peak_rss_mb, rss)
+        self.samples.append({
+            "t": round(time.perf_counter() - start, 2),
+            "concurrency": level.concurrency,
+            "completed": len(level.task_seconds),
+            "failed": level.failed,
+            "in_flight": level.in_flight,
+            "model_calls": len(level.call_seconds),
+            "client_connections": client_connections,
+            "stub_connections": stub_connections,
+            "stub_requests": stub["requests"] if stub else None,
+            "stub_429": stub["statuses"].get("429", 0) if stub else None,
+            "stub_500": stub["statuses"].get("500", 0) if stub else None,
+            "rss_mb": round(rss, 1),
+        })
+
+    async def _sampler(self, level: LevelStats, start: float):
+        while True:
+            await self._sample(level, start)
+            await asyncio.sleep(self.sample_interval)
+
+    async def _run_task(self, level: LevelStats, shared_client, workspaces, work_dir: Path):
+        from main import MultiAgentDebateSystem
+
+        self._task_number += 1
+        task = f"{self.task} (run {self._task_number})"
+        client = shared_client or CallRecorder(
+            create_model_client(self.model_name, "sk-loadtest", base_url=self.base_url), level
+        )
+        level.in_flight += 1
+        started = time.perf_counter()
+        try:
+            system = MultiAgentDebateSystem(
+                model_client=client,
+                work_dir=work_dir,
+                enable_logging=False,
+                workspaces=workspaces
+            )
+            try:
+                await system.run(task, verbose=False, use_cache=False)
+            finally:
+                system.cleanup()
+            level.task_seconds.append(time.perf_counter() - started)
+        except Exception as e:
+            level.failed += 1
+            _say(f"[LOADTEST] Run failed: {type(e).__name__}: {e}")
+        finally:
+            level.in_flight -= 1
+            if shared_client is None:
+                await client.close()
+
+    async def run_level(
+        self,
+        concurrency: int,
+        tasks: int,
+        duration: Optional[float],
+        start: float,
+        work_dir: Path
+    ) -> LevelStats:
+        """
+        Run one concurrency level.
+
+        Args:
+            concurrency: Runs in flight at once
+            tasks: Runs to complete (ignored when duration is set)
+            duration: Keep starting runs for this many seconds (soak mode)
+            start: Start time of the whole test (time-series origin)
+            work_dir: Directory for code workspaces
+
+        Returns:
+            The level's measurements
+        """
+        from utils.workspace import WorkspaceManager
+
+        level = LevelStats(concurrency=concurrency, started=time.perf_counter())
+        shared_client = None
+        if self.client_mode == "shared":
+            shared_client = CallRecorder(
+                create_model_client(self.model_name, "sk-loadtest", base_url=self.base_url), level
+            )
+        workspaces = WorkspaceManager(root=work_dir / "runs", pool_size=concurrency + 1)
+        deadline = level.started + duration if duration else None
+        remaining = [tasks]
+
+        async def worker():
+            while True:
+                if deadline is not None:
+                    if time.perf_counter() >= deadline:
+                        return
+                elif remaining[0] <= 0:
+                    return
+                else:
+                    remaining[0] -= 1
+                await self._run_task(level, shared_client, workspaces, work_dir)
+
+        sampler = asyncio.create_task(self._sampler(level, start))
+        try:
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+        finally:
+            level.elapsed = time.perf_counter() - level.started
+            if shared_client is not None:
+                await shared_client.close()
+            await workspaces.wait_cleanup()
+            workspaces.cleanup()
+            sampler.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await sampler
+            # Final sample after the client is closed shows leaked connections
+            await self._sample(level, start)
+            level.end_rss_mb = rss_mb()
+        return level
+
+    async def run(
+        self,
+        levels: Sequence[int],
+        tasks: int,
+        duration: Optional[float] = None,
+        verbose: bool = False
+    ) -> List[LevelStats]:
+        """Run all levels in order and return their measurements."""
+        start = time.perf_counter()
+        results = []
+        with tempfile.TemporaryDirectory(prefix="loadtest_") as tmp, open(os.devnull, "w") as devnull:
+            for concurrency in levels:
+                _say(f"[LOADTEST] Concurrency {concurrency}: "
+                     + (f"{duration:.0f}s" if duration else f"{tasks} runs"))
+                output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(devnull)
+                with output:
+                    level = await self.run_level(concurrency, tasks, duration, start, Path(tmp))
+                results.append(level)
+                summary = level.summary()
+                _say(f"[LOADTEST]   {summary['tasks']} runs, {summary['tasks_per_min']:.1f} runs/min, "
+                     f"task p50 {summary['task_p50']:.2f}s, "
+                     f"{summary['client_connections']} connections, {summary['peak_rss_mb']:.0f} MB")
+        return results
+
+
+def format_report(levels: List[LevelStats]) -> str:
+    """Render the per-level summaries as a table."""
+    header = (f"{'conc':>5} {'runs':>5} {'fail':>4} {'runs/min':>9} {'calls/s':>8} "
+              f"{'task p50':>9} {'task p99':>9} {'call p50':>9} {'call p99':>9} {'errors':>6} "
+              f"{'conns':>5} {'stub':>5} {'peak MB':>8} {'end MB':>7}")
+    lines = [header, "-" * len(header)]
+    for level in levels:
+        s = level.summary()
+        lines.append(
+            f"{s['concurrency']:>5} {s['tasks']:>5} {s['failed']:>4} {s['tasks_per_min']:>9.1f} "
+            f"{s['calls_per_s']:>8.1f} {s['task_p50']:>8.2f}s {s['task_p99']:>8.2f}s "
+            f"{s['call_p50']:>8.3f}s {s['call_p99']:>8.3f}s {s['call_errors']:>6} "
+            f"{s['client_connections']:>5} {s['stub_connections']:>5} "
+            f"{s['peak_rss_mb']:>8.0f} {s['end_rss_mb']:>7.0f}"
+        )
+    lines.append("\nconns = peak client connections to the endpoint, stub = peak connections "
+                 "seen by the stub, errors = model calls that failed after retries")
+    return "\n".join(lines)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def stub_process(args: argparse.Namespace):
+    """Run the stub LLM in a child process and yield its base URL."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "service.stub_llm", "--port", str(port)] + behavior_argv(args),
+        cwd=Path(__file__).parent,
+        stdout=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}/v1"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/stats", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("The stub LLM did not start")
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load/soak test through the real HTTP client.")
+    parser.add_argument("--levels", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--tasks", type=int, default=16, help="Runs per level")
+    parser.add_argument("--duration", type=float, help="Seconds per level instead of --tasks (soak)")
+    parser.add_argument("--client", choices=("shared", "per-task"), default="shared",
+                        help="One shared model client, or a new client per run")
+    parser.add_argument("--task", default=DEFAULT_TASK, help="Task text")
+    parser.add_argument("--model", default=MODEL_NAME, help="Model name sent to the endpoint")
+    parser.add_argument("--base-url", help="Use this endpoint instead of starting the stub")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between samples")
+    parser.add_argument("--output", type=Path, help="Write the time series to this CSV file")
+    parser.add_argument("--verbose", action="store_true", help="Show the system's own output")
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(",")]
+    endpoint = contextlib.nullcontext(args.base_url) if args.base_url else stub_process(args)
+    with endpoint as base_url:
+        harness = LoadTest(
+            base_url=base_url,
+            model_name=args.model,
+            client_mode=args.client,
+            task=args.task,
+            sample_interval=args.sample_interval
+        )
+        results = asyncio.run(harness.run(levels, args.tasks, args.duration, args.verbose))
+
+    _say("\n" + format_report(results))
+    if args.output and harness.samples:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(harness.samples[0]))
+            writer.writeheader()
+            writer.writerows(harness.samples)
+        _say(f"\n[LOADTEST] Time series saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,44 @@ This system implements a two-phase approach:
 - Phase 2: Group leaders debate to reach consensus
 """
 import asyncio
+import dataclasses
 import os
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from autogen_core.models import ChatCompletionClient
 
-from orchestration import Phase1Orchestrator, Phase2DebateOrchestrator
-from config import MODEL_NAME, API_KEY, CODING_DIR
-from utils import TranscriptLogger
+from orchestration import (
+    Phase1Orchestrator,
+    Phase2DebateOrchestrator,
+    TournamentDebateOrchestrator,
+    GroupReport,
+    save_phase1_checkpoint,
+    load_phase1_checkpoint,
+    load_resume_checkpoint
+)
+from config import (
+    API_KEY,
+    CODING_DIR,
+    LOOP_MONITOR_ENABLED,
+    LOOP_STALL_THRESHOLD,
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_DIR,
+    ANSWER_CACHE_THRESHOLD,
+    ANSWER_CACHE_MAX_ENTRIES,
+    RESULTS_SUMMARY_ONLY,
+    TASK_DEADLINE_SECONDS,
+    TASK_TOKEN_BUDGET,
+    SystemConfig
+)
+from teams import GroupTeamPool
+from utils import TranscriptLogger, LoopStallMonitor, AnswerCache
+from utils.budget import TaskBudget, enforce_budget
+from utils.model_client import create_model_client
+from utils.usage import TaskUsage, count_usage, track_usage
+from utils.workspace import WorkspaceManager
+from utils.exec_cache import get_execution_cache
 
 
 class MultiAgentDebateSystem:
@@ -22,72 +51,151 @@ class MultiAgentDebateSystem:
     Main orchestrator for the multi-agent collaborative debate system.
 
     Architecture:
-    1. Phase 1: 3 independent groups (each with 5 agents) work in parallel
-    2. Phase 2: 3 group leaders debate to reach consensus
+    1. Phase 1: NUM_GROUPS independent groups (each with 5 agents) work in parallel
+    2. Phase 2: the group leaders debate to reach consensus (in brackets when
+       there are many groups)
     """
 
     def __init__(
         self,
-        model_name: str = MODEL_NAME,
+        model_name: Optional[str] = None,
         api_key: Optional[str] = None,
         work_dir: Path = CODING_DIR,
         enable_logging: bool = True,
-        log_dir: Optional[Path] = None
+        log_dir: Optional[Path] = None,
+        session_dir: Optional[Path] = None,
+        monitor_loop: bool = LOOP_MONITOR_ENABLED,
+        stall_threshold: float = LOOP_STALL_THRESHOLD,
+        answer_cache: Optional[AnswerCache] = None,
+        model_client: Optional[ChatCompletionClient] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        team_pool: Optional[GroupTeamPool] = None,
+        workspaces: Optional[WorkspaceManager] = None,
+        summary_only: bool = RESULTS_SUMMARY_ONLY,
+        config: Optional[SystemConfig] = None
     ):
         """
         Initialize the debate system.
 
         Args:
-            model_name: OpenAI model name (e.g., "gpt-4o")
+            model_name: OpenAI model name (e.g., "gpt-4o"); overrides config.model_name
             api_key: OpenAI API key (defaults to env variable)
             work_dir: Working directory for code execution
             enable_logging: Whether to save transcripts to files
             log_dir: Directory for logs (default: tmp/transcripts)
+            session_dir: Existing session directory to write into (use with
+                run(..., resume=True) to continue an interrupted run)
+            monitor_loop: Debug mode that reports callbacks blocking the event loop
+            stall_threshold: Seconds a callback may block the loop before it is reported
+            answer_cache: Cache of answers to previously solved tasks
+                (default: created from config when ANSWER_CACHE_ENABLED)
+            model_client: Existing model client to share between systems
+                (model_name and api_key are ignored when given)
+            on_event: Optional progress callback, called as on_event(name, data)
+                at phase boundaries and when each group finishes
+            team_pool: Pool of pre-built GroupTeams shared between systems;
+                Phase 1 borrows and resets teams instead of building its own
+                (the pool must have been built with the same config)
+            workspaces: Manager of per-run code workspaces shared between
+                systems (default: one of its own under work_dir)
+            summary_only: Return results without messages once the transcripts
+                are saved (only answers and counts stay in memory)
+            config: Model, group and debate settings of this system
+                (default: the module constants in config/settings.py)
         """
-        # Setup API key
-        if api_key:
+        self.config = config or SystemConfig()
+        if model_name:
+            self.config = self.config.with_overrides(model_name=model_name)
+        self.on_event = on_event
+        self.summary_only = summary_only
+
+        # Use a shared model client when one is given (e.g. one per worker process)
+        if model_client is not None:
             self.api_key = api_key
+            self.model_client = model_client
         else:
-            self.api_key = API_KEY or os.getenv("OPENAI_API_KEY")
+            # Setup API key
+            if api_key:
+                self.api_key = api_key
+            else:
+                self.api_key = API_KEY or os.getenv("OPENAI_API_KEY")
 
-        if not self.api_key:
-            raise ValueError(
-                "OpenAI API key not found. "
-                "Set OPENAI_API_KEY environment variable or pass api_key parameter."
-            )
+            if not self.api_key:
+                raise ValueError(
+                    "OpenAI API key not found. "
+                    "Set OPENAI_API_KEY environment variable or pass api_key parameter."
+                )
 
-        # Create model client
-        self.model_client = OpenAIChatCompletionClient(
-            model=model_name,
-            api_key=self.api_key
-        )
+            # Create model client
+            self.model_client = create_model_client(self.config.model_name, self.api_key)
+        # Every model call is counted and charged to the task that made it
+        # (see utils/usage.py and utils/budget.py)
+        self.model_client = enforce_budget(count_usage(self.model_client))
 
         # Create transcript logger
         self.logger = None
         if enable_logging:
-            self.logger = TranscriptLogger(output_dir=log_dir)
+            self.logger = TranscriptLogger(output_dir=log_dir, session_dir=session_dir)
             print(f"[LOG] Transcript logging enabled")
             print(f"[LOG] Session directory: {self.logger.get_session_dir()}\n")
 
+        # Create event-loop stall monitor (debug mode)
+        self.loop_monitor = None
+        if monitor_loop:
+            self.loop_monitor = LoopStallMonitor(threshold=stall_threshold)
+            print(f"[DEBUG] Event-loop stall monitor enabled (threshold: {stall_threshold}s)\n")
+
+        # Create task-level answer cache
+        self.answer_cache = answer_cache
+        if self.answer_cache is None and ANSWER_CACHE_ENABLED:
+            self.answer_cache = AnswerCache(
+                cache_dir=ANSWER_CACHE_DIR,
+                threshold=ANSWER_CACHE_THRESHOLD,
+                max_entries=ANSWER_CACHE_MAX_ENTRIES
+            )
+
         # Create orchestrators
         self.phase1 = Phase1Orchestrator(
             model_client=self.model_client,
             work_dir=work_dir,
-            logger=self.logger
+            logger=self.logger,
+            on_event=on_event,
+            team_pool=team_pool,
+            workspaces=workspaces,
+            config=self.config
         )
 
         self.phase2 = Phase2DebateOrchestrator(
             model_client=self.model_client,
-            logger=self.logger
+            logger=self.logger,
+            config=self.config
         )
+        if self.config.use_tournament:
+            self.phase2 = TournamentDebateOrchestrator(self.phase2)
 
-    async def run(self, task: str, verbose: bool = True):
+    async def run(
+        self,
+        task: str,
+        verbose: bool = True,
+        resume: bool = False,
+        use_cache: bool = True,
+        deadline: Optional[float] = TASK_DEADLINE_SECONDS,
+        token_budget: Optional[int] = TASK_TOKEN_BUDGET
+    ):
         """
         Run the complete two-phase debate system.
 
         Args:
             task: The task/question to solve
             verbose: Whether to print detailed progress
+            resume: Reuse the Phase 1 checkpoint in the session directory
+                (if one exists) and continue at the phase boundary
+            use_cache: Set to False to bypass the answer cache for this task
+            deadline: Seconds the task may take (None = no limit). Groups,
+                code execution and the debate stop when it passes, and the
+                best answer so far is returned with result["degraded"] set
+            token_budget: Prompt + completion tokens the task may use
+                (None = no limit), with the same degradation
 
         Returns:
             Dictionary with Phase 1 reports and Phase 2 consensus
@@ -98,12 +206,156 @@ class MultiAgentDebateSystem:
             print("="*80)
             print(f"\nTask: {task}\n")
 
-        # Phase 1: Parallel group execution
-        group_reports = await self.phase1.run_parallel(task)
+        if self.answer_cache and use_cache:
+            cache_hit = self.answer_cache.lookup(task)
+            if cache_hit:
+                self._emit("cache_hit", {"session_dir": cache_hit.session_dir})
+                print(f"[CACHE] {cache_hit.match} match (similarity {cache_hit.similarity:.3f}) "
+                      f"with session {cache_hit.session_dir}\n")
+                if verbose:
+                    print(f"\n{cache_hit.final_answer}\n")
+                return {
+                    "task": task,
+                    "phase1_reports": [],
+                    "phase2_debate": None,
+                    "final_answer": cache_hit.final_answer,
+                    "degraded": False,
+                    "log_directory": Path(cache_hit.session_dir) if cache_hit.session_dir else None,
+                    "cache_hit": cache_hit,
+                    "stats": {}
+                }
+
+        if self.loop_monitor:
+            self.loop_monitor.start()
+
+        started = time.perf_counter()
+        timings = {"phase1_seconds": 0.0}
+        budget = None
+        if deadline is not None or token_budget is not None:
+            budget = TaskBudget(deadline=deadline, token_budget=token_budget)
+        usage = TaskUsage()
+        try:
+            session_dir = self.logger.get_session_dir() if self.logger else None
+            group_reports = None
+            if resume and session_dir:
+                group_reports = load_resume_checkpoint(session_dir, task, self.logger.get_payload_store())
+            if group_reports is not None:
+                # Resume at the phase boundary: skip Phase 1
+                print(f"[CHECKPOINT] Resuming from Phase 1 checkpoint in {session_dir}\n")
+                usage.add_messages(msg for report in group_reports for msg in report.messages)
+            else:
+                # Phase 1: Parallel group execution
+                self._emit("phase1_started", {})
+                with track_usage(usage):
+                    group_reports = await self.phase1.run_parallel(task, budget=budget)
+                timings["phase1_seconds"] = time.perf_counter() - started
+                if self.logger:
+                    checkpoint_path = save_phase1_checkpoint(session_dir, task, group_reports)
+                    print(f"[CHECKPOINT] Phase 1 checkpoint saved: {checkpoint_path}\n")
+            self._emit("phase1_completed", {"groups": [r.group_name for r in group_reports]})
+
+            # Phase 2: Leader debate (pass original task to keep focus)
+            self._emit("phase2_started", {})
+            phase2_started = time.perf_counter()
+            with track_usage(usage):
+                debate_result = await asyncio.create_task(
+                    self.phase2.run_debate(group_reports, original_task=task, budget=budget),
+                    name="Phase2Debate"
+                )
+            timings["phase2_seconds"] = time.perf_counter() - phase2_started
+            timings["total_seconds"] = time.perf_counter() - started
+        finally:
+            if self.loop_monitor:
+                self.loop_monitor.stop()
+                self._report_loop_stalls()
+
+        result = self.finalize_run(task, group_reports, debate_result, verbose, timings=timings, usage=usage)
+        self._emit("completed", {
+            "final_answer": result["final_answer"],
+            "consensus_reached": debate_result.consensus_reached,
+            "degraded": debate_result.degraded
+        })
+        # Only consensus answers are reused (not inconclusive, failed or degraded runs)
+        if self.answer_cache and debate_result.consensus_reached and not debate_result.degraded:
+            self.answer_cache.put(task, result["final_answer"], result["log_directory"])
+        return result
+
+    async def run_debate_only(
+        self,
+        session_or_reports: Union[str, Path, List[GroupReport]],
+        task: Optional[str] = None,
+        verbose: bool = True
+    ):
+        """
+        Run only Phase 2 on previously saved Phase 1 reports.
+
+        Useful for iterating on the debate protocol, prompts or
+        max_debate_rounds without paying for Phase 1 again.
+
+        Args:
+            session_or_reports: A session directory or checkpoint file saved by
+                a previous run, or a list of GroupReport objects
+            task: The original task (required when passing reports directly;
+                overrides the checkpointed task otherwise)
+            verbose: Whether to print detailed progress
+
+        Returns:
+            Dictionary with Phase 1 reports and Phase 2 consensus
+        """
+        if isinstance(session_or_reports, (str, Path)):
+            saved_task, group_reports = load_phase1_checkpoint(session_or_reports)
+            task = task or saved_task
+            print(f"[CHECKPOINT] Loaded {len(group_reports)} group reports from {session_or_reports}\n")
+        else:
+            group_reports = list(session_or_reports)
+
+        if not task:
+            raise ValueError("task is required when passing GroupReport objects directly.")
+
+        if verbose:
+            print("\n" + "="*80)
+            print("MULTI-AGENT COLLABORATIVE DEBATE SYSTEM (DEBATE ONLY)")
+            print("="*80)
+            print(f"\nTask: {task}\n")
+
+        if self.logger:
+            save_phase1_checkpoint(self.logger.get_session_dir(), task, group_reports)
+
+        usage = TaskUsage()
+        usage.add_messages(msg for report in group_reports for msg in report.messages)
+        with track_usage(usage):
+            debate_result = await self.phase2.run_debate(group_reports, original_task=task)
+
+        return self.finalize_run(task, group_reports, debate_result, verbose, usage=usage)
+
+    def finalize_run(
+        self,
+        task: str,
+        group_reports: List[GroupReport],
+        debate_result,
+        verbose: bool = True,
+        timings: Optional[Dict[str, float]] = None,
+        usage: Optional[TaskUsage] = None
+    ):
+        """
+        Print the final answer, save the session summary and build the result dict.
+
+        Also used by schedulers that drive the two phases themselves.
 
-        # Phase 2: Leader debate (pass original task to keep focus)
-        debate_result = await self.phase2.run_debate(group_reports, original_task=task)
+        Args:
+            task: The original task
+            group_reports: Reports from Phase 1
+            debate_result: Result from Phase 2
+            verbose: Whether to print the final answer
+            timings: Phase durations in seconds (phase1_seconds,
+                phase2_seconds, total_seconds) added to the stats
+            usage: Model calls and tokens counted for the task (default:
+                the usage recorded on the messages, which misses speaker
+                selection and tool-call iterations)
 
+        Returns:
+            Dictionary with Phase 1 reports and Phase 2 consensus
+        """
         # Print final result
         if verbose:
             print("\n" + "="*80)
@@ -122,14 +374,53 @@ class MultiAgentDebateSystem:
             print(f"[LOG] Session summary saved: {summary_path}")
             print(f"[LOG] All transcripts saved to: {self.logger.get_session_dir()}\n")
 
+        exec_cache = get_execution_cache()
+        if exec_cache:
+            stats = exec_cache.stats()
+            print(f"[CACHE] Code execution cache: {stats['hits']}/{stats['hits'] + stats['misses']} "
+                  f"hits ({stats['hit_rate']:.0%}), {stats['skipped']} scripts not cacheable\n")
+
+        if usage is None:
+            usage = TaskUsage()
+            usage.add_messages(msg for report in group_reports for msg in report.messages)
+            usage.add_messages(debate_result.debate_messages)
+        stats = {
+            "phase1_messages": sum(len(report.messages) for report in group_reports),
+            "debate_messages": len(debate_result.debate_messages),
+            "group_turns": {report.group_name: len(report.messages) for report in group_reports},
+            **usage.to_dict(),
+            **(timings or {})
+        }
+        if self.summary_only and self.logger:
+            # Everything is on disk now: keep only answers and counts in memory
+            group_reports = [dataclasses.replace(report, messages=[]) for report in group_reports]
+            debate_result = dataclasses.replace(debate_result, debate_messages=[])
+
         return {
             "task": task,
             "phase1_reports": group_reports,
             "phase2_debate": debate_result,
             "final_answer": debate_result.final_answer,
-            "log_directory": self.logger.get_session_dir() if self.logger else None
+            "degraded": debate_result.degraded,
+            "log_directory": self.logger.get_session_dir() if self.logger else None,
+            "cache_hit": None,
+            "stats": stats
         }
 
+    def _emit(self, event: str, data: Dict[str, Any]):
+        """Send a progress event to the on_event callback, if any."""
+        if self.on_event:
+            self.on_event(event, data)
+
+    def _report_loop_stalls(self):
+        """Print the stall histogram and save the full report with the transcripts."""
+        print(self.loop_monitor.format_report(include_stacks=False))
+        if self.logger:
+            report_path = self.loop_monitor.save_report(
+                self.logger.get_session_dir() / "loop_stalls.txt"
+            )
+            print(f"[LOG] Loop stall report saved: {report_path}\n")
+
     def cleanup(self):
         """Clean up resources."""
         self.phase1.cleanup()
@@ -154,8 +445,11 @@ async def main():
 
         # Save results (optional)
         print("\n[System] Debate complete!")
-        print(f"[System] Phase 1: {len(result['phase1_reports'])} group reports generated")
-        print(f"[System] Phase 2: Consensus reached = {result['phase2_debate'].consensus_reached}")
+        if result['phase2_debate'] is None:
+            print(f"[System] Answered from cache (session {result['cache_hit'].session_dir})")
+        else:
+            print(f"[System] Phase 1: {len(result['phase1_reports'])} group reports generated")
+            print(f"[System] Phase 2: Consensus reached = {result['phase2_debate'].consensus_reached}")
 
     finally:
         # Cleanup
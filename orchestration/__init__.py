@@ -1,10 +1,20 @@
 """Orchestration module."""
-from .phase1_parallel import Phase1Orchestrator, GroupReport
-from .phase2_debate import Phase2DebateOrchestrator, DebateResult
+from utils.lazy import lazy_exports
 
-__all__ = [
-    "Phase1Orchestrator",
-    "GroupReport",
-    "Phase2DebateOrchestrator",
-    "DebateResult"
-]
+_EXPORTS = {
+    "Phase1Orchestrator": ".phase1_parallel",
+    "GroupReport": ".phase1_parallel",
+    "Phase2DebateOrchestrator": ".phase2_debate",
+    "DebateResult": ".phase2_debate",
+    "ConvergenceTermination": ".convergence",
+    "TournamentDebateOrchestrator": ".tournament",
+    "save_phase1_checkpoint": ".checkpoint",
+    "load_phase1_checkpoint": ".checkpoint",
+    "has_phase1_checkpoint": ".checkpoint",
+    "load_resume_checkpoint": ".checkpoint",
+    "PipelinedScheduler": ".pipeline",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,128 @@
+"""
+Phase 1 checkpoints: persist GroupReports so Phase 2 can be re-run or resumed.
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from orchestration.phase1_parallel import GroupReport
+from utils.messages import MessageRecord, PayloadStore, to_record
+
+
+CHECKPOINT_FILENAME = "phase1_checkpoint.json"
+CHECKPOINT_VERSION = 1
+
+
+def _checkpoint_path(path: Union[str, Path]) -> Path:
+    """Resolve a session directory or checkpoint file to the checkpoint file."""
+    path = Path(path)
+    if path.is_dir():
+        return path / CHECKPOINT_FILENAME
+    return path
+
+
+def has_phase1_checkpoint(path: Union[str, Path]) -> bool:
+    """Check whether a session directory (or file path) holds a Phase 1 checkpoint."""
+    return _checkpoint_path(path).is_file()
+
+
+def save_phase1_checkpoint(
+    path: Union[str, Path],
+    task: str,
+    reports: List[GroupReport]
+) -> Path:
+    """
+    Save Phase 1 group reports in a reloadable JSON format.
+
+    The file is written atomically so an interrupted run never leaves a
+    half-written checkpoint behind.
+
+    Args:
+        path: Session directory or checkpoint file path
+        task: The original task
+        reports: Reports from Phase 1
+
+    Returns:
+        Path to the saved checkpoint
+    """
+    filepath = _checkpoint_path(path)
+    data = {
+        "version": CHECKPOINT_VERSION,
+        "timestamp": datetime.now().isoformat(),
+        "task": task,
+        "reports": [
+            {
+                "group_name": report.group_name,
+                "solution": report.solution,
+                "stop_reason": report.stop_reason,
+                "messages": [to_record(msg).to_dict() for msg in report.messages]
+            }
+            for report in reports
+        ]
+    }
+
+    tmp_path = filepath.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+    tmp_path.replace(filepath)
+
+    return filepath
+
+
+def load_phase1_checkpoint(
+    path: Union[str, Path],
+    store: Optional[PayloadStore] = None
+) -> Tuple[str, List[GroupReport]]:
+    """
+    Load Phase 1 group reports from a checkpoint.
+
+    Args:
+        path: Session directory or checkpoint file path
+        store: Where to spill large message content (default: keep in memory)
+
+    Returns:
+        Tuple of (original task, list of GroupReport objects)
+    """
+    filepath = _checkpoint_path(path)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    reports = [
+        GroupReport(
+            group_name=item["group_name"],
+            messages=[MessageRecord.from_dict(m, store) for m in item.get("messages", [])],
+            solution=item["solution"],
+            stop_reason=item["stop_reason"]
+        )
+        for item in data["reports"]
+    ]
+    return data["task"], reports
+
+
+def load_resume_checkpoint(
+    session_dir: Union[str, Path],
+    task: str,
+    store: Optional[PayloadStore] = None
+) -> Optional[List[GroupReport]]:
+    """
+    Load the Phase 1 reports to resume a task from, if the session has them.
+
+    A checkpoint saved for a different task (a reused session directory) is
+    ignored, so the debate never runs on another task's reports.
+
+    Args:
+        session_dir: Session directory of the run
+        task: The task being run
+        store: Where to spill large message content (default: keep in memory)
+
+    Returns:
+        The checkpointed reports, or None when Phase 1 has to run
+    """
+    if not has_phase1_checkpoint(session_dir):
+        return None
+    saved_task, reports = load_phase1_checkpoint(session_dir, store)
+    if saved_task != task:
+        print(f"[CHECKPOINT] Ignoring the Phase 1 checkpoint in {session_dir}: it was saved for a different task")
+        return None
+    return reports
@@ -0,0 +1,110 @@
+"""
+Convergence-based termination for the leader debate.
+
+The debate otherwise only ends when ConsensusManager says CONSENSUS_REACHED
+or the message cap is hit, and the selector keeps picking leaders who repeat
+an answer they already agree on. ConvergenceTermination follows each
+leader's latest stated answer and stops the debate as soon as all leaders
+agree, or when no leader has changed position for a number of rounds.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+from autogen_agentchat.base import TerminatedException, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+from autogen_core import Component
+
+from utils.answers import extract_answer
+
+
+class ConvergenceTerminationConfig(BaseModel):
+    leader_names: List[str]
+    stable_rounds: int = 2
+
+
+class ConvergenceTermination(TerminationCondition, Component[ConvergenceTerminationConfig]):
+    """
+    Terminate the debate once the leaders' positions have converged.
+
+    Args:
+        leader_names: Names of the leader agents whose positions are tracked
+        stable_rounds: Stop when no position changed for this many rounds
+            (one round = one turn per leader)
+    """
+
+    component_config_schema = ConvergenceTerminationConfig
+
+    def __init__(self, leader_names: Sequence[str], stable_rounds: int = 2) -> None:
+        self._leader_names = list(leader_names)
+        self._stable_rounds = stable_rounds
+        self._terminated = False
+        self.positions: Dict[str, str] = {}
+        self.agreed: Optional[str] = None
+        self._turns_since_change = 0
+        # The team resets its termination condition when a run ends, so the
+        # state at the moment this condition fired is kept separately
+        self.stopped = False
+        self.final_positions: Dict[str, str] = {}
+        self.final_agreed: Optional[str] = None
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    async def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> StopMessage | None:
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+
+        for message in messages:
+            if message.source not in self._leader_names or not isinstance(message, BaseChatMessage):
+                continue
+
+            answer = extract_answer(message.to_text())
+            if answer is not None and self.positions.get(message.source) != answer:
+                self.positions[message.source] = answer
+                self._turns_since_change = 0
+            else:
+                self._turns_since_change += 1
+
+            if len(self.positions) < len(self._leader_names):
+                continue
+
+            if len(set(self.positions.values())) == 1:
+                self.agreed = next(iter(self.positions.values()))
+                self._stop()
+                return StopMessage(
+                    content=f"Leaders converged on '{self.agreed}'",
+                    source="ConvergenceTermination"
+                )
+
+            if self._turns_since_change >= self._stable_rounds * len(self._leader_names):
+                self._stop()
+                return StopMessage(
+                    content=f"Positions unchanged for {self._stable_rounds} rounds",
+                    source="ConvergenceTermination"
+                )
+        return None
+
+    def _stop(self):
+        self._terminated = True
+        self.stopped = True
+        self.final_positions = dict(self.positions)
+        self.final_agreed = self.agreed
+
+    async def reset(self) -> None:
+        self._terminated = False
+        self.positions = {}
+        self.agreed = None
+        self._turns_since_change = 0
+
+    def _to_config(self) -> ConvergenceTerminationConfig:
+        return ConvergenceTerminationConfig(
+            leader_names=self._leader_names,
+            stable_rounds=self._stable_rounds
+        )
+
+    @classmethod
+    def _from_config(cls, config: ConvergenceTerminationConfig) -> Self:
+        return cls(leader_names=config.leader_names, stable_rounds=config.stable_rounds)
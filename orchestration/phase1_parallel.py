@@ -3,14 +3,17 @@ Phase 1: Parallel group execution orchestrator.
 """
 import asyncio
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional
 from dataclasses import dataclass
 
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from autogen_core.models import ChatCompletionClient
 
-from teams import GroupTeam
-from config import GROUP_NAMES, CODING_DIR
+from teams import GroupTeam, GroupTeamPool
+from config import CODING_DIR, SystemConfig
 from utils import TranscriptLogger
+from utils.budget import TaskBudget
+from utils.messages import to_record
+from utils.workspace import WorkspaceManager
 
 
 @dataclass
@@ -24,7 +27,7 @@ class GroupReport:
 
 class Phase1Orchestrator:
     """
-    Orchestrates Phase 1: Parallel execution of 3 independent groups.
+    Orchestrates Phase 1: Parallel execution of independent groups (config.group_names).
 
     Each group:
     - Works on the same task
@@ -34,31 +37,65 @@ class Phase1Orchestrator:
 
     def __init__(
         self,
-        model_client: OpenAIChatCompletionClient,
+        model_client: ChatCompletionClient,
         work_dir: Path = CODING_DIR,
-        logger: Optional[TranscriptLogger] = None
+        logger: Optional[TranscriptLogger] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        team_pool: Optional[GroupTeamPool] = None,
+        workspaces: Optional[WorkspaceManager] = None,
+        config: Optional[SystemConfig] = None
     ):
         self.model_client = model_client
+        self.config = config or SystemConfig()
+        if team_pool is not None and team_pool.config != self.config:
+            # Pooled teams are built with the pool's settings, not the system's
+            raise ValueError(
+                "The team pool was built for a different SystemConfig than this system; "
+                "use one GroupTeamPool per configuration"
+            )
         self.work_dir = work_dir
         self.logger = logger
-
-        # Create 3 identical groups
-        self.groups = [
-            GroupTeam(
-                group_name=name,
-                model_client=model_client,
-                work_dir=work_dir
+        self.on_event = on_event
+        self.team_pool = team_pool
+        # Each run gets its own isolated code workspace
+        self._owns_workspaces = workspaces is None
+        self.workspaces = workspaces or WorkspaceManager(root=work_dir)
+        self.group_names = list(self.config.group_names)
+
+        # Groups are built on first use (or borrowed from the pool per run when pooled)
+        self._groups: Dict[str, GroupTeam] = {}
+
+    @property
+    def groups(self) -> List[GroupTeam]:
+        """Groups built so far."""
+        return list(self._groups.values())
+
+    def _get_group(self, group_name: str, run_dir: Path) -> GroupTeam:
+        """Return the group with the given name, building it in run_dir on first use."""
+        group = self._groups.get(group_name)
+        if group is None:
+            group = GroupTeam(
+                group_name=group_name,
+                model_client=self.model_client,
+                work_dir=run_dir,
+                config=self.config
             )
-            for name in GROUP_NAMES
-        ]
+            self._groups[group_name] = group
+        return group
 
-    async def run_group(self, group: GroupTeam, task: str) -> GroupReport:
+    async def run_group(
+        self,
+        group: GroupTeam,
+        task: str,
+        budget: Optional[TaskBudget] = None
+    ) -> GroupReport:
         """
         Run a single group on the task.
 
         Args:
             group: The GroupTeam instance
             task: The task description
+            budget: Deadline and token budget of the task
 
         Returns:
             GroupReport with the group's solution
@@ -68,7 +105,7 @@ class Phase1Orchestrator:
         print(f"{'='*60}\n")
 
         try:
-            result = await group.run(task=task)
+            result = await group.run(task=task, budget=budget)
 
             # Extract solution from the last message (Leader's report)
             solution = ""
@@ -91,6 +128,13 @@ class Phase1Orchestrator:
             print(f"Stop reason: {report.stop_reason}")
             print(f"{'='*60}\n")
 
+            if self.on_event:
+                self.on_event("group_completed", {
+                    "group_name": group.group_name,
+                    "stop_reason": report.stop_reason,
+                    "message_count": len(report.messages)
+                })
+
             # Save transcript if logger is available
             if self.logger:
                 transcript_path = self.logger.save_group_transcript(
@@ -103,6 +147,10 @@ class Phase1Orchestrator:
                 )
                 print(f"[LOG] Transcript saved: {transcript_path}\n")
 
+            # Keep compact records instead of the autogen message objects
+            store = self.logger.get_payload_store() if self.logger else None
+            report.messages = [to_record(msg, store) for msg in result.messages]
+
             return report
 
         except Exception as e:
@@ -114,12 +162,51 @@ class Phase1Orchestrator:
                 stop_reason="error"
             )
 
-    async def run_parallel(self, task: str) -> List[GroupReport]:
+    async def run_named_group(
+        self,
+        group_name: str,
+        task: str,
+        run_dir: Optional[Path] = None,
+        budget: Optional[TaskBudget] = None
+    ) -> GroupReport:
         """
-        Run all 3 groups in parallel on the same task.
+        Run the group with the given name, borrowing a team from the pool if one is set.
 
         Args:
+            group_name: Name of the group (e.g. "Group1")
             task: The task description
+            run_dir: Run workspace shared by the groups of one task (default:
+                a workspace of its own, released when the group finishes)
+            budget: Deadline and token budget of the task
+
+        Returns:
+            GroupReport with the group's solution
+        """
+        owns_workspace = run_dir is None
+        if owns_workspace:
+            run_dir = self.workspaces.acquire()
+        work_dir = self.workspaces.group_dir(run_dir, group_name)
+
+        try:
+            if self.team_pool:
+                async with self.team_pool.checkout(group_name, work_dir=work_dir) as group:
+                    return await self.run_group(group, task, budget)
+
+            group = self._get_group(group_name, run_dir)
+            if group.group_work_dir != work_dir:
+                group.set_work_dir(work_dir)
+            return await self.run_group(group, task, budget)
+        finally:
+            if owns_workspace:
+                self.workspaces.release(run_dir)
+
+    async def run_parallel(self, task: str, budget: Optional[TaskBudget] = None) -> List[GroupReport]:
+        """
+        Run all groups in parallel on the same task.
+
+        Args:
+            task: The task description
+            budget: Deadline and token budget of the task, shared by all groups
 
         Returns:
             List of GroupReport objects (one per group)
@@ -128,11 +215,20 @@ class Phase1Orchestrator:
         print("PHASE 1: PARALLEL GROUP EXECUTION")
         print(f"{'#'*60}")
         print(f"\nTask: {task}\n")
-        print(f"Running {len(self.groups)} groups in parallel...\n")
+        print(f"Running {len(self.group_names)} groups in parallel...\n")
 
         # Run all groups concurrently using asyncio.gather
-        tasks = [self.run_group(group, task) for group in self.groups]
-        reports = await asyncio.gather(*tasks)
+        # (tasks are named after their group so stall reports can attribute them)
+        run_dir = self.workspaces.acquire()
+        try:
+            tasks = [
+                asyncio.create_task(self.run_named_group(name, task, run_dir, budget), name=name)
+                for name in self.group_names
+            ]
+            reports = await asyncio.gather(*tasks)
+        finally:
+            # Deleted in the background while Phase 2 runs
+            self.workspaces.release(run_dir)
 
         print(f"\n{'#'*60}")
         print("PHASE 1 COMPLETED")
@@ -153,3 +249,5 @@ class Phase1Orchestrator:
         """Clean up all group resources."""
         for group in self.groups:
             group.cleanup()
+        if self._owns_workspaces:
+            self.workspaces.cleanup()
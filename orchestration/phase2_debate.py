@@ -1,17 +1,22 @@
 """
 Phase 2: Leader debate and consensus system.
 """
-from typing import List, Optional
-from dataclasses import dataclass
+from collections import Counter
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
 
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.teams import SelectorGroupChat
 from autogen_agentchat.conditions import TextMentionTermination, MaxMessageTermination
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from autogen_core.models import ChatCompletionClient
 
 from orchestration.phase1_parallel import GroupReport
-from config import CONSENSUS_REACHED_KEYWORD, MAX_DEBATE_ROUNDS
+from orchestration.convergence import ConvergenceTermination
+from config import CONSENSUS_REACHED_KEYWORD, REPORT_READY_KEYWORD, SystemConfig
 from utils import TranscriptLogger
+from utils.answers import extract_answer
+from utils.budget import BudgetExhausted, BudgetTermination, TaskBudget, budget_scope, is_budget_stop, run_team
+from utils.messages import to_record
 
 
 @dataclass
@@ -21,21 +26,35 @@ class DebateResult:
     debate_messages: List
     consensus_reached: bool
     stop_reason: str
+    converged: bool = False          # stopped early by ConvergenceTermination
+    turns_saved: int = 0             # messages left under the message cap
+    positions: Dict[str, str] = field(default_factory=dict)  # leader -> last stated answer
+    degraded: bool = False           # budget ran out: best available answer, not a consensus
 
 
 class Phase2DebateOrchestrator:
     """
     Orchestrates Phase 2: Leader debate and consensus building.
 
-    After Phase 1, the 3 group leaders:
+    After Phase 1, the group leaders:
     - Present their group's findings
     - Debate different approaches
     - Reach consensus on the final answer
     """
 
-    def __init__(self, model_client: OpenAIChatCompletionClient, logger: Optional[TranscriptLogger] = None):
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        logger: Optional[TranscriptLogger] = None,
+        early_stop: Optional[bool] = None,
+        stable_rounds: Optional[int] = None,
+        config: Optional[SystemConfig] = None
+    ):
         self.model_client = model_client
         self.logger = logger
+        self.config = config or SystemConfig()
+        self.early_stop = self.config.debate_early_stop if early_stop is None else early_stop
+        self.stable_rounds = self.config.debate_stable_rounds if stable_rounds is None else stable_rounds
 
     def _create_leader_agent(self, group_report: GroupReport) -> AssistantAgent:
         """
@@ -51,12 +70,8 @@ class Phase2DebateOrchestrator:
             name=f"{group_report.group_name}Leader",
             description=f"Leader representing {group_report.group_name}",
             model_client=self.model_client,
-            system_message=f"""You are the leader of {group_report.group_name} in a multi-group debate.
-
-Your group's findings from Phase 1:
-{'-'*60}
-{group_report.solution}
-{'-'*60}
+            # Shared instructions first, the group and its report last (prompt-cache friendly)
+            system_message=f"""You are a group leader in a multi-group debate.
 
 In this debate:
 1. Present your group's approach and findings
@@ -67,15 +82,21 @@ In this debate:
 6. Work towards consensus
 
 When all leaders agree on a final answer, support the consensus manager's decision.
+
+You lead {group_report.group_name}. Your group's findings from Phase 1:
+{'-'*60}
+{group_report.solution}
+{'-'*60}
 """
         )
 
-    def _create_consensus_manager(self, original_task: str) -> AssistantAgent:
+    def _create_consensus_manager(self, original_task: str, num_leaders: int = 3) -> AssistantAgent:
         """
         Create the consensus manager agent.
 
         Args:
             original_task: The original task that groups worked on
+            num_leaders: Number of leaders in the debate
 
         Returns:
             AssistantAgent that manages the debate and synthesizes consensus
@@ -84,21 +105,17 @@ When all leaders agree on a final answer, support the consensus manager's decisi
             name="ConsensusManager",
             description="Manages the debate and synthesizes final consensus",
             model_client=self.model_client,
+            # Static instructions first, the leader count and the task last (prompt-cache friendly)
             system_message=f"""You are the Consensus Manager for a multi-agent debate.
 
-ORIGINAL TASK:
-{'-'*60}
-{original_task}
-{'-'*60}
-
 Your responsibilities:
-1. Listen to all 3 group leaders present their findings about THE ORIGINAL TASK ABOVE
+1. Listen to all group leaders present their findings about THE ORIGINAL TASK BELOW
 2. Identify areas of agreement and disagreement
 3. Guide the discussion towards consensus ON THE ORIGINAL TASK
 4. Synthesize the final answer when consensus emerges
 5. KEEP THE DISCUSSION FOCUSED on the original task - if leaders go off-topic, remind them of the task
 
-IMPORTANT: The debate must focus on solving the ORIGINAL TASK above. Do NOT discuss technical issues, logging problems, or meta-topics. Stay focused on answering the original question.
+IMPORTANT: The debate must focus on solving the ORIGINAL TASK below. Do NOT discuss technical issues, logging problems, or meta-topics. Stay focused on answering the original question.
 
 When to conclude:
 - If all leaders agree on the answer to the ORIGINAL TASK → synthesize and conclude
@@ -113,35 +130,118 @@ To conclude the debate:
 3. Use the keyword '{CONSENSUS_REACHED_KEYWORD}' to end the debate
 
 Be fair, objective, and focus on finding the correct answer to the ORIGINAL TASK.
+
+Number of group leaders: {num_leaders}
+
+ORIGINAL TASK:
+{'-'*60}
+{original_task}
+{'-'*60}
 """
         )
 
     def _get_selector_prompt(self) -> str:
         """Get the selector prompt for the debate."""
+        # Fixed rules first and the growing history last (prompt-cache friendly)
         return """Select the next speaker in this multi-leader debate.
 
-Available participants:
-{roles}
-
-Conversation history:
-{history}
-
 Selection rules:
 1. Early rounds: Let each leader present their findings (round-robin style)
 2. Middle rounds: Facilitate debate between leaders who disagree
 3. Late rounds: Have ConsensusManager synthesize when convergence appears
 4. If leaders are repeating points: Select ConsensusManager to conclude
 
+Available participants:
+{roles}
+
+Conversation history:
+{history}
+
 Select from: {participants}
 """
 
-    async def run_debate(self, group_reports: List[GroupReport], original_task: str) -> DebateResult:
+    def _get_synthesis_prompt(self, messages: List, positions: Dict[str, str], original_task: str) -> str:
+        """Prompt for the final synthesis turn after the debate converged early."""
+        statements = {}
+        for msg in messages:
+            if msg.source in positions and isinstance(getattr(msg, "content", None), str):
+                statements[msg.source] = msg.content
+
+        summary = "\n\n".join(
+            f"{name} (answer: {positions[name]}):\n{statement}"
+            for name, statement in statements.items()
+        )
+        return f"""The debate has converged.
+
+Synthesize the final answer to the ORIGINAL TASK, explain which groups' approaches were correct,
+and end with the keyword '{CONSENSUS_REACHED_KEYWORD}'.
+
+ORIGINAL TASK:
+{'-'*60}
+{original_task}
+{'-'*60}
+
+Latest statement of each leader:
+{summary}
+"""
+
+    def _degraded_answer(self, group_reports: List[GroupReport], messages: List, reason: str) -> str:
+        """
+        Best available answer when the budget ran out before a consensus.
+
+        Majority of the leaders' latest positions in the debate, falling back
+        to their groups' Phase 1 answers (groups cut off by the budget before
+        their report, or failed, do not vote); without any stated answer, the latest leader
+        report.
+        """
+        votes = {
+            f"{report.group_name}Leader": extract_answer(report.solution)
+            for report in group_reports
+            if report.stop_reason != "error" and (
+                not is_budget_stop(report.stop_reason) or REPORT_READY_KEYWORD in report.stop_reason
+            )
+        }
+        latest = ""
+        for msg in messages:
+            content = getattr(msg, "content", None)
+            if msg.source.endswith("Leader") and isinstance(content, str):
+                latest = content
+                votes[msg.source] = extract_answer(content) or votes.get(msg.source)
+
+        counts = Counter(answer for answer in votes.values() if answer)
+        if counts:
+            answer, count = counts.most_common(1)[0]
+            return (f"Final answer: {answer}\n\n"
+                    f"(Degraded: {reason} before a consensus; "
+                    f"majority of {count} of {len(group_reports)} leaders.)")
+
+        if not latest:
+            for report in reversed(group_reports):
+                if report.stop_reason != "error" and report.solution != "No solution generated":
+                    latest = report.solution
+                    break
+        if latest:
+            return f"{latest}\n\n(Degraded: {reason} before a consensus; latest leader report.)"
+        return f"No result: {reason} before any group reported."
+
+    async def run_debate(
+        self,
+        group_reports: List[GroupReport],
+        original_task: str,
+        transcript_name: str = "phase2_leader_debate",
+        budget: Optional[TaskBudget] = None
+    ) -> DebateResult:
         """
         Run the leader debate to reach consensus.
 
+        When the budget runs out (before or during the debate), the debate
+        stops and the result carries a degraded answer (see _degraded_answer).
+
         Args:
-            group_reports: Reports from Phase 1 (3 groups)
+            group_reports: Reports from Phase 1 (one leader per report)
             original_task: The original task that groups worked on
+            transcript_name: File name of the saved transcript
+            budget: Deadline and token budget of the task
 
         Returns:
             DebateResult with the final consensus answer
@@ -157,17 +257,28 @@ Select from: {participants}
         ]
 
         # Create consensus manager with original task
-        consensus_manager = self._create_consensus_manager(original_task)
+        consensus_manager = self._create_consensus_manager(original_task, len(leaders))
 
         # Create debate team
+        max_messages = self.config.max_debate_rounds * len(leaders) + 5
+        termination = (
+            TextMentionTermination(CONSENSUS_REACHED_KEYWORD) |
+            MaxMessageTermination(max_messages) |
+            BudgetTermination(budget)
+        )
+        convergence = None
+        if self.early_stop:
+            convergence = ConvergenceTermination(
+                leader_names=[leader.name for leader in leaders],
+                stable_rounds=self.stable_rounds
+            )
+            termination = termination | convergence
+
         debate_team = SelectorGroupChat(
             participants=[*leaders, consensus_manager],
             model_client=self.model_client,
             selector_prompt=self._get_selector_prompt(),
-            termination_condition=(
-                TextMentionTermination(CONSENSUS_REACHED_KEYWORD) |
-                MaxMessageTermination(MAX_DEBATE_ROUNDS * len(leaders) + 5)
-            )
+            termination_condition=termination
         )
 
         # Prepare initial task for debate with clear task statement
@@ -178,7 +289,7 @@ ORIGINAL TASK:
 {original_task}
 {'-'*60}
 
-Three groups have independently worked on this task.
+{len(leaders)} groups have independently worked on this task.
 Each group leader will now present their findings on THE TASK ABOVE.
 
 After presentations, discuss and reach consensus on the final answer to THE ORIGINAL TASK.
@@ -186,46 +297,91 @@ After presentations, discuss and reach consensus on the final answer to THE ORIG
 Group leaders, please present your solutions to the task.
 """
 
-        # Run debate
-        print("Starting debate...\n")
-        result = await debate_team.run(task=initial_prompt)
+        # Run debate (unless the budget is already spent)
+        if budget is not None and budget.exhausted:
+            print(f"[BUDGET] {budget.reason}: skipping the debate\n")
+            messages, stop_reason = [], budget.reason
+        else:
+            print("Starting debate...\n")
+            result = await run_team(debate_team, initial_prompt, budget)
+            messages = list(result.messages)
+            stop_reason = result.stop_reason or ""
+        degraded = is_budget_stop(stop_reason) and CONSENSUS_REACHED_KEYWORD not in stop_reason
+
+        # Stopped on convergence: one final synthesis turn by the ConsensusManager
+        converged = bool(
+            not degraded and convergence and convergence.stopped and
+            CONSENSUS_REACHED_KEYWORD not in stop_reason
+        )
+        if converged:
+            print(f"[DEBATE] {stop_reason}; asking ConsensusManager for the final synthesis\n")
+            try:
+                with budget_scope(budget):
+                    synthesis = await consensus_manager.run(
+                        task=self._get_synthesis_prompt(messages, convergence.final_positions, original_task)
+                    )
+                messages.append(synthesis.messages[-1])
+            except BudgetExhausted as e:
+                stop_reason, degraded, converged = str(e), True, False
 
         # Extract final answer from ConsensusManager's last message
         final_answer = ""
-        consensus_reached = CONSENSUS_REACHED_KEYWORD in result.stop_reason
+        consensus_reached = (
+            CONSENSUS_REACHED_KEYWORD in stop_reason or
+            (converged and convergence.final_agreed is not None)
+        )
 
-        for msg in reversed(result.messages):
-            if msg.source == "ConsensusManager":
-                final_answer = msg.content
-                break
+        if degraded:
+            final_answer = self._degraded_answer(group_reports, messages, stop_reason)
+            print(f"[BUDGET] {stop_reason}: returning a degraded answer\n")
+        else:
+            for msg in reversed(messages):
+                if msg.source == "ConsensusManager":
+                    final_answer = msg.content
+                    break
 
         if not final_answer:
             final_answer = "No consensus reached. Debate inconclusive."
 
         debate_result = DebateResult(
             final_answer=final_answer,
-            debate_messages=result.messages,
+            debate_messages=messages,
             consensus_reached=consensus_reached,
-            stop_reason=result.stop_reason
+            stop_reason=stop_reason,
+            converged=converged,
+            turns_saved=max(0, max_messages - len(messages)) if converged else 0,
+            positions=dict(convergence.final_positions) if convergence else {},
+            degraded=degraded
         )
 
         print(f"\n{'#'*60}")
         print("PHASE 2 COMPLETED")
         print(f"{'#'*60}\n")
         print(f"Consensus reached: {consensus_reached}")
-        print(f"Stop reason: {result.stop_reason}\n")
+        print(f"Stop reason: {stop_reason}")
+        if converged:
+            print(f"Turns saved by early stop: {debate_result.turns_saved}")
+        print()
 
         # Save transcript if logger is available
         if self.logger:
             transcript_path = self.logger.save_debate_transcript(
-                messages=result.messages,
+                messages=messages,
                 final_answer=final_answer,
                 metadata={
                     "consensus_reached": consensus_reached,
-                    "stop_reason": result.stop_reason,
-                    "message_count": len(result.messages)
-                }
+                    "stop_reason": stop_reason,
+                    "message_count": len(messages),
+                    "converged": converged,
+                    "turns_saved": debate_result.turns_saved,
+                    "degraded": degraded
+                },
+                name=transcript_name
             )
             print(f"[LOG] Debate transcript saved: {transcript_path}\n")
 
+        # Keep compact records instead of the autogen message objects
+        store = self.logger.get_payload_store() if self.logger else None
+        debate_result.debate_messages = [to_record(msg, store) for msg in messages]
+
         return debate_result
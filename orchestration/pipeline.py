@@ -0,0 +1,236 @@
+"""
+Pipelined phase scheduler for batch runs.
+
+Instead of running each task strictly Phase 1 -> Phase 2, group runs and
+debates are separate stages with their own worker pools:
+
+    admit task --> [group queue] --> group workers --> [debate queue] --> debate workers
+
+Task i+1's groups run while task i debates, so provider concurrency stays
+busy during debates and code-execution waits. Both queues are bounded: when
+the debate stage falls behind, group workers block on the debate queue, which
+in turn stops new tasks from being admitted (back-pressure).
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from orchestration.checkpoint import (
+    save_phase1_checkpoint,
+    load_resume_checkpoint
+)
+from orchestration.phase1_parallel import GroupReport
+from config import (
+    PIPELINE_GROUP_WORKERS,
+    PIPELINE_DEBATE_WORKERS,
+    PIPELINE_DEBATE_QUEUE,
+    TASK_DEADLINE_SECONDS,
+    TASK_TOKEN_BUDGET
+)
+from utils.budget import TaskBudget
+from utils.usage import TaskUsage, track_usage
+
+
+@dataclass
+class _TaskState:
+    """Progress of one task through the pipeline."""
+    index: int
+    item: Dict[str, Any]
+    system: Any
+    reports: List[Optional[GroupReport]] = field(default_factory=list)
+    remaining: int = 0
+    started: Optional[float] = None                    # first group run started
+    budget: Optional[TaskBudget] = None                # starts with the first group run
+    usage: TaskUsage = field(default_factory=TaskUsage)  # model calls of all its jobs
+    timings: Dict[str, float] = field(default_factory=lambda: {"phase1_seconds": 0.0})
+
+
+class PipelinedScheduler:
+    """
+    Runs many tasks with Phase 1 group runs and Phase 2 debates overlapped.
+
+    Args:
+        system_factory: Called with a dataset item, returns a fresh
+            MultiAgentDebateSystem for that task
+        group_workers: Group runs in flight at once (Phase 1 stage)
+        debate_workers: Debates in flight at once (Phase 2 stage)
+        max_pending_debates: Finished-Phase-1 tasks allowed to wait for a
+            debate worker before group workers block
+        deadline: Seconds each task may take from its first group run,
+            including time waiting for a debate worker (None = no limit)
+        token_budget: Tokens each task may use (None = no limit)
+    """
+
+    def __init__(
+        self,
+        system_factory: Callable[[Dict[str, Any]], Any],
+        group_workers: int = PIPELINE_GROUP_WORKERS,
+        debate_workers: int = PIPELINE_DEBATE_WORKERS,
+        max_pending_debates: int = PIPELINE_DEBATE_QUEUE,
+        deadline: Optional[float] = TASK_DEADLINE_SECONDS,
+        token_budget: Optional[int] = TASK_TOKEN_BUDGET
+    ):
+        self.system_factory = system_factory
+        self.group_workers = group_workers
+        self.debate_workers = debate_workers
+        self.max_pending_debates = max_pending_debates
+        self.deadline = deadline
+        self.token_budget = token_budget
+
+    async def run(
+        self,
+        items: List[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run all items through the pipeline.
+
+        Args:
+            items: Dataset items, each with at least a "task" key
+            on_result: Optional callback(item, result) fired as each task finishes
+
+        Returns:
+            One result dictionary per item, in input order (failed debates
+            have an "error" key instead of a final answer)
+        """
+        group_queue: asyncio.Queue = asyncio.Queue(maxsize=self.group_workers)
+        debate_queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending_debates)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        start = time.perf_counter()
+
+        def deliver(index: int, item: Dict[str, Any], result: Dict[str, Any]):
+            results[index] = result
+            if on_result:
+                try:
+                    on_result(item, result)
+                except Exception as e:
+                    # A failing callback must not take a worker down with it
+                    print(f"\n[ERROR] Result callback for task {index} failed: {e!r}\n")
+
+        async def admit():
+            for index, item in enumerate(items):
+                try:
+                    system = self.system_factory(item)
+                    group_names = system.phase1.group_names
+                    state = _TaskState(
+                        index=index,
+                        item=item,
+                        system=system,
+                        reports=[None] * len(group_names),
+                        remaining=len(group_names)
+                    )
+
+                    # Tasks that already finished Phase 1 go straight to the debate stage
+                    session_dir = system.logger.get_session_dir() if system.logger else None
+                    reports = None
+                    if session_dir:
+                        reports = load_resume_checkpoint(
+                            session_dir, item["task"], system.logger.get_payload_store()
+                        )
+                except Exception as e:
+                    print(f"\n[ERROR] Task {index} could not be started: {e!r}\n")
+                    deliver(index, item, {"task": item["task"], "error": repr(e)})
+                    continue
+
+                if reports is not None:
+                    state.reports = reports
+                    state.usage.add_messages(msg for report in reports for msg in report.messages)
+                    state.remaining = 0
+                    await debate_queue.put(state)
+                    continue
+
+                for position, group_name in enumerate(group_names):
+                    await group_queue.put((state, position, group_name))
+
+        async def group_worker():
+            while True:
+                job = await group_queue.get()
+                if job is None:
+                    return
+                state, position, group_name = job
+                if state.started is None:
+                    state.started = time.perf_counter()
+                    if self.deadline is not None or self.token_budget is not None:
+                        state.budget = TaskBudget(deadline=self.deadline, token_budget=self.token_budget)
+                try:
+                    with track_usage(state.usage):
+                        state.reports[position] = await state.system.phase1.run_named_group(
+                            group_name, state.item["task"], budget=state.budget
+                        )
+                except Exception as e:
+                    print(f"\n[ERROR] {group_name} of task {state.index} failed: {e!r}\n")
+                    state.reports[position] = GroupReport(
+                        group_name=group_name,
+                        messages=[],
+                        solution=f"ERROR: {e!r}",
+                        stop_reason="error"
+                    )
+                state.remaining -= 1
+                if state.remaining == 0:
+                    state.timings["phase1_seconds"] = time.perf_counter() - state.started
+                    if state.system.logger:
+                        try:
+                            save_phase1_checkpoint(
+                                state.system.logger.get_session_dir(), state.item["task"], state.reports
+                            )
+                        except Exception as e:
+                            print(f"[CHECKPOINT] Could not save the Phase 1 checkpoint of task {state.index}: {e!r}")
+                    # Blocks while the debate stage is saturated
+                    await debate_queue.put(state)
+
+        async def debate_worker():
+            while True:
+                state = await debate_queue.get()
+                if state is None:
+                    return
+                task = state.item["task"]
+                try:
+                    debate_started = time.perf_counter()
+                    with track_usage(state.usage):
+                        debate_result = await state.system.phase2.run_debate(
+                            state.reports, original_task=task, budget=state.budget
+                        )
+                    state.timings["phase2_seconds"] = time.perf_counter() - debate_started
+                    # Time spent waiting in the debate queue counts towards the total
+                    state.timings["total_seconds"] = time.perf_counter() - (state.started or debate_started)
+                    result = state.system.finalize_run(
+                        task, state.reports, debate_result, verbose=False, timings=state.timings,
+                        usage=state.usage
+                    )
+                except Exception as e:
+                    print(f"\n[ERROR] Debate for task {state.index} failed: {e!r}\n")
+                    result = {"task": task, "phase1_reports": state.reports, "error": repr(e)}
+                finally:
+                    state.system.cleanup()
+
+                deliver(state.index, state.item, result)
+
+        async def drive():
+            await admit()
+            for _ in group_tasks:
+                await group_queue.put(None)
+            await asyncio.gather(*group_tasks)
+            for _ in debate_tasks:
+                await debate_queue.put(None)
+            await asyncio.gather(*debate_tasks)
+
+        group_tasks = [asyncio.create_task(group_worker()) for _ in range(self.group_workers)]
+        debate_tasks = [asyncio.create_task(debate_worker()) for _ in range(self.debate_workers)]
+        driver = asyncio.create_task(drive())
+
+        try:
+            # A worker that dies would leave the queues blocked forever: fail the run instead
+            await asyncio.wait([driver, *group_tasks, *debate_tasks], return_when=asyncio.FIRST_EXCEPTION)
+            for worker in group_tasks + debate_tasks:
+                if worker.done() and not worker.cancelled() and worker.exception() is not None:
+                    raise worker.exception()
+            await driver
+        finally:
+            for worker in [driver, *group_tasks, *debate_tasks]:
+                worker.cancel()
+
+        elapsed = time.perf_counter() - start
+        print(f"[PIPELINE] {len(items)} tasks in {elapsed:.1f}s "
+              f"({len(items) / elapsed * 60 if elapsed else 0:.1f} tasks/min)")
+        return results
@@ -0,0 +1,119 @@
+"""
+Phase 2 (many groups): tournament-style bracket debate.
+
+A single debate between N leaders grows linearly in turns and context. With
+many groups, the reports are instead split into small brackets whose debates
+run concurrently. Each bracket's synthesis advances as one report to the
+next round, so the number of rounds grows with log N and every debate stays
+the size of a bracket. The last round is an ordinary leader debate.
+"""
+import asyncio
+from typing import List, Optional
+
+from orchestration.phase1_parallel import GroupReport
+from orchestration.phase2_debate import Phase2DebateOrchestrator, DebateResult
+from utils.budget import TaskBudget
+
+
+class TournamentDebateOrchestrator:
+    """
+    Runs the leader debate as a bracket tournament.
+
+    Has the same run_debate interface as Phase2DebateOrchestrator, which it
+    uses for every sub-debate.
+    """
+
+    def __init__(
+        self,
+        debate: Phase2DebateOrchestrator,
+        bracket_size: Optional[int] = None
+    ):
+        """
+        Initialize the tournament.
+
+        Args:
+            debate: Orchestrator that runs each bracket's debate
+            bracket_size: Leaders per sub-debate, at least 2
+                (default: the debate's config.tournament_bracket_size)
+        """
+        if bracket_size is None:
+            bracket_size = debate.config.tournament_bracket_size
+        if bracket_size < 2:
+            raise ValueError("bracket_size must be at least 2")
+        self.debate = debate
+        self.bracket_size = bracket_size
+
+    def _brackets(self, reports: List[GroupReport]) -> List[List[GroupReport]]:
+        """Split reports into at most bracket_size-sized brackets of nearly equal size."""
+        count = -(-len(reports) // self.bracket_size)
+        size, extra = divmod(len(reports), count)
+        brackets, start = [], 0
+        for i in range(count):
+            end = start + size + (1 if i < extra else 0)
+            brackets.append(reports[start:end])
+            start = end
+        return brackets
+
+    async def _run_bracket(
+        self,
+        bracket: List[GroupReport],
+        original_task: str,
+        round_num: int,
+        index: int,
+        budget: Optional[TaskBudget] = None
+    ) -> GroupReport:
+        """Debate one bracket and turn its synthesis into a report for the next round."""
+        name = f"Round{round_num}Bracket{index}"
+        if len(bracket) == 1:
+            return bracket[0]
+
+        result = await self.debate.run_debate(
+            bracket,
+            original_task=original_task,
+            transcript_name=f"phase2_round{round_num}_bracket{index}",
+            budget=budget
+        )
+        members = ", ".join(report.group_name for report in bracket)
+        return GroupReport(
+            group_name=name,
+            messages=result.debate_messages,
+            solution=f"Synthesis of {members}:\n{result.final_answer}",
+            stop_reason=result.stop_reason
+        )
+
+    async def run_debate(
+        self,
+        group_reports: List[GroupReport],
+        original_task: str,
+        budget: Optional[TaskBudget] = None
+    ) -> DebateResult:
+        """
+        Run bracket rounds until one final debate decides the answer.
+
+        Args:
+            group_reports: Reports from Phase 1
+            original_task: The original task that groups worked on
+            budget: Deadline and token budget of the task; once it runs
+                out, the remaining debates return degraded answers
+
+        Returns:
+            DebateResult of the final debate
+        """
+        reports = list(group_reports)
+        round_num = 1
+        while len(reports) > self.bracket_size:
+            brackets = self._brackets(reports)
+            print(f"\n[TOURNAMENT] Round {round_num}: {len(reports)} positions "
+                  f"in {len(brackets)} brackets\n")
+            tasks = [
+                asyncio.create_task(
+                    self._run_bracket(bracket, original_task, round_num, i, budget),
+                    name=f"Round{round_num}Bracket{i}"
+                )
+                for i, bracket in enumerate(brackets, 1)
+            ]
+            reports = list(await asyncio.gather(*tasks))
+            round_num += 1
+
+        print(f"\n[TOURNAMENT] Final debate between {len(reports)} positions\n")
+        return await self.debate.run_debate(reports, original_task=original_task, budget=budget)
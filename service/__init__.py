@@ -0,0 +1,5 @@
+"""HTTP service module."""
+from .http import HTTPServer, Request, Response, StreamResponse, Router
+from .app import JobService
+
+__all__ = ["HTTPServer", "Request", "Response", "StreamResponse", "Router", "JobService"]
@@ -0,0 +1,65 @@
+"""
+Run the HTTP job service.
+
+Usage:
+    python -m service --port 8080 --workers 4
+    python -m service --base-url http://127.0.0.1:9000/v1   # against a local stub LLM
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from config import (
+    MODEL_NAME,
+    API_KEY,
+    OPENAI_BASE_URL,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_WORKERS,
+    SERVICE_DATA_DIR
+)
+from service.app import JobService
+from service.http import HTTPServer
+from utils.model_client import create_model_client
+
+
+async def serve(args: argparse.Namespace):
+    api_key = args.api_key or API_KEY
+    if not api_key:
+        raise SystemExit("OpenAI API key not found. Set OPENAI_API_KEY or pass --api-key.")
+
+    # One model client and connection pool shared by every job
+    model_client = create_model_client(args.model, api_key, base_url=args.base_url)
+    service = JobService(model_client, data_dir=args.data_dir, workers=args.workers)
+    server = HTTPServer(service.router, host=args.host, port=args.port)
+
+    await service.start()
+    await server.start()
+    print(f"[SERVICE] Listening on {server.url} ({args.workers} workers)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+        await service.stop()
+        await model_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-agent debate job service.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Concurrent jobs")
+    parser.add_argument("--data-dir", type=Path, default=SERVICE_DATA_DIR)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--base-url", default=OPENAI_BASE_URL, help="OpenAI-compatible endpoint")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+HTTP job service around MultiAgentDebateSystem.
+
+Endpoints:
+    POST   /jobs                 {"task": "..."} -> {"job_id": "..."}
+    GET    /jobs/{job_id}        status, progress events and (when done) result
+    GET    /jobs/{job_id}/events progress as Server-Sent Events
+    GET    /jobs/{job_id}/result result (409 while the job is unfinished)
+    DELETE /jobs/{job_id}        cancel a queued or running job
+    GET    /health               worker pool status
+
+All jobs share one model client (and its HTTP connection pool). Jobs are
+persisted in SQLite and run on a bounded worker pool; each job writes its
+transcripts to <data_dir>/transcripts/<job_id>/ so a job interrupted by a
+restart resumes from its Phase 1 checkpoint. Progress events are kept in
+memory for the SERVICE_EVENT_HISTORY most recently finished jobs.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from autogen_core.models import ChatCompletionClient
+
+from config import GROUP_NAMES, SERVICE_WORKERS, SERVICE_DATA_DIR, SERVICE_EVENT_HISTORY
+from teams import GroupTeamPool
+from utils.workspace import WorkspaceManager
+from utils.exec_cache import get_execution_cache
+from service.http import Request, Response, Router, StreamResponse, sse_event
+from service.jobs import (
+    JobStore,
+    QUEUED,
+    RUNNING,
+    COMPLETED,
+    FAILED,
+    CANCELLED,
+    FINISHED_STATES
+)
+
+
+def summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a MultiAgentDebateSystem.run() result to JSON-friendly data."""
+    debate = result.get("phase2_debate")
+    return {
+        "final_answer": result["final_answer"],
+        "degraded": result.get("degraded", False),
+        "consensus_reached": debate.consensus_reached if debate else None,
+        "stop_reason": debate.stop_reason if debate else None,
+        "turns_saved": debate.turns_saved if debate else None,
+        "groups": [
+            {
+                "group_name": report.group_name,
+                "solution": report.solution,
+                "stop_reason": report.stop_reason,
+            }
+            for report in result.get("phase1_reports", [])
+        ],
+        "log_directory": str(result["log_directory"]) if result.get("log_directory") else None,
+    }
+
+
+class JobService:
+    """
+    Bounded worker pool executing persisted debate jobs.
+    """
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        data_dir: Path = SERVICE_DATA_DIR,
+        workers: int = SERVICE_WORKERS
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            model_client: Model client shared by every job
+            data_dir: Directory for the job database, transcripts and workspaces
+            workers: Maximum number of jobs running at once
+        """
+        self.model_client = model_client
+        self.data_dir = Path(data_dir)
+        self.workers = workers
+        self.store = JobStore(self.data_dir / "jobs.db")
+        self.team_pool = GroupTeamPool(
+            model_client,
+            work_dir=self.data_dir / "coding",
+            max_active=len(GROUP_NAMES) * workers
+        )
+        self.workspaces = WorkspaceManager(
+            root=self.data_dir / "coding" / "runs",
+            pool_size=workers + 1
+        )
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancel_requested = set()
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        # Finished jobs whose events are still kept, oldest first
+        self._finished_events: "OrderedDict[str, None]" = OrderedDict()
+        self._changed = asyncio.Condition()
+        self._worker_tasks: List[asyncio.Task] = []
+
+        self.router = Router()
+        self.router.add("POST", "/jobs", self.handle_submit)
+        self.router.add("GET", "/jobs/{job_id}", self.handle_get)
+        self.router.add("GET", "/jobs/{job_id}/events", self.handle_events)
+        self.router.add("GET", "/jobs/{job_id}/result", self.handle_result)
+        self.router.add("DELETE", "/jobs/{job_id}", self.handle_cancel)
+        self.router.add("GET", "/health", self.handle_health)
+
+    async def start(self):
+        """Requeue interrupted jobs and start the worker pool."""
+        recovered = self.store.recover()
+        for job_id in recovered:
+            self._queue.put_nowait(job_id)
+        if recovered:
+            print(f"[SERVICE] Requeued {len(recovered)} unfinished jobs")
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Stop the workers. Running jobs stay 'running' and are resumed on restart."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self.team_pool.cleanup()
+        await self.workspaces.wait_cleanup()
+        self.workspaces.cleanup()
+        self.store.close()
+
+    # ----------------------------------------------------------------- jobs
+
+    def submit(self, task: str) -> str:
+        """Queue a task and return its job id."""
+        job_id = self.store.create(task)
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            False if the job had already finished
+        """
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return False
+        running = self._running.get(job_id)
+        if running:
+            self._cancel_requested.add(job_id)
+            running.cancel()
+        else:
+            self.store.update(job_id, CANCELLED)
+            await self._publish(job_id, "cancelled", {})
+            self._release_events(job_id)
+        return True
+
+    async def _publish(self, job_id: str, event: str, data: Dict[str, Any]):
+        """Record a progress event and wake up SSE listeners."""
+        self._events.setdefault(job_id, []).append({"event": event, "time": time.time(), **data})
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _release_events(self, job_id: str):
+        """
+        Mark a job's events as final and forget those of the oldest finished
+        jobs beyond SERVICE_EVENT_HISTORY. SSE streams still sending them keep
+        their own reference to the event list.
+        """
+        self._finished_events[job_id] = None
+        while len(self._finished_events) > SERVICE_EVENT_HISTORY:
+            old_job_id, _ = self._finished_events.popitem(last=False)
+            self._events.pop(old_job_id, None)
+
+    async def _worker(self):
+        from main import MultiAgentDebateSystem
+
+        while True:
+            job_id = await self._queue.get()
+            job = self.store.get(job_id)
+            if job is None or job["status"] != QUEUED:
+                continue
+
+            session_dir = self.data_dir / "transcripts" / job_id
+            self.store.update(job_id, RUNNING, session_dir=str(session_dir))
+            await self._publish(job_id, "running", {})
+
+            loop = asyncio.get_running_loop()
+
+            def on_event(event: str, data: Dict[str, Any], job_id=job_id):
+                loop.create_task(self._publish(job_id, event, data))
+
+            system = MultiAgentDebateSystem(
+                model_client=self.model_client,
+                session_dir=session_dir,
+                on_event=on_event,
+                team_pool=self.team_pool,
+                workspaces=self.workspaces,
+                summary_only=True
+            )
+            run = asyncio.create_task(system.run(job["task"], verbose=False, resume=True))
+            self._running[job_id] = run
+            try:
+                result = await run
+                self.store.update(job_id, COMPLETED, result=summarize_result(result))
+                await self._publish(job_id, "finished", {"status": COMPLETED})
+            except asyncio.CancelledError:
+                if job_id not in self._cancel_requested:
+                    raise  # the service is stopping; the job resumes on restart
+                self.store.update(job_id, CANCELLED)
+                await self._publish(job_id, "finished", {"status": CANCELLED})
+            except Exception as e:
+                self.store.update(job_id, FAILED, error=f"{type(e).__name__}: {e}")
+                await self._publish(job_id, "finished", {"status": FAILED, "error": str(e)})
+            finally:
+                self._running.pop(job_id, None)
+                self._cancel_requested.discard(job_id)
+                if self.store.get(job_id)["status"] in FINISHED_STATES:
+                    self._release_events(job_id)
+                system.cleanup()
+
+    # ------------------------------------------------------------- handlers
+
+    async def handle_submit(self, request: Request) -> Response:
+        try:
+            task = request.json().get("task")
+        except ValueError:
+            return Response.error(400, "Body must be JSON")
+        if not isinstance(task, str) or not task.strip():
+            return Response.error(400, "Field 'task' (non-empty string) is required")
+        job_id = self.submit(task)
+        return Response.json({"job_id": job_id, "status": QUEUED}, status=202)
+
+    async def handle_get(self, request: Request) -> Response:
+        job = self.store.get(request.params["job_id"])
+        if job is None:
+            return Response.error(404, "Unknown job")
+        job["events"] = self._events.get(job["id"], [])
+        return Response.json(job)
+
+    async def handle_result(self, request: Request) -> Response:
+        job = self.store.get(request.params["job_id"])
+        if job is None:
+            return Response.error(404, "Unknown job")
+        if job["status"] != COMPLETED:
+            return Response.json({"status": job["status"], "error": job["error"]}, status=409)
+        return Response.json(job["result"])
+
+    async def handle_cancel(self, request: Request) -> Response:
+        job_id = request.params["job_id"]
+        if self.store.get(job_id) is None:
+            return Response.error(404, "Unknown job")
+        if not await self.cancel(job_id):
+            return Response.error(409, "Job already finished")
+        return Response.json({"job_id": job_id, "cancelling": True}, status=202)
+
+    async def handle_events(self, request: Request):
+        job_id = request.params["job_id"]
+        if self.store.get(job_id) is None:
+            return Response.error(404, "Unknown job")
+
+        async def stream():
+            sent = 0
+            events = None
+            yield sse_event({"status": self.store.get(job_id)["status"]}, event="status")
+            while True:
+                # Hold on to the list so pruning cannot cut the stream short
+                if events is None:
+                    events = self._events.get(job_id)
+                for item in (events or [])[sent:]:
+                    yield sse_event(item, event=item["event"])
+                sent = len(events or [])
+                if self.store.get(job_id)["status"] in FINISHED_STATES:
+                    return
+                async with self._changed:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=15)
+                    except asyncio.TimeoutError:
+                        yield b": keep-alive\n\n"
+
+        return StreamResponse(stream())
+
+    async def handle_health(self, request: Request) -> Response:
+        exec_cache = get_execution_cache()
+        return Response.json({
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": self._queue.qsize(),
+            "pooled_teams": self.team_pool.size,
+            "exec_cache": exec_cache.stats() if exec_cache else None,
+        })
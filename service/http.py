@@ -0,0 +1,266 @@
+"""
+Minimal asyncio HTTP/1.1 server (standard library only).
+
+Supports keep-alive, Content-Length request bodies, JSON responses and
+streamed responses (used for Server-Sent Events). It is intentionally small:
+enough for a local job service and a local stub LLM endpoint, not a general
+web framework.
+"""
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+
+REASONS = {
+    200: "OK", 201: "Created", 202: "Accepted", 204: "No Content",
+    400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 429: "Too Many Requests",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes = b""
+    params: Dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> Any:
+        """Decode the body as JSON (empty body -> {})."""
+        return json.loads(self.body) if self.body else {}
+
+    def form(self) -> Dict[str, Tuple[Optional[str], bytes]]:
+        """Decode a multipart/form-data body into name -> (filename, data)."""
+        content_type = self.headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            raise ValueError("Expected a multipart/form-data body")
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + self.body
+        )
+        return {
+            part.get_param("name", header="content-disposition"): (
+                part.get_filename(), part.get_payload(decode=True) or b""
+            )
+            for part in message.iter_parts()
+        }
+
+
+@dataclass
+class Response:
+    """A complete HTTP response."""
+    status: int = 200
+    body: bytes = b""
+    content_type: str = "application/json"
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> "Response":
+        """Build a JSON response."""
+        body = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+        return cls(status=status, body=body, headers=headers or {})
+
+    @classmethod
+    def error(cls, status: int, message: str) -> "Response":
+        """Build a JSON error response."""
+        return cls.json({"error": message}, status=status)
+
+
+@dataclass
+class StreamResponse:
+    """A streamed response; the connection is closed when the stream ends."""
+    chunks: AsyncIterator[bytes]
+    status: int = 200
+    content_type: str = "text/event-stream"
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+Handler = Callable[[Request], Awaitable[Union[Response, StreamResponse]]]
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> bytes:
+    """Encode one Server-Sent Event."""
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, default=str)
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in payload.split("\n")]
+    return ("\n".join(lines) + "\n\n").encode('utf-8')
+
+
+class Router:
+    """Maps (method, path pattern) to handlers; "{name}" segments become params."""
+
+    def __init__(self):
+        self.routes: List[Tuple[str, re.Pattern, Handler]] = []
+
+    def add(self, method: str, pattern: str, handler: Handler):
+        """Register a handler, e.g. add("GET", "/jobs/{job_id}", get_job)."""
+        regex = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern.rstrip("/") or "/")
+        self.routes.append((method.upper(), re.compile(f"^{regex}/?$"), handler))
+
+    async def __call__(self, request: Request) -> Union[Response, StreamResponse]:
+        allowed = False
+        for method, regex, handler in self.routes:
+            match = regex.match(request.path)
+            if not match:
+                continue
+            if method != request.method:
+                allowed = True
+                continue
+            request.params = match.groupdict()
+            return await handler(request)
+        if allowed:
+            return Response.error(405, "Method not allowed")
+        return Response.error(404, "Not found")
+
+
+class HTTPServer:
+    """
+    Asyncio HTTP/1.1 server around a single request handler.
+    """
+
+    def __init__(self, handler: Handler, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Initialize the server.
+
+        Args:
+            handler: Coroutine turning a Request into a Response or StreamResponse
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.active_connections = 0
+        self.total_connections = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._writers = set()
+
+    async def start(self):
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and close open (keep-alive) connections."""
+        if self._server:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        """Read one request from the connection (None on EOF)."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+        lines = head.decode('latin-1').split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        return Request(
+            method=method.upper(),
+            path=url.path,
+            query=dict(parse_qsl(url.query)),
+            headers=headers,
+            body=body
+        )
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.active_connections += 1
+        self.total_connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ValueError as e:
+                    await self._write_response(writer, Response.error(413, str(e)), keep_alive=False)
+                    return
+                if request is None:
+                    return
+
+                try:
+                    response = await self.handler(request)
+                except Exception as e:
+                    response = Response.error(500, f"{type(e).__name__}: {e}")
+
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                if isinstance(response, StreamResponse):
+                    await self._write_stream(writer, response)
+                    return
+                await self._write_response(writer, response, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Cancelled when the loop shuts down with idle keep-alive connections
+            pass
+        finally:
+            self.active_connections -= 1
+            self._writers.discard(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    @staticmethod
+    def _status_line(status: int) -> str:
+        return f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+
+    async def _write_response(self, writer: asyncio.StreamWriter, response: Response, keep_alive: bool):
+        headers = {
+            "Content-Type": response.content_type,
+            "Content-Length": str(len(response.body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+            **response.headers,
+        }
+        head = self._status_line(response.status) + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        writer.write(head.encode('latin-1') + b"\r\n" + response.body)
+        await writer.drain()
+
+    async def _write_stream(self, writer: asyncio.StreamWriter, response: StreamResponse):
+        headers = {
+            "Content-Type": response.content_type,
+            "Cache-Control": "no-cache",
+            "Connection": "close",
+            **response.headers,
+        }
+        head = self._status_line(response.status) + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        writer.write(head.encode('latin-1') + b"\r\n")
+        await writer.drain()
+        async for chunk in response.chunks:
+            writer.write(chunk)
+            await writer.drain()
@@ -0,0 +1,109 @@
+"""
+Persistent job queue for the HTTP service.
+
+Jobs live in a SQLite file so they survive restarts: on startup, jobs that
+were queued or running are put back on the queue (running jobs resume from
+their Phase 1 checkpoint when one was written).
+"""
+import json
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobStore:
+    """SQLite-backed job table."""
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the job store.
+
+        Args:
+            db_path: SQLite file holding the jobs
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " task TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " session_dir TEXT,"
+                " result TEXT,"
+                " error TEXT)"
+            )
+
+    def create(self, task: str) -> str:
+        """Insert a new queued job and return its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, task, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, task, QUEUED, now, now)
+            )
+        return job_id
+
+    def update(self, job_id: str, status: str, **fields: Any):
+        """
+        Update a job's status and optional fields (session_dir, result, error).
+
+        Args:
+            job_id: Job id
+            status: New status
+            **fields: Column values to set; "result" is stored as JSON
+        """
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False, default=str)
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        assignments = "status = ?, updated_at = ?" + (f", {columns}" if columns else "")
+        with self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                (status, time.time(), *fields.values(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a job as a dictionary (None if unknown)."""
+        row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def recover(self) -> List[str]:
+        """
+        Requeue jobs interrupted by a restart.
+
+        Returns:
+            Ids of all unfinished jobs, oldest first
+        """
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (QUEUED, time.time(), RUNNING)
+            )
+        rows = self._conn.execute(
+            "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+        ).fetchall()
+        return [row["id"] for row in rows]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,622 @@
+"""
+Local stub of the OpenAI chat-completions API.
+
+Lets the whole system (real OpenAIChatCompletionClient, real HTTP) run end to
+end without a provider account:
+
+- Speaker-selection prompts get the name of a Leader / ConsensusManager
+- Every other request gets a short answer that ends the group and the debate
+
+For load and soak tests (see loadtest.py) the stub can also behave more like
+a provider:
+
+- latency drawn from a fixed, uniform or lognormal distribution, plus a
+  per-token generation time
+- injected HTTP 500s and 429s (with Retry-After), and 429s above a
+  concurrency limit
+- tool calls for requests that offer tools
+- scripted replies: regex rules with templated content or tool calls
+
+It also stands in for the Batch API used by deferred execution
+(utils/deferred.py): POST /v1/files, GET /v1/files/{id}/content,
+POST /v1/batches and GET /v1/batches/{id}. Batch lines are answered like
+ordinary requests, after an optional --batch-delay.
+
+Like a provider, the stub caches prompt prefixes: usage reports the
+longest previously seen prefix (1024+ tokens, in 128-token steps) as
+prompt_tokens_details.cached_tokens.
+
+GET /stats reports request, status, connection and prompt-cache counters.
+
+Usage:
+    python -m service.stub_llm --port 9000
+    python -m service.stub_llm --port 9000 --latency-ms 800 --latency-dist lognormal \\
+        --error-rate 0.01 --rate-limit-rate 0.02 --tool-call-rate 0.3
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=stub python main.py
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import string
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import REPORT_READY_KEYWORD, CONSENSUS_REACHED_KEYWORD
+from service.http import HTTPServer, Request, Response, Router
+
+
+SPEAKER_PATTERN = re.compile(r"\b(\w*Leader|ConsensusManager)\b")
+# Candidate line that ends the selector prompts of the groups and the debate
+SELECTOR_PATTERN = re.compile(
+    r"^\s*Select (?:the most appropriate agent )?from:\s*(.+)$", re.MULTILINE
+)
+DEFAULT_ANSWER = (
+    "Final answer: yes\n\n"
+    f"{REPORT_READY_KEYWORD}\n{CONSENSUS_REACHED_KEYWORD}"
+)
+
+# Example values for tool arguments, by parameter name
+EXAMPLE_ARGUMENTS = {
+    "code": "print('stub result')",
+    "query": "stub query",
+    "queries": ["stub query 1", "stub query 2"],
+}
+
+
+def _message_text(messages: List[Dict[str, Any]]) -> str:
+    """Concatenate the text content of a chat-completions message list."""
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(content or "")
+    return "\n".join(parts)
+
+
+def _usage(prompt_text: str, content: str, cached_tokens: int = 0) -> Dict[str, Any]:
+    prompt_tokens = max(1, len(prompt_text) // 4)
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": min(cached_tokens, prompt_tokens)},
+    }
+
+
+class PromptPrefixCache:
+    """
+    Provider-style prompt cache: remembers prompt prefixes block by block.
+
+    A prompt's cached tokens are the longest prefix, in whole blocks, that an
+    earlier prompt also started with, counted only from min_tokens on.
+    Tokens are estimated as 4 characters, like the usage the stub reports.
+    """
+
+    def __init__(self, min_tokens: int = 1024, block_tokens: int = 128, max_entries: int = 100_000):
+        self.min_tokens = min_tokens
+        self.block_chars = block_tokens * 4
+        self.max_entries = max_entries
+        self._prefixes: "OrderedDict[bytes, None]" = OrderedDict()
+
+    def lookup(self, prompt_text: str) -> int:
+        """Return the cached tokens of a prompt and remember its prefixes."""
+        if not self.min_tokens:
+            return 0
+        digest = hashlib.sha1()
+        cached = 0
+        for start in range(0, len(prompt_text) - self.block_chars + 1, self.block_chars):
+            # Hash of the whole prefix up to the end of this block
+            digest.update(prompt_text[start:start + self.block_chars].encode('utf-8'))
+            key = digest.digest()
+            if key in self._prefixes:
+                self._prefixes.move_to_end(key)
+                cached = (start + self.block_chars) // 4
+            else:
+                self._prefixes[key] = None
+        while len(self._prefixes) > self.max_entries:
+            self._prefixes.popitem(last=False)
+        return cached if cached >= self.min_tokens else 0
+
+
+def completion_response(model: str, content: str, prompt_text: str, cached_tokens: int = 0) -> Dict[str, Any]:
+    """Build a chat.completion response body."""
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": _usage(prompt_text, content, cached_tokens),
+    }
+
+
+def tool_call_response(
+    model: str,
+    name: str,
+    arguments: Dict[str, Any],
+    prompt_text: str,
+    cached_tokens: int = 0
+) -> Dict[str, Any]:
+    """Build a chat.completion response body that calls one tool."""
+    encoded = json.dumps(arguments)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": encoded},
+                }],
+            },
+            "finish_reason": "tool_calls",
+        }],
+        "usage": _usage(prompt_text, encoded, cached_tokens),
+    }
+
+
+def error_response(status: int, message: str, error_type: str, retry_after: Optional[float] = None) -> Response:
+    """Build an OpenAI-style error response."""
+    headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else None
+    return Response.json(
+        {"error": {"message": message, "type": error_type, "code": None}},
+        status=status,
+        headers=headers
+    )
+
+
+def example_arguments(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill a tool's required parameters with example values from its JSON schema."""
+    properties = parameters.get("properties", {})
+    required = parameters.get("required", list(properties))
+    arguments = {}
+    for name in required:
+        schema = properties.get(name, {})
+        if name in EXAMPLE_ARGUMENTS:
+            arguments[name] = EXAMPLE_ARGUMENTS[name]
+        elif schema.get("type") == "array":
+            arguments[name] = ["stub"]
+        elif schema.get("type") in ("integer", "number"):
+            arguments[name] = 1
+        elif schema.get("type") == "boolean":
+            arguments[name] = True
+        elif schema.get("type") == "object":
+            arguments[name] = {}
+        else:
+            arguments[name] = "stub"
+    return arguments
+
+
+@dataclass
+class LatencyModel:
+    """Response time of the stub."""
+    distribution: str = "fixed"   # "fixed", "uniform" or "lognormal"
+    median_ms: float = 0.0
+    spread: float = 0.5           # uniform: +/- fraction of the median; lognormal: sigma
+    per_token_ms: float = 0.0     # added per completion token (generation time)
+
+    def sample(self, rng: random.Random, completion_tokens: int = 0) -> float:
+        """Draw one response time in seconds."""
+        if self.distribution == "uniform":
+            base = self.median_ms * rng.uniform(1 - self.spread, 1 + self.spread)
+        elif self.distribution == "lognormal":
+            base = self.median_ms * math.exp(rng.gauss(0, self.spread)) if self.median_ms else 0.0
+        elif self.distribution == "fixed":
+            base = self.median_ms
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+        return max(0.0, base + self.per_token_ms * completion_tokens) / 1000
+
+
+@dataclass
+class ResponseRule:
+    """
+    Scripted reply: the first rule whose pattern matches is used.
+
+    Templates use $-placeholders: $answer, $model, $request (request number),
+    $report_ready and $consensus (the termination keywords).
+    """
+    pattern: str                        # regex searched in the message text
+    reply: Optional[str] = None         # content template
+    tool: Optional[str] = None          # call this tool (when the request offers it)
+    arguments: Dict[str, Any] = field(default_factory=dict)  # tool arguments (string values are templates)
+    scope: str = "last"                 # match the "last" message or "all" messages
+
+    def matches(self, messages: List[Dict[str, Any]]) -> bool:
+        text = _message_text(messages[-1:] if self.scope == "last" else messages)
+        return re.search(self.pattern, text, re.IGNORECASE | re.DOTALL) is not None
+
+
+def load_rules(path: Path) -> List[ResponseRule]:
+    """Load scripted replies from a JSON list of ResponseRule fields."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [ResponseRule(**rule) for rule in json.load(f)]
+
+
+@dataclass
+class StubBehavior:
+    """How the stub answers, beyond the canned replies."""
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0         # fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0    # fraction of requests answered with HTTP 429
+    max_concurrency: int = 0        # requests in flight above this get a 429 (0 = no limit)
+    retry_after: float = 0.5        # Retry-After seconds sent with 429s
+    tool_call_rate: float = 0.0     # fraction of tool-offering requests answered with a tool call
+    rules: List[ResponseRule] = field(default_factory=list)
+    batch_delay: float = 0.0        # seconds a batch job takes before its lines are answered
+    prompt_cache_min_tokens: int = 1024  # shortest prompt prefix reported as cached (0 = no prompt cache)
+    seed: Optional[int] = None
+
+
+class StubLLMServer:
+    """An OpenAI-compatible chat-completions endpoint with canned replies."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        answer: str = DEFAULT_ANSWER,
+        behavior: Optional[StubBehavior] = None
+    ):
+        """
+        Initialize the stub.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            answer: Reply sent for every non-selection request
+            behavior: Latency, error injection, tool calls and scripted
+                replies (default: instant canned replies)
+        """
+        self.answer = answer
+        self.behavior = behavior or StubBehavior()
+        self.rng = random.Random(self.behavior.seed)
+
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.tool_calls = 0
+        self.batches = 0
+        self.statuses: Counter = Counter()
+        self.prompt_cache = PromptPrefixCache(min_tokens=self.behavior.prompt_cache_min_tokens)
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+        # Batch API state (files hold uploaded inputs and generated outputs)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batch_jobs: Dict[str, Dict[str, Any]] = {}
+        self._batch_tasks: set = set()
+
+        self.router = Router()
+        self.router.add("POST", "/v1/chat/completions", self.handle_chat)
+        self.router.add("POST", "/v1/files", self.handle_upload)
+        self.router.add("GET", "/v1/files/{file_id}/content", self.handle_file_content)
+        self.router.add("POST", "/v1/batches", self.handle_create_batch)
+        self.router.add("GET", "/v1/batches/{batch_id}", self.handle_get_batch)
+        self.router.add("GET", "/stats", self.handle_stats)
+        self.server = HTTPServer(self.router, host=host, port=port)
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.server.url}/v1"
+
+    async def start(self):
+        await self.server.start()
+
+    async def close(self):
+        for task in list(self._batch_tasks):
+            task.cancel()
+        await self.server.close()
+
+    def _render(self, template: str, model: str) -> str:
+        return string.Template(template).safe_substitute(
+            answer=self.answer,
+            model=model,
+            request=self.requests,
+            report_ready=REPORT_READY_KEYWORD,
+            consensus=CONSENSUS_REACHED_KEYWORD
+        )
+
+    def reply_for(self, messages: List[Dict[str, Any]]) -> str:
+        """Choose the canned reply content for a request."""
+        text = _message_text(messages)
+        candidates = SELECTOR_PATTERN.findall(text)
+        if candidates:
+            # Speaker selection: pick from the participant list that ends the selector prompt
+            names = re.findall(r"\w+", candidates[-1])
+            leaders = SPEAKER_PATTERN.findall(candidates[-1])
+            if "ConsensusManager" in leaders:
+                return "ConsensusManager"
+            if leaders or names:
+                return (leaders or names)[0]
+        return self.answer
+
+    def build_reply(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the response body for a request: scripted, tool call or canned reply."""
+        model = body.get("model", "stub")
+        messages = body.get("messages", [])
+        prompt_text = _message_text(messages)
+        tools = {
+            tool["function"]["name"]: tool["function"].get("parameters", {})
+            for tool in body.get("tools") or [] if tool.get("type") == "function"
+        }
+        # Answer a tool result with text, so tool-call loops always end
+        can_call = bool(tools) and (not messages or messages[-1].get("role") != "tool")
+        cached = self.prompt_cache.lookup(prompt_text)
+        self.prompt_tokens += max(1, len(prompt_text) // 4)
+        self.cached_tokens += cached
+
+        for rule in self.behavior.rules:
+            if not rule.matches(messages):
+                continue
+            if rule.tool and can_call and rule.tool in tools:
+                arguments = {
+                    key: self._render(value, model) if isinstance(value, str) else value
+                    for key, value in (rule.arguments or example_arguments(tools[rule.tool])).items()
+                }
+                self.tool_calls += 1
+                return tool_call_response(model, rule.tool, arguments, prompt_text, cached)
+            if rule.reply is not None:
+                return completion_response(model, self._render(rule.reply, model), prompt_text, cached)
+
+        if can_call and self.rng.random() < self.behavior.tool_call_rate:
+            name = self.rng.choice(sorted(tools))
+            self.tool_calls += 1
+            return tool_call_response(model, name, example_arguments(tools[name]), prompt_text, cached)
+        return completion_response(model, self.reply_for(messages), prompt_text, cached)
+
+    async def handle_chat(self, request: Request) -> Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            response = await self._respond(request)
+        finally:
+            self.in_flight -= 1
+        self.statuses[response.status] += 1
+        return response
+
+    async def _respond(self, request: Request) -> Response:
+        behavior = self.behavior
+        if behavior.max_concurrency and self.in_flight > behavior.max_concurrency:
+            return error_response(429, "Too many concurrent requests", "rate_limit_error",
+                                  retry_after=behavior.retry_after)
+
+        return await self._complete(request.json())
+
+    async def _complete(self, request_body: Dict[str, Any]) -> Response:
+        """Answer one chat-completions request body, with latency and injected errors."""
+        behavior = self.behavior
+        roll = self.rng.random()
+        if roll < behavior.rate_limit_rate:
+            return error_response(429, "Rate limit reached (injected)", "rate_limit_error",
+                                  retry_after=behavior.retry_after)
+
+        body = self.build_reply(request_body)
+        await asyncio.sleep(behavior.latency.sample(self.rng, body["usage"]["completion_tokens"]))
+        if roll < behavior.rate_limit_rate + behavior.error_rate:
+            return error_response(500, "Internal server error (injected)", "server_error")
+        return Response.json(body)
+
+    def _store_file(self, data: bytes, filename: str, purpose: str) -> Dict[str, Any]:
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        self.files[file_id] = {
+            "data": data,
+            "object": {
+                "id": file_id,
+                "object": "file",
+                "bytes": len(data),
+                "created_at": int(time.time()),
+                "filename": filename,
+                "purpose": purpose,
+                "status": "processed",
+            },
+        }
+        return self.files[file_id]["object"]
+
+    async def handle_upload(self, request: Request) -> Response:
+        try:
+            form = request.form()
+        except ValueError as e:
+            return error_response(400, str(e), "invalid_request_error")
+        if "file" not in form:
+            return error_response(400, "Missing file", "invalid_request_error")
+        filename, data = form["file"]
+        purpose = form.get("purpose", (None, b"batch"))[1].decode('utf-8')
+        return Response.json(self._store_file(data, filename or "upload.jsonl", purpose))
+
+    async def handle_file_content(self, request: Request) -> Response:
+        stored = self.files.get(request.params["file_id"])
+        if stored is None:
+            return error_response(404, "No such file", "invalid_request_error")
+        return Response(body=stored["data"], content_type="application/octet-stream")
+
+    async def handle_create_batch(self, request: Request) -> Response:
+        body = request.json()
+        stored = self.files.get(body.get("input_file_id", ""))
+        if stored is None:
+            return error_response(400, "Unknown input_file_id", "invalid_request_error")
+        if body.get("endpoint") != "/v1/chat/completions":
+            return error_response(400, "Only /v1/chat/completions batches are supported", "invalid_request_error")
+
+        lines = [json.loads(line) for line in stored["data"].decode('utf-8').splitlines() if line.strip()]
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        job = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": body["endpoint"],
+            "input_file_id": body["input_file_id"],
+            "completion_window": body.get("completion_window", "24h"),
+            "status": "in_progress",
+            "created_at": int(time.time()),
+            "output_file_id": None,
+            "error_file_id": None,
+            "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+        }
+        self.batch_jobs[batch_id] = job
+        self.batches += 1
+        task = asyncio.ensure_future(self._run_batch(job, lines))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+        return Response.json(job)
+
+    async def _run_batch(self, job: Dict[str, Any], lines: List[Dict[str, Any]]):
+        """Answer every line of a batch and write the output and error files."""
+        await asyncio.sleep(self.behavior.batch_delay)
+        self.requests += len(lines)
+        responses = await asyncio.gather(*[self._complete(line.get("body", {})) for line in lines])
+
+        output, errors = [], []
+        for line, response in zip(lines, responses):
+            self.statuses[response.status] += 1
+            record = {
+                "id": f"batch_req_{uuid.uuid4().hex}",
+                "custom_id": line.get("custom_id"),
+                "response": {
+                    "status_code": response.status,
+                    "request_id": uuid.uuid4().hex,
+                    "body": json.loads(response.body),
+                },
+                "error": None,
+            }
+            (output if response.status == 200 else errors).append(json.dumps(record))
+
+        for records, key in ((output, "output_file_id"), (errors, "error_file_id")):
+            if records:
+                data = ("\n".join(records) + "\n").encode('utf-8')
+                job[key] = self._store_file(data, f"{job['id']}_{key[:-8]}.jsonl", "batch_output")["id"]
+        job["request_counts"].update(completed=len(output), failed=len(errors))
+        job["status"] = "completed"
+        job["completed_at"] = int(time.time())
+
+    async def handle_get_batch(self, request: Request) -> Response:
+        job = self.batch_jobs.get(request.params["batch_id"])
+        if job is None:
+            return error_response(404, "No such batch", "invalid_request_error")
+        return Response.json(job)
+
+    async def handle_stats(self, request: Request) -> Response:
+        return Response.json(self.stats())
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, status and connection counters."""
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "tool_calls": self.tool_calls,
+            "batches": self.batches,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "active_connections": self.server.active_connections,
+            "total_connections": self.server.total_connections,
+        }
+
+
+def add_behavior_arguments(parser: argparse.ArgumentParser):
+    """Add the StubBehavior options to a command-line parser (shared with loadtest.py)."""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median response time")
+    parser.add_argument("--latency-dist", choices=("fixed", "uniform", "lognormal"), default="fixed")
+    parser.add_argument("--latency-spread", type=float, default=0.5,
+                        help="uniform: +/- fraction of the median; lognormal: sigma")
+    parser.add_argument("--per-token-ms", type=float, default=0.0, help="Extra time per completion token")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429 responses")
+    parser.add_argument("--max-concurrency", type=int, default=0,
+                        help="Answer 429 above this many requests in flight (0 = no limit)")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="Retry-After seconds on 429")
+    parser.add_argument("--tool-call-rate", type=float, default=0.0,
+                        help="Fraction of tool-offering requests answered with a tool call")
+    parser.add_argument("--script", type=Path, help="JSON list of scripted reply rules")
+    parser.add_argument("--batch-delay", type=float, default=0.0,
+                        help="Seconds a batch job takes before its requests are answered")
+    parser.add_argument("--prompt-cache-min-tokens", type=int, default=1024,
+                        help="Shortest prompt prefix reported as cached (0 disables the prompt cache)")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def behavior_from_args(args: argparse.Namespace) -> StubBehavior:
+    """Build a StubBehavior from add_behavior_arguments options."""
+    return StubBehavior(
+        latency=LatencyModel(
+            distribution=args.latency_dist,
+            median_ms=args.latency_ms,
+            spread=args.latency_spread,
+            per_token_ms=args.per_token_ms
+        ),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        max_concurrency=args.max_concurrency,
+        retry_after=args.retry_after,
+        tool_call_rate=args.tool_call_rate,
+        rules=load_rules(args.script) if args.script else [],
+        batch_delay=args.batch_delay,
+        prompt_cache_min_tokens=args.prompt_cache_min_tokens,
+        seed=args.seed
+    )
+
+
+def behavior_argv(args: argparse.Namespace) -> List[str]:
+    """Turn add_behavior_arguments options back into command-line arguments."""
+    argv = [
+        "--latency-ms", str(args.latency_ms),
+        "--latency-dist", args.latency_dist,
+        "--latency-spread", str(args.latency_spread),
+        "--per-token-ms", str(args.per_token_ms),
+        "--error-rate", str(args.error_rate),
+        "--rate-limit-rate", str(args.rate_limit_rate),
+        "--max-concurrency", str(args.max_concurrency),
+        "--retry-after", str(args.retry_after),
+        "--tool-call-rate", str(args.tool_call_rate),
+        "--batch-delay", str(args.batch_delay),
+        "--prompt-cache-min-tokens", str(args.prompt_cache_min_tokens),
+    ]
+    if args.script:
+        argv += ["--script", str(args.script)]
+    if args.seed is not None:
+        argv += ["--seed", str(args.seed)]
+    return argv
+
+
+async def _serve(host: str, port: int, behavior: StubBehavior):
+    stub = StubLLMServer(host=host, port=port, behavior=behavior)
+    await stub.start()
+    print(f"[STUB] OpenAI-compatible endpoint at {stub.base_url}", flush=True)
+    await stub.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub chat-completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port, behavior_from_args(args)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Sweep over system configurations.
+
+Runs every configuration of a grid over a dataset in one process, with
+(config, task) runs interleaved and a bounded number in flight. Each config
+gets its own SystemConfig and a CachedChatClient; all of them share one
+LLMCache, so identical requests (e.g. the Phase 1 conversations of configs
+that only differ in debate settings) are answered once. Cache hits wait as
+long as the original call took, so latencies stay comparable.
+
+Results are appended to <output>/results.jsonl (one row per config and
+task, see utils.results_table) as runs finish; restarting the same command
+skips finished runs. At the end every config is scored and the configs on
+the accuracy vs. latency/cost Pareto front are marked in summary.csv.
+
+Usage:
+    python sweep.py dataset.jsonl --output runs/sweep1 \\
+        --grid max_debate_rounds=3,10 --grid model_name=gpt-4o,gpt-4o-mini
+    python sweep.py dataset.jsonl --output runs/sweep1 --grid-file grid.json
+"""
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import re
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import (
+    API_KEY,
+    MODEL_PRICES_PER_1M,
+    TOKEN_PRICES_PER_1M,
+    SWEEP_MAX_IN_FLIGHT,
+    SWEEP_LLM_CACHE_ENTRIES,
+    SystemConfig
+)
+from utils.dataset import load_dataset
+from utils.evaluation import evaluate, pareto_front, select_rows
+from utils.results_table import TEXT_COLUMNS, read_table, result_row
+
+
+RESULTS_FILENAME = "results.jsonl"
+SUMMARY_FILENAME = "summary.csv"
+
+
+def _parse_value(text: str) -> Any:
+    """Parse a grid value: JSON scalars (3, 0.5, true) or a plain string."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def parse_grid(specs: List[str]) -> Dict[str, List[Any]]:
+    """
+    Parse --grid arguments of the form name=value1,value2.
+
+    Args:
+        specs: Grid arguments (setting names as in SystemConfig, or num_groups)
+
+    Returns:
+        Dictionary of setting -> values
+    """
+    grid = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise ValueError(f"Invalid grid entry {spec!r} (expected name=value1,value2)")
+        grid[name.strip()] = [_parse_value(v.strip()) for v in values.split(",")]
+    return grid
+
+
+def expand_grid(grid: Dict[str, List[Any]], base: Optional[SystemConfig] = None) -> List[SystemConfig]:
+    """All combinations of the grid values, applied on top of base (default: the defaults)."""
+    base = base or SystemConfig()
+    names = list(grid)
+    return [
+        base.with_overrides(**dict(zip(names, values)))
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def _safe_name(task_id: str) -> str:
+    """Turn a dataset id into a safe directory name."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", task_id) or "task"
+
+
+def _finished_runs(results_path: Path) -> set:
+    """(config label, task id) pairs already completed in an earlier sweep."""
+    if not results_path.exists():
+        return set()
+    with open(results_path, 'r', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return {(row["config"], row["id"]) for row in rows if row.get("status") == "ok"}
+
+
+async def run_sweep(
+    dataset_path: Path,
+    configs: List[SystemConfig],
+    output_dir: Path,
+    max_in_flight: int = SWEEP_MAX_IN_FLIGHT,
+    limit: Optional[int] = None,
+    replay_latency: bool = True
+) -> Path:
+    """
+    Run every config over the dataset.
+
+    Args:
+        dataset_path: JSONL dataset (see utils.dataset.load_dataset)
+        configs: Configurations to compare
+        output_dir: Directory for transcripts, workspaces and results
+        max_in_flight: (config, task) runs in flight at once
+        limit: Only use the first N tasks of the dataset
+        replay_latency: Make cache hits take as long as the original call
+
+    Returns:
+        Path to results.jsonl
+    """
+    from main import MultiAgentDebateSystem
+    from utils.llm_cache import CachedChatClient, LLMCache
+    from utils.model_client import create_model_client
+    from utils.workspace import WorkspaceManager
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results_path = output_dir / RESULTS_FILENAME
+
+    items = load_dataset(dataset_path)[:limit]
+    done = _finished_runs(results_path)
+    # Interleave configs per task, so configs with identical requests run them
+    # at about the same time and share the in-flight call
+    runs = [
+        (index, config, item)
+        for item in items
+        for index, config in enumerate(configs)
+        if (config.label, item["id"]) not in done
+    ]
+    print(f"[SWEEP] {len(configs)} configs x {len(items)} tasks, "
+          f"{len(configs) * len(items) - len(runs)} already completed, {len(runs)} to run")
+
+    # One connection pool per model; one cached client per config on a shared cache
+    base_clients = {
+        name: create_model_client(name, API_KEY)
+        for name in dict.fromkeys(config.model_name for config in configs)
+    }
+    cache = LLMCache(max_entries=SWEEP_LLM_CACHE_ENTRIES)
+    clients = [
+        CachedChatClient(base_clients[config.model_name], cache,
+                         model=config.model_name, replay_latency=replay_latency)
+        for config in configs
+    ]
+    workspaces = WorkspaceManager(root=output_dir / "coding", pool_size=max_in_flight + 1)
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def run_one(index: int, config: SystemConfig, item: Dict[str, Any]):
+        async with semaphore:
+            try:
+                system = MultiAgentDebateSystem(
+                    model_client=clients[index],
+                    session_dir=output_dir / "transcripts" / f"config{index}" / _safe_name(item["id"]),
+                    workspaces=workspaces,
+                    summary_only=True,
+                    config=config
+                )
+                try:
+                    result = await system.run(item["task"], verbose=False, resume=True, use_cache=False)
+                finally:
+                    system.cleanup()
+            except Exception as e:
+                result = {"task": item["task"], "error": f"{e}\n{traceback.format_exc()}"}
+
+        row = {"config": config.label, **result_row(result, task_id=item["id"], gold=item["gold"])}
+        with open(results_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        print(f"[SWEEP] {config.label} / {item['id']}: {row['status']}")
+
+    try:
+        await asyncio.gather(*[run_one(*run) for run in runs])
+    finally:
+        await workspaces.wait_cleanup()
+        workspaces.cleanup()
+        for client in base_clients.values():
+            await client.close()
+
+    stats = cache.stats()
+    print(f"[SWEEP] Shared LLM cache: {stats['hits']} hits, {stats['shared']} shared in-flight, "
+          f"{stats['misses']} model calls ({stats['hit_rate']:.0%} saved)")
+    return results_path
+
+
+def summarize(results_path: Path, configs: List[SystemConfig]) -> List[Dict[str, Any]]:
+    """
+    Score each config and mark the accuracy vs. latency/cost Pareto front.
+
+    Args:
+        results_path: results.jsonl written by run_sweep
+        configs: The swept configurations (for their order and model prices)
+
+    Returns:
+        One summary row per config
+    """
+    columns = read_table(results_path, exclude=TEXT_COLUMNS)
+    summary = []
+    for config in configs:
+        mask = columns["config"] == config.label
+        if not mask.any():
+            continue
+        prices = MODEL_PRICES_PER_1M.get(config.model_name, TOKEN_PRICES_PER_1M)
+        metrics = evaluate(select_rows(columns, mask), prices=prices)
+        summary.append({
+            "config": config.label,
+            "tasks": metrics["completed"],
+            "failed": metrics["failed"],
+            "accuracy": metrics["accuracy"],
+            "latency_p50": metrics["total_seconds"].get("p50"),
+            "latency_p90": metrics["total_seconds"].get("p90"),
+            "cost_mean": metrics["cost_usd"].get("mean"),
+            "tokens_mean": metrics["tokens"].get("mean"),
+        })
+
+    front = pareto_front(summary, maximize="accuracy", minimize=["latency_p50", "cost_mean"])
+    for row, on_front in zip(summary, front):
+        row["pareto"] = on_front
+    return summary
+
+
+def _fmt(value: Optional[float], fmt: str) -> str:
+    return "n/a" if value is None else fmt.format(value)
+
+
+def format_summary(summary: List[Dict[str, Any]]) -> str:
+    """Render the summary as a table, best accuracy first (* = on the Pareto front)."""
+    rows = sorted(summary, key=lambda r: (r["accuracy"] is None, -(r["accuracy"] or 0)))
+    width = max([len(r["config"]) for r in rows] + [6])
+    lines = [
+        f"  {'config':<{width}}  {'accuracy':>8}  {'p50 (s)':>8}  {'p90 (s)':>8}  "
+        f"{'cost ($)':>9}  {'tokens':>8}  {'tasks':>5}",
+        "  " + "-" * (width + 56),
+    ]
+    for r in rows:
+        lines.append(
+            f"{'*' if r['pareto'] else ' '} {r['config']:<{width}}  "
+            f"{_fmt(r['accuracy'], '{:.1%}'):>8}  {_fmt(r['latency_p50'], '{:.1f}'):>8}  "
+            f"{_fmt(r['latency_p90'], '{:.1f}'):>8}  {_fmt(r['cost_mean'], '{:.4f}'):>9}  "
+            f"{_fmt(r['tokens_mean'], '{:,.0f}'):>8}  {r['tasks']:>5}"
+        )
+    lines.append("\n* = Pareto-optimal (accuracy vs. p50 latency and mean cost)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare system configurations on a dataset.")
+    parser.add_argument("dataset", type=Path, help="JSONL dataset")
+    parser.add_argument("--output", type=Path, default=Path("tmp/sweep"), help="Output directory")
+    parser.add_argument("--grid", action="append", default=[],
+                        help="Setting and values to sweep, e.g. max_debate_rounds=3,10 (repeatable)")
+    parser.add_argument("--grid-file", type=Path,
+                        help='JSON object of setting -> list of values, e.g. {"num_groups": [3, 5]}')
+    parser.add_argument("--in-flight", type=int, default=SWEEP_MAX_IN_FLIGHT,
+                        help="(config, task) runs in flight at once")
+    parser.add_argument("--limit", type=int, help="Only use the first N tasks")
+    parser.add_argument("--no-replay-latency", action="store_true",
+                        help="Return cache hits immediately (faster, but latencies are not comparable)")
+    args = parser.parse_args()
+
+    grid = json.loads(args.grid_file.read_text()) if args.grid_file else {}
+    grid.update(parse_grid(args.grid))
+    configs = expand_grid(grid)
+
+    results_path = asyncio.run(run_sweep(
+        dataset_path=args.dataset,
+        configs=configs,
+        output_dir=args.output,
+        max_in_flight=args.in_flight,
+        limit=args.limit,
+        replay_latency=not args.no_replay_latency
+    ))
+
+    summary = summarize(results_path, configs)
+    summary_path = Path(args.output) / SUMMARY_FILENAME
+    with open(summary_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(summary[0]) if summary else ["config"])
+        writer.writeheader()
+        writer.writerows(summary)
+    print("\n" + format_summary(summary))
+    print(f"\n[SWEEP] Summary saved to {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,11 @@
 """Teams module."""
-from .group_team import GroupTeam
+from utils.lazy import lazy_exports
 
-__all__ = ["GroupTeam"]
+_EXPORTS = {
+    "GroupTeam": ".group_team",
+    "GroupTeamPool": ".pool",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
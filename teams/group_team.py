@@ -1,23 +1,24 @@
 """
 GroupTeam: A team of 5 agents working together.
 """
+import asyncio
+import shutil
+import time
 from pathlib import Path
-from typing import Optional, Annotated
+from typing import Dict, Optional, Annotated
 
-from autogen.coding import LocalCommandLineCodeExecutor, CodeBlock
 from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import TaskResult
 from autogen_agentchat.teams import SelectorGroupChat
 from autogen_agentchat.conditions import TextMentionTermination, MaxMessageTermination
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from autogen_core.models import ChatCompletionClient
 import re
 
-from tools import web_search_tool
-from config import (
-    REPORT_READY_KEYWORD,
-    MAX_GROUP_MESSAGES,
-    CODE_EXECUTION_TIMEOUT,
-    USE_VIRTUAL_ENV
-)
+from tools import web_search_tool, multi_search_tool
+from utils.budget import BudgetExhausted, BudgetTermination, TaskBudget, budget_scope, is_budget_stop, run_team
+from utils.exec_cache import get_execution_cache
+from teams.planner import PLAN_AGENTS, PlanStep, planning_prompt, parse_plan, plan_waves
+from config import REPORT_READY_KEYWORD, USE_VIRTUAL_ENV, SystemConfig
 
 
 class GroupTeam:
@@ -33,21 +34,46 @@ class GroupTeam:
     def __init__(
         self,
         group_name: str,
-        model_client: OpenAIChatCompletionClient,
-        work_dir: Path
+        model_client: ChatCompletionClient,
+        work_dir: Path,
+        plan_mode: Optional[bool] = None,
+        config: Optional[SystemConfig] = None
     ):
         self.group_name = group_name
         self.model_client = model_client
+        self.config = config or SystemConfig()
+        self.plan_mode = self.config.group_execution_mode == "plan" if plan_mode is None else plan_mode
 
         # Create isolated work directory for this group
         self.group_work_dir = work_dir / group_name.lower()
         self.group_work_dir.mkdir(parents=True, exist_ok=True)
 
-        # Initialize agents
-        self._create_agents()
+        # Budget of the task being run (set by run())
+        self._budget: Optional[TaskBudget] = None
+        self._budget_termination = BudgetTermination()
 
-        # Create SelectorGroupChat for dynamic coordination
-        self.team = SelectorGroupChat(
+        # The executor instance is created on the first execution
+        self._executor = None
+
+        # Agents and the SelectorGroupChat are built on the first run, so
+        # groups that are never run (or pooled teams waiting idle) cost nothing
+        self._team: Optional[SelectorGroupChat] = None
+
+    @property
+    def team(self) -> SelectorGroupChat:
+        """SelectorGroupChat for dynamic coordination (built on first use)."""
+        self._build()
+        return self._team
+
+    def _build(self):
+        """Create the agents and the SelectorGroupChat unless already done."""
+        if self._team is None:
+            self._create_agents()
+            self._team = self._create_team()
+
+    def _create_team(self) -> SelectorGroupChat:
+        """Build the SelectorGroupChat of the group's agents."""
+        return SelectorGroupChat(
             participants=[
                 self.leader,
                 self.code_writer,
@@ -55,11 +81,12 @@ class GroupTeam:
                 self.researcher,
                 self.analyst
             ],
-            model_client=model_client,
+            model_client=self.model_client,
             selector_prompt=self._get_selector_prompt(),
             termination_condition=(
                 TextMentionTermination(REPORT_READY_KEYWORD) |
-                MaxMessageTermination(MAX_GROUP_MESSAGES)
+                MaxMessageTermination(self.config.max_group_messages) |
+                self._budget_termination
             )
         )
 
@@ -71,7 +98,10 @@ class GroupTeam:
             name=f"{self.group_name}Leader",
             description=f"Leader of {self.group_name} who coordinates the team",
             model_client=self.model_client,
-            system_message=f"""You are the leader of {self.group_name}.
+            # Static instructions first and the group name last, so every group's
+            # Leader prompt starts with the same provider-cacheable prefix
+            system_message=f"""You are the leader of a group of specialists: CodeWriter,
+CodeExecutor, Researcher and Analyst.
 
 Your responsibilities:
 1. Coordinate team members to solve the given task
@@ -86,7 +116,9 @@ When you have sufficient information and are confident in the solution:
 - State the final answer clearly
 - Use the keyword '{REPORT_READY_KEYWORD}' to indicate completion
 
-Be strategic and efficient in coordinating your team."""
+Be strategic and efficient in coordinating your team.
+
+Your group: {self.group_name}"""
         )
 
         # 2. Code Writer: LLM-based agent that writes code
@@ -103,6 +135,10 @@ When given a coding task:
 4. Add clear comments explaining the logic
 5. Make code readable and efficient
 6. Print results clearly
+7. Save a file downloaded from a URL as downloads/<host>/<path of the URL>
+   (e.g. https://example.org/data/x.csv -> downloads/example.org/data/x.csv),
+   and first check shared_data/<host>/<path> (read-only files downloaded
+   from that URL by earlier runs)
 
 IMPORTANT: You only WRITE code. You do NOT execute it.
 The CodeExecutor will run your code and return results.
@@ -121,12 +157,6 @@ print(f"Result: {result}")
         )
 
         # 3. Code Executor: Executes code using a tool
-        # Create the executor instance
-        self.executor_instance = LocalCommandLineCodeExecutor(
-            work_dir=self.group_work_dir,
-            timeout=CODE_EXECUTION_TIMEOUT
-        )
-
         # Create a tool function that wraps the executor
         def execute_python_code(
             code: Annotated[str, "Python code to execute"]
@@ -141,11 +171,35 @@ print(f"Result: {result}")
                 Execution result with exit code and output
             """
             try:
-                result = self.executor_instance.execute_code_blocks(
+                # Runs in a worker thread: read the task budget from the team
+                budget = self._budget
+                if budget is not None and budget.exhausted:
+                    return f"Not executed: {budget.reason}"
+
+                # Identical deterministic scripts on identical inputs run once
+                cache = get_execution_cache()
+                key = cache.key(code, self.group_work_dir) if cache else None
+                if key:
+                    cached = cache.get(key)
+                    if cached is not None:
+                        return cached + "(cached result of an identical earlier execution)"
+
+                from autogen.coding import CodeBlock
+
+                executor = self.executor_instance
+                timeout = self.config.code_execution_timeout
+                if budget is not None and budget.limit_timeout(timeout) < timeout:
+                    # Do not let a script outlive the task's deadline
+                    timeout = max(1, int(budget.limit_timeout(timeout)))
+                    executor = self._create_executor(self.group_work_dir, timeout=timeout)
+
+                result = executor.execute_code_blocks(
                     code_blocks=[CodeBlock(language="python", code=code)]
                 )
                 output = f"Exit code: {result.exit_code}\n"
                 output += f"Output:\n{result.output}\n"
+                if key and result.exit_code == 0:
+                    cache.put(key, output)
                 if result.code_file:
                     output += f"Code saved to: {result.code_file}"
                 return output
@@ -182,17 +236,19 @@ Then report the results."""
             name=f"{self.group_name}Researcher",
             description="Searches for information using web tools",
             model_client=self.model_client,
-            tools=[web_search_tool],
+            tools=[multi_search_tool, web_search_tool],
             system_message="""You are a research specialist.
 
 Your role:
-1. Search for relevant information using the web_search_tool
+1. Search for relevant information using the multi_search_tool
 2. Gather context and background information
 3. Find facts, definitions, and explanations
 4. Summarize findings clearly and cite sources
 
 When asked to research:
-- Use web_search_tool(query="your search query")
+- Cover all aspects in ONE call: multi_search_tool(queries=["query 1", "query 2", ...])
+- The queries run concurrently and come back as one merged, de-duplicated digest
+- Use web_search_tool(query="...") only for a single follow-up lookup
 - Provide concise, relevant summaries
 - Highlight key information that helps solve the task
 """
@@ -222,19 +278,40 @@ When analyzing results:
 """
         )
 
+    @property
+    def executor_instance(self):
+        """Code executor for the current work directory (created on first use)."""
+        if self._executor is None:
+            self._executor = self._create_executor(self.group_work_dir)
+        return self._executor
+
+    def _create_executor(self, work_dir: Path, timeout: Optional[int] = None):
+        """Create the code executor for a work directory (see config.code_execution_mode)."""
+        # Imported here: the autogen (ag2) package is slow to import and only needed to run code
+        from autogen.coding import LocalCommandLineCodeExecutor
+
+        timeout = timeout or self.config.code_execution_timeout
+        if self.config.code_execution_mode == "sandbox":
+            from utils.sandbox import SandboxedCodeExecutor
+
+            return SandboxedCodeExecutor(
+                work_dir=work_dir,
+                timeout=timeout
+            )
+        return LocalCommandLineCodeExecutor(
+            work_dir=work_dir,
+            timeout=timeout
+        )
+
     def _get_selector_prompt(self) -> str:
         """
         Get the selector prompt for the SelectorGroupChat.
         This prompt guides the selection of the next speaker.
         """
+        # Fixed rules first and the growing history last: consecutive selections
+        # share the longest possible prompt prefix
         return f"""Select the next agent to speak based on the current context.
 
-Available agents and their roles:
-{{roles}}
-
-Conversation history:
-{{history}}
-
 Selection Rules:
 1. **Leader** coordinates and decides when to request specific expertise
 2. **CodeWriter** creates code (has LLM, writes code only)
@@ -249,21 +326,130 @@ IMPORTANT:
 - CodeWriter writes code, CodeExecutor executes it using tools
 - Typical flow: CodeWriter → CodeExecutor → Analyst → Leader
 
+Available agents and their roles:
+{{roles}}
+
+Conversation history:
+{{history}}
+
 Select the most appropriate agent from: {{participants}}
 """
 
-    async def run(self, task: str):
+    async def run(self, task: str, budget: Optional[TaskBudget] = None):
         """
         Run the team on a given task.
 
         Args:
             task: The task description
+            budget: Deadline and token budget of the task; the team stops
+                when it runs out, with the messages produced so far
 
         Returns:
             The result from the team
         """
-        result = await self.team.run(task=task)
-        return result
+        self._build()
+        self._budget = self._budget_termination.budget = budget
+        try:
+            with budget_scope(budget):
+                if self.plan_mode:
+                    result = await self._run_planned(task)
+                else:
+                    result = await run_team(self.team, task, budget)
+            if is_budget_stop(result.stop_reason):
+                # A run cut short mid-turn leaves the chat manager waiting for the
+                # interrupted speaker, which reset() does not clear: start afresh
+                self._team = self._create_team()
+            return result
+        except BudgetExhausted as e:
+            # The planning turn was refused: nothing to report
+            return TaskResult(messages=[], stop_reason=str(e))
+        finally:
+            self._budget = self._budget_termination.budget = None
+
+    async def _run_planned(self, task: str):
+        """
+        Plan-and-execute: the Leader plans subtasks, independent ones run
+        concurrently, then the team discusses the merged results.
+        """
+        max_steps = self.config.plan_max_steps
+        plan_reply = await self.leader.run(task=planning_prompt(task, max_steps))
+        plan_text = plan_reply.messages[-1].to_text()
+        steps = parse_plan(plan_text, max_steps)
+        if steps is None:
+            print(f"[PLAN] {self.group_name}: no usable plan, falling back to free discussion")
+            await self.team.reset()
+            return await run_team(self.team, task, self._budget)
+
+        started = time.perf_counter()
+        waves = plan_waves(steps)
+        # One lock per agent: different agents run concurrently, one agent runs one step at a time
+        locks = {name: asyncio.Lock() for name in PLAN_AGENTS}
+        outputs: Dict[str, str] = {}
+        for wave in waves:
+            if self._budget is not None and self._budget.exhausted:
+                break
+            results = await asyncio.gather(*[
+                self._run_step(step, task, outputs, locks[step.agent])
+                for step in wave
+            ])
+            outputs.update(zip((step.id for step in wave), results))
+        print(f"[PLAN] {self.group_name}: {len(steps)} steps in {len(waves)} waves "
+              f"({time.perf_counter() - started:.1f}s)")
+
+        # Merge in plan order so the history does not depend on completion order
+        plan = "\n".join(
+            f"- {step.id} ({step.agent}): {step.instruction}"
+            + (f" [after {', '.join(step.depends_on)}]" if step.depends_on else "")
+            for step in steps
+        )
+        agents = self._plan_agents()
+        results = "\n\n".join(
+            f"[{step.id}] {agents[step.agent].name}:\n{outputs[step.id]}"
+            for step in steps if step.id in outputs
+        )
+        merged = (
+            f"TASK:\n{task}\n\nPLAN ({self.leader.name}):\n{plan}\n\nSTEP RESULTS:\n{results}\n\n"
+            "All planned steps are done. Leader: review the results, request "
+            "follow-up work only if needed, and write the final report."
+        )
+        # One start message, so the discussion keeps its full max_group_messages;
+        # a step that mentioned the keyword must not end it before it starts
+        merged = merged.replace(REPORT_READY_KEYWORD, "")
+
+        # Agents have only seen their own steps; discuss from the merged results
+        await self.team.reset()
+        return await run_team(self.team, merged, self._budget)
+
+    def _plan_agents(self) -> Dict[str, AssistantAgent]:
+        return {
+            "Researcher": self.researcher,
+            "CodeWriter": self.code_writer,
+            "Analyst": self.analyst,
+        }
+
+    async def _run_step(
+        self,
+        step: PlanStep,
+        task: str,
+        outputs: Dict[str, str],
+        lock: asyncio.Lock
+    ) -> str:
+        """Run one plan step (CodeWriter steps are executed too) and return its result text."""
+        prompt = f"TASK:\n{task}\n\nYOUR SUBTASK ({step.id}): {step.instruction}"
+        for dep in step.depends_on:
+            prompt += f"\n\nResult of {dep}:\n{outputs[dep]}"
+
+        agent = self._plan_agents()[step.agent]
+        try:
+            async with lock:
+                result = await agent.run(task=prompt)
+                text = result.messages[-1].to_text()
+                if step.agent == "CodeWriter":
+                    executed = await self.code_executor.run(task=result.messages[-1])
+                    text += "\n\nExecution result:\n" + executed.messages[-1].to_text()
+            return text
+        except Exception as e:
+            return f"Step failed: {e}"
 
     async def run_stream(self, task: str):
         """
@@ -278,6 +464,41 @@ Select the most appropriate agent from: {{participants}}
         async for message in self.team.run_stream(task=task):
             yield message
 
+    async def reset(self, work_dir: Optional[Path] = None):
+        """
+        Prepare the team for a new task while reusing its agents, tools and client.
+
+        Clears the conversation state of the team and every agent, and gives
+        the code executor a fresh work directory.
+
+        Args:
+            work_dir: New work directory for code execution (default: empty
+                the current one)
+        """
+        if self._team is not None:
+            await self._team.reset()
+
+        if work_dir is not None and Path(work_dir) != self.group_work_dir:
+            self.set_work_dir(work_dir)
+        else:
+            for path in self.group_work_dir.iterdir():
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+
+    def set_work_dir(self, work_dir: Path):
+        """
+        Point the code executor at another work directory.
+
+        Args:
+            work_dir: New work directory for code execution
+        """
+        self.group_work_dir = Path(work_dir)
+        self.group_work_dir.mkdir(parents=True, exist_ok=True)
+        # The execute_python_code tool looks the executor up on each call
+        self._executor = None
+
     def cleanup(self):
         """Clean up resources (e.g., stop code executor)."""
         # Executor cleanup happens automatically, but can be explicit if needed
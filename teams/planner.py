@@ -0,0 +1,117 @@
+"""
+Plan-and-execute support for GroupTeam.
+
+In plan mode the Leader first writes a small dependency graph of subtasks
+for the specialists. Subtasks whose dependencies are met run concurrently
+(e.g. research and computation that do not need each other), and their
+results are merged into the group's history in plan order, so the outcome
+does not depend on which call finished first.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+
+PLAN_AGENTS = ("Researcher", "CodeWriter", "Analyst")
+
+JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+@dataclass
+class PlanStep:
+    """One subtask of the Leader's plan."""
+    id: str
+    agent: str          # one of PLAN_AGENTS
+    instruction: str
+    depends_on: List[str] = field(default_factory=list)
+
+
+def planning_prompt(task: str, max_steps: int) -> str:
+    """Prompt asking the Leader for a dependency graph of subtasks."""
+    return f"""Plan how your team will solve the task below before anyone starts working.
+
+Reply with ONLY a JSON object of this form:
+{{"steps": [
+  {{"id": "s1", "agent": "Researcher", "instruction": "...", "depends_on": []}},
+  {{"id": "s2", "agent": "CodeWriter", "instruction": "...", "depends_on": []}},
+  {{"id": "s3", "agent": "Analyst", "instruction": "...", "depends_on": ["s1", "s2"]}}
+]}}
+
+Rules:
+- agent is one of: {", ".join(PLAN_AGENTS)} (CodeWriter steps are executed automatically)
+- Use at most {max_steps} steps
+- Steps without dependencies run at the same time: only add a dependency when a
+  step really needs another step's result
+
+TASK:
+{task}
+"""
+
+
+def parse_plan(text: str, max_steps: int) -> Optional[List[PlanStep]]:
+    """
+    Parse and validate the Leader's plan.
+
+    Args:
+        text: The Leader's reply
+        max_steps: Maximum number of steps kept
+
+    Returns:
+        Steps in plan order, or None if the reply is not a usable plan
+        (invalid JSON, unknown agents or dependencies, or a cycle)
+    """
+    match = JSON_OBJECT.search(text or "")
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+    raw_steps = data.get("steps") if isinstance(data, dict) else None
+    if not isinstance(raw_steps, list) or not raw_steps:
+        return None
+
+    steps = []
+    for i, raw in enumerate(raw_steps[:max_steps], 1):
+        if not isinstance(raw, dict) or raw.get("agent") not in PLAN_AGENTS:
+            return None
+        depends_on = raw.get("depends_on") or []
+        if not isinstance(depends_on, list):
+            return None
+        steps.append(PlanStep(
+            id=str(raw.get("id") or f"s{i}"),
+            agent=raw["agent"],
+            instruction=str(raw.get("instruction", "")).strip(),
+            depends_on=[str(d) for d in depends_on]
+        ))
+
+    ids = [step.id for step in steps]
+    if len(set(ids)) != len(ids):
+        return None
+    if any(dep not in ids for step in steps for dep in step.depends_on):
+        return None
+    if plan_waves(steps) is None:
+        return None
+    return steps
+
+
+def plan_waves(steps: Iterable[PlanStep]) -> Optional[List[List[PlanStep]]]:
+    """
+    Group steps into waves that can run concurrently.
+
+    Returns:
+        List of waves (each in plan order), or None if the plan has a cycle
+    """
+    remaining = list(steps)
+    done = set()
+    waves = []
+    while remaining:
+        wave = [step for step in remaining if all(dep in done for dep in step.depends_on)]
+        if not wave:
+            return None
+        waves.append(wave)
+        done.update(step.id for step in wave)
+        remaining = [step for step in remaining if step.id not in done]
+    return waves
@@ -0,0 +1,132 @@
+"""
+Pool of pre-built GroupTeams reused across tasks.
+
+Building a group creates 5 agents, a SelectorGroupChat and a code executor.
+For batch runs the pool keeps finished teams and resets them for the next
+task instead, and caps how many teams may be active at once.
+"""
+import asyncio
+import shutil
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+from autogen_core.models import ChatCompletionClient
+
+from config import SystemConfig
+from teams.group_team import GroupTeam
+from utils.budget import enforce_budget
+from utils.usage import count_usage
+
+
+class GroupTeamPool:
+    """
+    Checkout/return pool of GroupTeams, keyed by group name.
+
+    Usage:
+        pool = GroupTeamPool(model_client, work_dir, max_active=6)
+        async with pool.checkout("Group1") as team:
+            result = await team.run(task)
+    """
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        work_dir: Path,
+        max_active: int = 6,
+        config: Optional[SystemConfig] = None
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            model_client: Model client shared by all pooled teams
+            work_dir: Root directory; each pooled team gets its own slot below it
+            max_active: Maximum number of teams checked out at the same time
+            config: Settings of the pooled teams (one pool per configuration;
+                systems using the pool must have the same config)
+        """
+        # Calls of pooled teams count towards the task that checked them out
+        self.model_client = enforce_budget(count_usage(model_client))
+        self.config = config or SystemConfig()
+        self.work_dir = Path(work_dir)
+        self.max_active = max_active
+
+        self._idle: Dict[str, List[GroupTeam]] = {}
+        self._active = asyncio.Semaphore(max_active)
+        self._created = 0
+        self._slot_dirs: Dict[GroupTeam, Path] = {}
+        self.checkouts = 0
+
+    def _create_team(self, group_name: str) -> GroupTeam:
+        """Build a new team in its own work-directory slot."""
+        self._created += 1
+        slot_dir = self.work_dir / f"slot{self._created}"
+        team = GroupTeam(
+            group_name=group_name,
+            model_client=self.model_client,
+            work_dir=slot_dir,
+            config=self.config
+        )
+        self._slot_dirs[team] = slot_dir
+        return team
+
+    def _discard(self, team: GroupTeam):
+        """Clean up a team that will not be reused and delete its slot."""
+        team.cleanup()
+        shutil.rmtree(self._slot_dirs.pop(team), ignore_errors=True)
+
+    @asynccontextmanager
+    async def checkout(self, group_name: str, work_dir: Optional[Path] = None) -> AsyncIterator[GroupTeam]:
+        """
+        Borrow a reset team for one task; it is returned to the pool on exit.
+
+        Waits while max_active teams are already checked out. A team whose
+        task raised or was cancelled may still be running, so it is cleaned
+        up and dropped instead of returned (the pool builds a new one); an
+        idle team that fails to reset is replaced the same way.
+
+        Args:
+            group_name: Name of the group (e.g. "Group1")
+            work_dir: Work directory for this task (default: the team's
+                own slot, emptied)
+
+        Yields:
+            A GroupTeam with fresh conversation state
+        """
+        async with self._active:
+            idle = self._idle.setdefault(group_name, [])
+            team = idle.pop() if idle else None
+            if team is not None:
+                try:
+                    await team.reset(work_dir)
+                except Exception as e:
+                    print(f"[POOL] Discarding a {group_name} team that could not be reset: {e}")
+                    self._discard(team)
+                    team = None
+            if team is None:
+                team = self._create_team(group_name)
+                try:
+                    await team.reset(work_dir)
+                except BaseException:
+                    self._discard(team)
+                    raise
+            self.checkouts += 1
+
+            try:
+                yield team
+            except BaseException:
+                self._discard(team)
+                raise
+            idle.append(team)
+
+    @property
+    def size(self) -> int:
+        """Number of teams built so far."""
+        return self._created
+
+    def cleanup(self):
+        """Clean up all pooled teams."""
+        for teams in self._idle.values():
+            for team in teams:
+                team.cleanup()
@@ -1,4 +1,11 @@
 """Tools module."""
-from .web_search import web_search_tool
+from utils.lazy import lazy_exports
 
-__all__ = ["web_search_tool"]
+_EXPORTS = {
+    "web_search_tool": ".web_search",
+    "multi_search_tool": ".web_search",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
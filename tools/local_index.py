@@ -0,0 +1,234 @@
+"""
+Local offline retrieval backend: a memory-mapped BM25 index.
+
+Index layout (one directory):
+    meta.json          corpus statistics and BM25 parameters
+    terms.npy          sorted vocabulary (fixed-width bytes, binary searched)
+    idf.npy            BM25 idf per term
+    term_offsets.npy   start of each term's postings (num_terms + 1)
+    postings_docs.npy  document ids, grouped by term
+    postings_tf.npy    term frequencies, parallel to postings_docs
+    doc_len.npy        document lengths in tokens
+    doc_offsets.npy    byte offsets of each document in docs.jsonl (num_docs + 1)
+    docs.jsonl         stored documents (title, text, url)
+
+All arrays are opened with mmap_mode="r", so startup only reads meta.json and
+worker processes share the same pages through the OS page cache.
+
+Build an index from a JSONL corpus (one {"title", "text"|"abstract", "url"|"id"}
+object per line, e.g. a PubMed abstract dump):
+
+    python -m tools.local_index build corpus.jsonl index/
+    python -m tools.local_index search index/ "paucigranulocytic asthma"
+"""
+import json
+import math
+import mmap
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+
+MAX_TERM_LENGTH = 32
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were which with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics and drop stopwords."""
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS and 1 < len(token) <= MAX_TERM_LENGTH
+    ]
+
+
+def build_index(corpus_path: Path, index_dir: Path, k1: float = 1.2, b: float = 0.75) -> Path:
+    """
+    Build a BM25 index over a JSONL corpus.
+
+    Args:
+        corpus_path: JSONL file with one document per line
+        index_dir: Output directory for the index files
+        k1: BM25 term-frequency saturation
+        b: BM25 length normalisation
+
+    Returns:
+        Path to the index directory
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    postings: Dict[str, List[tuple]] = defaultdict(list)
+    doc_lengths = []
+    doc_offsets = [0]
+
+    with open(corpus_path, 'r', encoding='utf-8') as src, \
+            open(index_dir / "docs.jsonl", 'wb') as docs_out:
+        for line in src:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            doc = {
+                "title": item.get("title", ""),
+                "text": item.get("text") or item.get("abstract", ""),
+                "url": item.get("url") or str(item.get("id", "")),
+            }
+            doc_id = len(doc_lengths)
+            tokens = tokenize(f"{doc['title']} {doc['text']}")
+            for term, tf in Counter(tokens).items():
+                postings[term].append((doc_id, tf))
+            doc_lengths.append(len(tokens))
+
+            docs_out.write(json.dumps(doc, ensure_ascii=False).encode('utf-8') + b"\n")
+            doc_offsets.append(docs_out.tell())
+
+    num_docs = len(doc_lengths)
+    terms = sorted(postings)
+    term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    for i, term in enumerate(terms):
+        term_offsets[i + 1] = term_offsets[i] + len(postings[term])
+
+    postings_docs = np.empty(term_offsets[-1], dtype=np.int32)
+    postings_tf = np.empty(term_offsets[-1], dtype=np.float32)
+    idf = np.empty(len(terms), dtype=np.float32)
+    for i, term in enumerate(terms):
+        start, end = term_offsets[i], term_offsets[i + 1]
+        entries = postings[term]
+        postings_docs[start:end] = [doc_id for doc_id, _ in entries]
+        postings_tf[start:end] = [tf for _, tf in entries]
+        df = len(entries)
+        idf[i] = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+
+    np.save(index_dir / "terms.npy", np.array(terms, dtype=f"S{MAX_TERM_LENGTH}"))
+    np.save(index_dir / "idf.npy", idf)
+    np.save(index_dir / "term_offsets.npy", term_offsets)
+    np.save(index_dir / "postings_docs.npy", postings_docs)
+    np.save(index_dir / "postings_tf.npy", postings_tf)
+    np.save(index_dir / "doc_len.npy", np.array(doc_lengths, dtype=np.float32))
+    np.save(index_dir / "doc_offsets.npy", np.array(doc_offsets, dtype=np.int64))
+
+    meta = {
+        "num_docs": num_docs,
+        "num_terms": len(terms),
+        "avg_doc_len": float(np.mean(doc_lengths)) if doc_lengths else 0.0,
+        "k1": k1,
+        "b": b,
+    }
+    with open(index_dir / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    return index_dir
+
+
+class LocalIndex:
+    """A read-only, memory-mapped BM25 index built by build_index()."""
+
+    def __init__(self, index_dir: Path):
+        """
+        Open an index.
+
+        Args:
+            index_dir: Directory created by build_index()
+        """
+        self.index_dir = Path(index_dir)
+        with open(self.index_dir / "meta.json", 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        def load(name):
+            return np.load(self.index_dir / name, mmap_mode="r")
+
+        self.terms = load("terms.npy")
+        self.idf = load("idf.npy")
+        self.term_offsets = load("term_offsets.npy")
+        self.postings_docs = load("postings_docs.npy")
+        self.postings_tf = load("postings_tf.npy")
+        self.doc_len = load("doc_len.npy")
+        self.doc_offsets = load("doc_offsets.npy")
+
+        self._docs_file = open(self.index_dir / "docs.jsonl", 'rb')
+        self._docs = mmap.mmap(self._docs_file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if self.meta["num_docs"] else b""
+
+    def _term_id(self, term: str) -> int:
+        """Binary search the sorted vocabulary; returns -1 if the term is unknown."""
+        key = term.encode('utf-8')
+        i = int(np.searchsorted(self.terms, key))
+        if i < len(self.terms) and self.terms[i] == key:
+            return i
+        return -1
+
+    def get_document(self, doc_id: int) -> Dict[str, str]:
+        """Read a stored document by id."""
+        start, end = int(self.doc_offsets[doc_id]), int(self.doc_offsets[doc_id + 1])
+        return json.loads(self._docs[start:end])
+
+    def search(self, query: str, top_k: int = 3) -> List[tuple]:
+        """
+        Score documents against a query with BM25.
+
+        Args:
+            query: Free-text query
+            top_k: Number of documents to return
+
+        Returns:
+            List of (doc_id, score) tuples, best first
+        """
+        k1, b = self.meta["k1"], self.meta["b"]
+        avg_len = self.meta["avg_doc_len"] or 1.0
+
+        doc_chunks, score_chunks = [], []
+        for term in set(tokenize(query)):
+            term_id = self._term_id(term)
+            if term_id < 0:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = np.asarray(self.postings_docs[start:end])
+            tf = np.asarray(self.postings_tf[start:end])
+            norm = k1 * (1 - b + b * self.doc_len[docs] / avg_len)
+            doc_chunks.append(docs)
+            score_chunks.append(self.idf[term_id] * tf * (k1 + 1) / (tf + norm))
+
+        if not doc_chunks:
+            return []
+
+        # Sum per-term contributions for each matched document
+        doc_ids, inverse = np.unique(np.concatenate(doc_chunks), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_chunks))
+
+        k = min(top_k, len(doc_ids))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(doc_ids[i]), float(scores[i])) for i in best]
+
+    def close(self):
+        """Release the memory maps."""
+        if isinstance(self._docs, mmap.mmap):
+            self._docs.close()
+        self._docs_file.close()
+
+
+def main(argv: List[str]):
+    """Command-line entry point: build or query an index."""
+    if len(argv) == 3 and argv[0] == "build":
+        index_dir = build_index(Path(argv[1]), Path(argv[2]))
+        print(f"Index written to {index_dir}")
+    elif len(argv) >= 3 and argv[0] == "search":
+        index = LocalIndex(Path(argv[1]))
+        for doc_id, score in index.search(" ".join(argv[2:]), top_k=5):
+            doc = index.get_document(doc_id)
+            print(f"{score:7.3f}  {doc['title']}  ({doc['url']})")
+    else:
+        print("Usage:\n"
+              "  python -m tools.local_index build <corpus.jsonl> <index_dir>\n"
+              "  python -m tools.local_index search <index_dir> <query>")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,39 +1,212 @@
 """
-Web search tool for agents (real version using SerpAPI).
+Search tool for agents with pluggable retrieval backends.
+
+Backends:
+- "serpapi": live Google results through SerpAPI (default)
+- "local":   offline BM25 index over our own corpus (see tools/local_index.py)
+
+The backend is selected with SEARCH_BACKEND in config/settings.py.
 """
+import asyncio
 import os
-from typing import Annotated
-from serpapi import GoogleSearch
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated, Dict, List, Optional
 
-# Load environment variables from .env file
-load_dotenv()
+from config import (
+    SEARCH_BACKEND,
+    SEARCH_TOP_K,
+    LOCAL_INDEX_DIR,
+    MULTI_SEARCH_MAX_QUERIES,
+    MULTI_SEARCH_MAX_RESULTS
+)
 
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
 
-def web_search_tool(
-    query: Annotated[str, "Search query to look up"]
-) -> Annotated[str, "Search results"]:
-    """Search the web for information using SerpAPI."""
-    try:
+
+@dataclass
+class SearchResult:
+    """A single search hit."""
+    title: str
+    snippet: str
+    url: str
+    score: float = 0.0
+
+
+class SerpAPIBackend:
+    """Google search through SerpAPI."""
+
+    name = "serpapi"
+
+    def __init__(self, api_key: Optional[str] = SERPAPI_API_KEY):
+        self.api_key = api_key
+
+    def search(self, query: str, top_k: int) -> List[SearchResult]:
+        """Run a query and return up to top_k results."""
+        from serpapi import GoogleSearch
+
         search = GoogleSearch({
             "q": query,
             "engine": "google",
-            "api_key": SERPAPI_API_KEY,
-            "num": 3
+            "api_key": self.api_key,
+            "num": top_k
         })
         results = search.get_dict()
 
-        snippets = []
-        for i, r in enumerate(results.get("organic_results", [])[:3]):
-            snippets.append(
-                f"{i+1}. {r.get('title','')}\n{r.get('snippet','')}\nURL: {r.get('link','')}\n"
+        return [
+            SearchResult(
+                title=r.get('title', ''),
+                snippet=r.get('snippet', ''),
+                url=r.get('link', '')
+            )
+            for r in results.get("organic_results", [])[:top_k]
+        ]
+
+
+class LocalIndexBackend:
+    """Offline BM25 retrieval over a memory-mapped local index."""
+
+    name = "local"
+    SNIPPET_CHARS = 400
+
+    def __init__(self, index_dir: Path = LOCAL_INDEX_DIR):
+        from tools.local_index import LocalIndex
+
+        self.index = LocalIndex(index_dir)
+
+    def search(self, query: str, top_k: int) -> List[SearchResult]:
+        """Run a query and return up to top_k results."""
+        results = []
+        for doc_id, score in self.index.search(query, top_k=top_k):
+            doc = self.index.get_document(doc_id)
+            text = doc.get("text", "")
+            if len(text) > self.SNIPPET_CHARS:
+                text = text[:self.SNIPPET_CHARS].rsplit(" ", 1)[0] + "..."
+            results.append(SearchResult(
+                title=doc.get("title", ""),
+                snippet=text,
+                url=doc.get("url", ""),
+                score=score
+            ))
+        return results
+
+
+SEARCH_BACKENDS = {
+    SerpAPIBackend.name: SerpAPIBackend,
+    LocalIndexBackend.name: LocalIndexBackend,
+}
+
+_backend = None
+
+
+def get_search_backend():
+    """Return the configured search backend (created once per process)."""
+    global _backend
+    if _backend is None:
+        if SEARCH_BACKEND not in SEARCH_BACKENDS:
+            raise ValueError(
+                f"Unknown SEARCH_BACKEND '{SEARCH_BACKEND}'. "
+                f"Choose one of: {', '.join(SEARCH_BACKENDS)}"
             )
+        _backend = SEARCH_BACKENDS[SEARCH_BACKEND]()
+    return _backend
 
-        if not snippets:
-            return f"No results found for '{query}'."
 
-        return f'Search results for "{query}":\n\n' + "\n".join(snippets)
+def format_results(query: str, results: List[SearchResult]) -> str:
+    """Format search results as a numbered list for the agent."""
+    if not results:
+        return f"No results found for '{query}'."
 
+    snippets = [
+        f"{i+1}. {r.title}\n{r.snippet}\nURL: {r.url}\n"
+        for i, r in enumerate(results)
+    ]
+    return f'Search results for "{query}":\n\n' + "\n".join(snippets)
+
+
+def web_search_tool(
+    query: Annotated[str, "Search query to look up"]
+) -> Annotated[str, "Search results"]:
+    """Search for information (web or local literature index, depending on configuration)."""
+    try:
+        results = get_search_backend().search(query, SEARCH_TOP_K)
+        return format_results(query, results)
+
+    except Exception as e:
+        return f"Error while searching: {e}"
+
+
+def _url_key(url: str) -> str:
+    """Normalise a URL for de-duplication."""
+    key = url.strip().lower()
+    for prefix in ("https://", "http://", "www."):
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+    return key.rstrip("/")
+
+
+def merge_results(result_lists: List[List[SearchResult]], limit: int) -> List[SearchResult]:
+    """
+    Merge ranked result lists, de-duplicating by URL.
+
+    Documents are ranked by reciprocal-rank fusion, so a hit that several
+    queries agree on outranks one that ranked first for a single query.
+
+    Args:
+        result_lists: One ranked list per query
+        limit: Maximum number of merged results
+
+    Returns:
+        Merged results, best first
+    """
+    fused: Dict[str, float] = {}
+    first_seen: Dict[str, SearchResult] = {}
+    for results in result_lists:
+        for rank, result in enumerate(results):
+            key = _url_key(result.url) or f"{result.title}|{result.snippet[:80]}"
+            fused[key] = fused.get(key, 0.0) + 1.0 / (rank + 1)
+            first_seen.setdefault(key, result)
+
+    ranked = sorted(fused, key=lambda key: fused[key], reverse=True)[:limit]
+    return [
+        SearchResult(
+            title=first_seen[key].title,
+            snippet=first_seen[key].snippet,
+            url=first_seen[key].url,
+            score=fused[key]
+        )
+        for key in ranked
+    ]
+
+
+async def multi_search_tool(
+    queries: Annotated[List[str], "Several search queries covering different aspects of the question"]
+) -> Annotated[str, "One merged, de-duplicated digest of results for all queries"]:
+    """Run several searches concurrently and return one merged, ranked digest (prefer this over repeated single searches)."""
+    queries = [q for q in dict.fromkeys(q.strip() for q in queries) if q][:MULTI_SEARCH_MAX_QUERIES]
+    if not queries:
+        return "No queries given."
+
+    try:
+        backend = get_search_backend()
     except Exception as e:
         return f"Error while searching: {e}"
+
+    # Backends are blocking, so each query runs in a worker thread
+    outcomes = await asyncio.gather(
+        *[asyncio.to_thread(backend.search, query, SEARCH_TOP_K) for query in queries],
+        return_exceptions=True
+    )
+
+    result_lists, errors = [], []
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append(f"- '{query}': {outcome}")
+        else:
+            result_lists.append(outcome)
+
+    merged = merge_results(result_lists, MULTI_SEARCH_MAX_RESULTS)
+    output = format_results(" | ".join(queries), merged)
+    if errors:
+        output += "\nSome queries failed:\n" + "\n".join(errors)
+    return output
@@ -1,4 +1,14 @@
 """Utilities module."""
-from .logger import TranscriptLogger
+from .lazy import lazy_exports
 
-__all__ = ["TranscriptLogger"]
+_EXPORTS = {
+    "TranscriptLogger": ".logger",
+    "LoopStallMonitor": ".loop_monitor",
+    "MessageRecord": ".messages",
+    "AnswerCache": ".answer_cache",
+    "CacheHit": ".answer_cache",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,308 @@
+"""
+Task-level answer cache for repeated and paraphrased questions.
+
+Lookup order:
+1. Exact match on a hash of the normalised task text (case and whitespace
+   are ignored; operators, signs and non-ASCII letters are kept, so
+   "p < 0.05" and "p > 0.05" stay different tasks)
+2. Optionally (when a threshold is set), cosine similarity between local
+   hashed bag-of-n-gram embeddings
+
+Similarity alone cannot tell a question from its negation or from one with a
+different number, so a semantic candidate is only accepted when it also has
+the same guard signature: numbers with their signs, comparison operators,
+negations, direction words ("increase", "lower", ...) and one-letter symbols
+("p", "α"). It still cannot tell two different drug or gene names apart,
+which is why the semantic tier is off by default.
+
+Embeddings live in one contiguous float32 matrix so a lookup is a single
+matrix-vector product, which stays in the low milliseconds at 100k+ entries.
+Entries are evicted least-recently-used once max_entries is reached, and the
+cache is persisted as an append-only JSONL log that is compacted on load.
+"""
+import hashlib
+import json
+import re
+import unicodedata
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Words, numbers (with sign and decimals) and single symbols
+TOKEN_PATTERN = re.compile(r"[-+−]?\d+(?:[.,]\d+)*%?|\w+|[^\w\s]")
+NUMBER_PATTERN = re.compile(r"[-+−]?\d+(?:[.,]\d+)*%?")
+OPERATORS = {"<", ">", "=", "≤", "≥", "≠", "!", "≈"}
+NEGATIONS = {"not", "no", "never", "none", "neither", "nor", "without", "cannot", "nt"}
+DIRECTION_WORDS = {
+    "increase", "increases", "increased", "increasing", "decrease", "decreases",
+    "decreased", "decreasing", "reduce", "reduces", "reduced", "reducing",
+    "raise", "raises", "raised", "lower", "lowers", "lowered", "higher", "more",
+    "less", "fewer", "greater", "smaller", "larger", "better", "worse", "above",
+    "below", "before", "after", "positive", "negative", "maximum", "minimum",
+    "max", "min", "first", "last",
+}
+
+# Semantic candidates checked against the guards per lookup
+SEMANTIC_CANDIDATES = 5
+
+
+def normalize_task(text: str) -> str:
+    """Unicode-normalise, casefold and collapse whitespace (nothing else is dropped)."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def task_hash(text: str) -> str:
+    """Stable hash of the normalised task text."""
+    return hashlib.sha256(normalize_task(text).encode('utf-8')).hexdigest()
+
+
+def _tokens(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize_task(text).replace("n't", " nt"))
+
+
+def guard_signature(text: str) -> Tuple:
+    """
+    The parts of a task that similarity must not paper over.
+
+    Returns:
+        (numbers, operators, negation count, direction words, one-letter
+        symbols); two tasks are only semantic matches if these are equal
+    """
+    tokens = _tokens(text)
+    return (
+        tuple(sorted(t.replace("−", "-") for t in tokens if NUMBER_PATTERN.fullmatch(t))),
+        tuple(t for t in tokens if t in OPERATORS),
+        sum(t in NEGATIONS for t in tokens),
+        tuple(sorted({t for t in tokens if t in DIRECTION_WORDS})),
+        tuple(sorted({t for t in tokens if len(t) == 1 and t.isalpha() and t not in ("a", "i")})),
+    )
+
+
+def embed_text(text: str, dims: int = 256) -> np.ndarray:
+    """
+    Embed text with signed feature hashing of word unigrams, bigrams and
+    character trigrams. Deterministic across processes and needs no model.
+
+    Args:
+        text: Text to embed
+        dims: Embedding dimensionality
+
+    Returns:
+        L2-normalised float32 vector
+    """
+    words = _tokens(text)
+    features = list(words)
+    features += [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"#{word}#"
+        features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+    vector = np.zeros(dims, dtype=np.float32)
+    for feature in features:
+        h = zlib.crc32(feature.encode('utf-8'))
+        vector[h % dims] += 1.0 if (h >> 31) & 1 else -1.0
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@dataclass
+class CacheHit:
+    """A cached answer matching a new task."""
+    final_answer: str
+    session_dir: Optional[str]
+    original_task: str
+    similarity: float
+    match: str  # "exact" or "semantic"
+
+
+class AnswerCache:
+    """
+    Cache of final answers keyed by task text.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        threshold: Optional[float] = None,
+        max_entries: int = 100_000,
+        dims: int = 256
+    ):
+        """
+        Initialize the cache and load any persisted entries.
+
+        Args:
+            cache_dir: Directory holding the cache log
+            threshold: Minimum cosine similarity for a semantic hit
+                (None = exact matches only)
+            max_entries: Maximum number of cached tasks (LRU eviction)
+            dims: Embedding dimensionality
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.cache_dir / "answer_cache.jsonl"
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.dims = dims
+
+        # slot -> entry, in least-recently-used order
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._slot_by_hash: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        # Only allocated when the semantic tier is enabled
+        self._vectors = np.zeros((1024 if threshold is not None else 0, dims), dtype=np.float32)
+        self._used = 0
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def semantic(self) -> bool:
+        """Whether near-duplicate tasks are matched too."""
+        return self.threshold is not None
+
+    def _load(self):
+        """Replay the persisted log, then compact it to the surviving entries."""
+        if not self.log_path.exists():
+            return
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    # Older logs were keyed with a lossier normalisation
+                    entry["hash"] = task_hash(entry["task"])
+                    self._insert(entry)
+        self._compact()
+
+    def _compact(self):
+        """Rewrite the log with only the live entries."""
+        tmp_path = self.log_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        tmp_path.replace(self.log_path)
+
+    def _insert(self, entry: Dict):
+        """Add an entry to the in-memory index, evicting if needed."""
+        existing = self._slot_by_hash.get(entry["hash"])
+        if existing is not None:
+            self._remove(existing)
+
+        while len(self._entries) >= self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = self._used
+            self._used += 1
+
+        if self.semantic:
+            if slot >= len(self._vectors):
+                grown = np.zeros((len(self._vectors) * 2, self.dims), dtype=np.float32)
+                grown[:len(self._vectors)] = self._vectors
+                self._vectors = grown
+            self._vectors[slot] = embed_text(entry["task"], self.dims)
+        self._entries[slot] = entry
+        self._slot_by_hash[entry["hash"]] = slot
+
+    def _remove(self, slot: int):
+        """Evict the entry stored in a slot."""
+        entry = self._entries.pop(slot)
+        del self._slot_by_hash[entry["hash"]]
+        if self.semantic:
+            self._vectors[slot] = 0.0
+        self._free_slots.append(slot)
+
+    def _semantic_match(self, task: str) -> Tuple[Optional[int], float]:
+        """Best cached task above the threshold that also passes the guards."""
+        scores = self._vectors[:self._used] @ embed_text(task, self.dims)
+        count = min(SEMANTIC_CANDIDATES, len(scores))
+        candidates = np.argpartition(-scores, count - 1)[:count]
+        signature = None
+        for slot in sorted(candidates, key=lambda s: -scores[s]):
+            slot = int(slot)
+            if scores[slot] < self.threshold:
+                break
+            if slot not in self._entries:
+                continue
+            signature = signature or guard_signature(task)
+            if guard_signature(self._entries[slot]["task"]) == signature:
+                return slot, float(scores[slot])
+        return None, 0.0
+
+    def lookup(self, task: str) -> Optional[CacheHit]:
+        """
+        Find a cached answer for a task.
+
+        Args:
+            task: The new task
+
+        Returns:
+            CacheHit if the same task, or (with a threshold) a sufficiently
+            similar one with the same guard signature, was cached; else None
+        """
+        match = "exact"
+        similarity = 1.0
+        slot = self._slot_by_hash.get(task_hash(task))
+
+        if slot is None and self.semantic and self._entries:
+            slot, similarity = self._semantic_match(task)
+            match = "semantic"
+
+        if slot is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.semantic_hits += match == "semantic"
+        self._entries.move_to_end(slot)
+        entry = self._entries[slot]
+        return CacheHit(
+            final_answer=entry["final_answer"],
+            session_dir=entry.get("session_dir"),
+            original_task=entry["task"],
+            similarity=similarity,
+            match=match
+        )
+
+    def put(self, task: str, final_answer: str, session_dir: Optional[Path] = None):
+        """
+        Store the final answer of a completed task.
+
+        Args:
+            task: The task text
+            final_answer: Final answer produced by the system
+            session_dir: Transcript directory of the original run
+        """
+        entry = {
+            "hash": task_hash(task),
+            "task": task,
+            "final_answer": final_answer,
+            "session_dir": str(session_dir) if session_dir else None,
+        }
+        self._insert(entry)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def stats(self) -> Dict[str, float]:
+        """Return entry count, hits (and how many were semantic), misses and hit rate."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,98 @@
+"""
+Extract a speaker's stated answer from free text.
+
+Used to follow each leader's position during the debate. The result is a
+normalised short string ("yes", "42", "option b", ...) so positions can be
+compared, or None when no answer is stated. answer_key() reduces answers and
+gold labels the same way for scoring.
+"""
+import re
+from typing import Any, Optional
+
+
+ANSWER_PATTERNS = [
+    re.compile(r"final\s+answer\s*(?:is|:|-|=)\s*(.+)", re.IGNORECASE),
+    re.compile(r"\banswer\s*(?:is|:|-|=)\s*(.+)", re.IGNORECASE),
+    # "We conclude: yes." / "I agree that it is option B" (only a short label
+    # ending the clause, so "I agree with Group1Leader" states no answer)
+    re.compile(
+        r"\b(?:we|i)\s+(?:agree|conclude)\s*(?::|that)?\s*(?:it\s+is\s+|it's\s+)?"
+        r"((?:yes|no|maybe|true|false|option\s+[a-e]|\([a-e]\)))(?=\s*(?:[.!;,]|$))",
+        re.IGNORECASE | re.MULTILINE
+    ),
+]
+
+LABEL_WORDS = {"yes", "no", "maybe", "true", "false"}
+NUMBER = re.compile(r"^-?\d+(?:[.,]\d+)*(?:\.\d+)?%?")
+MAX_ANSWER_CHARS = 80
+# Where an answer's core ends and its elaboration starts ("Paris, the capital of France")
+ELABORATION = re.compile(r"\s*(?:[,;(]|\s[-–—]\s|\s(?:which|because|since|as)\s)")
+ARTICLE = re.compile(r"^(?:the|a|an)\s+")
+
+
+def normalize_answer(text: str) -> str:
+    """Lowercase, strip markdown/quotes/punctuation and reduce to the core answer."""
+    text = re.sub(r"[*_`\"'“”]", "", text).strip().lower()
+    text = re.sub(r"\s+", " ", text)
+    text = text.rstrip(".!;:, ")
+
+    first = re.split(r"[\s,.;:()]+", text, maxsplit=1)[0]
+    if first in LABEL_WORDS:
+        return first
+    number = NUMBER.match(text)
+    if number:
+        return number.group(0).replace(",", "")
+    return text[:MAX_ANSWER_CHARS]
+
+
+def extract_answer(text: str) -> Optional[str]:
+    """
+    Find the answer stated in a message.
+
+    The last explicit statement wins (leaders often restate a revised answer
+    at the end of a message).
+
+    Args:
+        text: Message content
+
+    Returns:
+        The normalised answer, or None if the message states none
+    """
+    if not isinstance(text, str):
+        return None
+    for pattern in ANSWER_PATTERNS:
+        matches = [m.group(1) for m in pattern.finditer(text)]
+        for candidate in reversed(matches):
+            answer = normalize_answer(candidate.splitlines()[0])
+            if answer:
+                return answer
+    return None
+
+
+def answer_key(text: Any) -> str:
+    """
+    Reduce a solution or a gold label to a comparable key ("" when empty).
+
+    The same steps are applied to both sides: the stated answer is extracted
+    (falling back to the last non-empty line when none is stated), then
+    trailing elaboration and a leading article are dropped, so "The answer
+    is Paris, the capital of France" and the gold label "Paris" both give
+    "paris".
+
+    Args:
+        text: Solution text or gold label
+
+    Returns:
+        The comparison key
+    """
+    if text is None:
+        return ""
+    text = str(text)
+    answer = extract_answer(text)
+    if answer is None:
+        lines = [line for line in text.splitlines() if line.strip()]
+        answer = normalize_answer(lines[-1]) if lines else ""
+    if NUMBER.fullmatch(answer):
+        return answer
+    answer = ELABORATION.split(answer, maxsplit=1)[0]
+    return ARTICLE.sub("", answer).strip()
@@ -0,0 +1,104 @@
+"""
+Result collection for multi-process batch runs.
+
+Workers write one row per finished task into a shared SQLite file; the
+coordinator reads them back to merge results and to skip finished tasks when
+a batch is restarted.
+"""
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+
+class BatchStore:
+    """SQLite-backed store of per-task batch results."""
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: SQLite file shared by the coordinator and all workers
+        """
+        self.db_path = Path(db_path)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " task_id TEXT PRIMARY KEY,"
+                " idx INTEGER NOT NULL,"
+                " status TEXT NOT NULL,"
+                " worker INTEGER,"
+                " finished_at REAL,"
+                " data TEXT NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(self, task_id: str, index: int, status: str, data: Dict[str, Any], worker: int = 0):
+        """
+        Store the result of one task (replacing any earlier attempt).
+
+        Args:
+            task_id: Dataset id of the task
+            index: Position of the task in the dataset
+            status: "ok" or "error"
+            data: JSON-serialisable result fields
+            worker: Id of the worker that ran the task
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (task_id, idx, status, worker, finished_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (task_id, index, status, worker, time.time(),
+                     json.dumps(data, ensure_ascii=False, default=str))
+                )
+        finally:
+            conn.close()
+
+    def completed_ids(self) -> Set[str]:
+        """Ids of tasks that finished successfully."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT task_id FROM results WHERE status = 'ok'").fetchall()
+        finally:
+            conn.close()
+        return {row[0] for row in rows}
+
+    def results(self) -> List[Dict[str, Any]]:
+        """All stored results in dataset order."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT task_id, idx, status, worker, data FROM results ORDER BY idx"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {"id": task_id, "index": idx, "status": status, "worker": worker, **json.loads(data)}
+            for task_id, idx, status, worker, data in rows
+        ]
+
+    def export_jsonl(self, path: Path) -> Path:
+        """
+        Merge all results into one JSONL file in dataset order.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Path to the written file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in self.results():
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return path
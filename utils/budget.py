@@ -0,0 +1,251 @@
+"""
+Per-task wall-clock deadline and token budget.
+
+A TaskBudget is created by MultiAgentDebateSystem.run(task, deadline=...,
+token_budget=...) and handed down to every group, the code executor and the
+debate:
+
+- BudgetedChatClient charges the usage of every model call (speaker
+  selection and tool-call iterations included) to the budget of the task
+  making it, found through a context variable set by run_team() and
+  GroupTeam.run(), and refuses calls once the budget is exhausted
+- BudgetTermination (part of every team's termination condition) stops the
+  team once the deadline has passed or the tokens are spent
+- run_team() additionally stops a team at the deadline while a turn is still
+  in flight (a slow model call or code execution), or when a refused call
+  ended the run, keeping the messages so far
+- code execution timeouts are capped at the remaining time
+"""
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncGenerator, Iterator, Optional, Sequence, Union
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+from autogen_agentchat.base import TaskResult, TerminatedException, TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+from autogen_core import CancellationToken, Component
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from utils.model_client import ChatClientWrapper, find_wrapper
+
+
+DEADLINE_REACHED = "Deadline reached"
+TOKENS_EXHAUSTED = "Token budget exhausted"
+
+
+def is_budget_stop(stop_reason: Optional[str]) -> bool:
+    """Whether a team or debate was stopped by its task budget."""
+    return bool(stop_reason) and (DEADLINE_REACHED in stop_reason or TOKENS_EXHAUSTED in stop_reason)
+
+
+class TaskBudget:
+    """
+    Remaining time and tokens of one task.
+
+    Args:
+        deadline: Seconds the task may take from now (None = no deadline)
+        token_budget: Prompt + completion tokens the task may use (None = no limit)
+    """
+
+    def __init__(self, deadline: Optional[float] = None, token_budget: Optional[int] = None):
+        self.deadline = deadline
+        self.token_budget = token_budget
+        self.deadline_at = time.perf_counter() + deadline if deadline is not None else None
+        self.tokens_used = 0
+
+    @property
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds left until the deadline (None without one)."""
+        if self.deadline_at is None:
+            return None
+        return max(0.0, self.deadline_at - time.perf_counter())
+
+    @property
+    def remaining_tokens(self) -> Optional[int]:
+        """Tokens left (None without a token budget)."""
+        if self.token_budget is None:
+            return None
+        return max(0, self.token_budget - self.tokens_used)
+
+    @property
+    def reason(self) -> str:
+        """Why the budget is exhausted ("" while it is not)."""
+        if self.deadline_at is not None and time.perf_counter() >= self.deadline_at:
+            return f"{DEADLINE_REACHED} ({self.deadline:g}s)"
+        if self.token_budget is not None and self.tokens_used >= self.token_budget:
+            return f"{TOKENS_EXHAUSTED} ({self.tokens_used}/{self.token_budget} tokens)"
+        return ""
+
+    @property
+    def exhausted(self) -> bool:
+        return bool(self.reason)
+
+    def charge(self, usage: Any):
+        """Add the token usage of one model call (a RequestUsage)."""
+        self.tokens_used += usage.prompt_tokens + usage.completion_tokens
+
+    def limit_timeout(self, seconds: float) -> float:
+        """Cap a timeout at the time left before the deadline."""
+        remaining = self.remaining_seconds
+        return seconds if remaining is None else min(seconds, remaining)
+
+
+class BudgetExhausted(Exception):
+    """A model call was refused because the task's budget is spent."""
+
+
+# Budget of the task running in the current context
+_task_budget: contextvars.ContextVar[Optional[TaskBudget]] = contextvars.ContextVar(
+    "task_budget", default=None
+)
+
+
+@contextmanager
+def budget_scope(budget: Optional[TaskBudget]) -> Iterator[Optional[TaskBudget]]:
+    """
+    Charge the model calls made in this context (and tasks started from it) to a budget.
+
+    Args:
+        budget: Budget of the task (None = calls are not charged)
+    """
+    token = _task_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _task_budget.reset(token)
+
+
+class BudgetedChatClient(ChatClientWrapper):
+    """Model client that charges every call to the current task's budget and refuses calls once it is spent."""
+
+    def _check(self) -> Optional[TaskBudget]:
+        budget = _task_budget.get()
+        if budget is not None and budget.exhausted:
+            raise BudgetExhausted(budget.reason)
+        return budget
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        budget = self._check()
+        result = await self.inner.create(messages, **kwargs)
+        if budget is not None:
+            budget.charge(result.usage)
+        return result
+
+    async def create_stream(
+        self, messages: Sequence[LLMMessage], **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        budget = self._check()
+        async for chunk in self.inner.create_stream(messages, **kwargs):
+            if budget is not None and isinstance(chunk, CreateResult):
+                budget.charge(chunk.usage)
+            yield chunk
+
+
+def enforce_budget(client: ChatCompletionClient) -> ChatCompletionClient:
+    """Wrap a client in a BudgetedChatClient (unless its wrapper chain has one)."""
+    if find_wrapper(client, BudgetedChatClient) is not None:
+        return client
+    return BudgetedChatClient(client)
+
+
+class BudgetTerminationConfig(BaseModel):
+    deadline: Optional[float] = None
+    token_budget: Optional[int] = None
+
+
+class BudgetTermination(TerminationCondition, Component[BudgetTerminationConfig]):
+    """
+    Terminate a team when its task budget is exhausted.
+
+    The budget can be replaced between runs (pooled teams serve many tasks);
+    without one the condition never fires.
+
+    Args:
+        budget: Budget of the task the team is working on
+    """
+
+    component_config_schema = BudgetTerminationConfig
+
+    def __init__(self, budget: Optional[TaskBudget] = None) -> None:
+        self.budget = budget
+        self._terminated = False
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    async def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> StopMessage | None:
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+        if self.budget is None:
+            return None
+
+        # Tokens are charged per model call by BudgetedChatClient
+        reason = self.budget.reason
+        if reason:
+            self._terminated = True
+            return StopMessage(content=reason, source="BudgetTermination")
+        return None
+
+    async def reset(self) -> None:
+        self._terminated = False
+
+    def _to_config(self) -> BudgetTerminationConfig:
+        if self.budget is None:
+            return BudgetTerminationConfig()
+        return BudgetTerminationConfig(deadline=self.budget.deadline, token_budget=self.budget.token_budget)
+
+    @classmethod
+    def _from_config(cls, config: BudgetTerminationConfig) -> Self:
+        if config.deadline is None and config.token_budget is None:
+            return cls()
+        return cls(TaskBudget(deadline=config.deadline, token_budget=config.token_budget))
+
+
+async def run_team(team, task, budget: Optional[TaskBudget] = None) -> TaskResult:
+    """
+    Run a team, stopping at the budget's deadline even in the middle of a turn.
+
+    Args:
+        team: An autogen team (e.g. SelectorGroupChat)
+        task: Task for team.run()
+        budget: Budget of the task (None = run to completion)
+
+    Returns:
+        The team's TaskResult; when the deadline cut a turn short or a model
+        call was refused for the spent budget, the messages produced so far
+        with the budget's stop reason
+    """
+    if budget is None:
+        return await team.run(task=task)
+
+    messages = []
+    # Cancelling the token also aborts the model call or tool run in flight
+    token = CancellationToken()
+    timer = None
+    if budget.remaining_seconds is not None:
+        timer = asyncio.get_running_loop().call_later(budget.remaining_seconds, token.cancel)
+    with budget_scope(budget):
+        stream = team.run_stream(task=task, cancellation_token=token)
+        try:
+            async for item in stream:
+                if isinstance(item, TaskResult):
+                    return item
+                messages.append(item)
+        except asyncio.CancelledError:
+            if not token.is_cancelled():
+                raise
+        except Exception:
+            # A refused model call ends the team with an error (autogen re-raises it as RuntimeError)
+            if not budget.exhausted:
+                raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            # Let the team finish shutting down so it can be reset and reused right away
+            await stream.aclose()
+    return TaskResult(messages=messages, stop_reason=budget.reason or DEADLINE_REACHED)
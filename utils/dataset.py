@@ -0,0 +1,45 @@
+"""
+Dataset loading for batch runs.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+TASK_FIELDS = ("task", "question", "body", "input", "prompt")
+GOLD_FIELDS = ("answer", "gold", "final_decision", "label")
+ID_FIELDS = ("id", "task_id", "request_id")
+
+
+def load_dataset(path: Path) -> List[Dict[str, Any]]:
+    """
+    Load a JSONL dataset.
+
+    Each line must contain the task text under one of TASK_FIELDS; an id and
+    a gold answer are picked up from ID_FIELDS / GOLD_FIELDS when present.
+
+    Args:
+        path: JSONL file, one task per line
+
+    Returns:
+        List of {"index", "id", "task", "gold"} dictionaries
+    """
+    items = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            index = len(items)
+
+            task = next((record[k] for k in TASK_FIELDS if record.get(k)), None)
+            if task is None:
+                raise ValueError(f"Line {index + 1} of {path} has no task field ({', '.join(TASK_FIELDS)})")
+
+            items.append({
+                "index": index,
+                "id": str(next((record[k] for k in ID_FIELDS if record.get(k) is not None), index)),
+                "task": task,
+                "gold": next((record[k] for k in GOLD_FIELDS if record.get(k) is not None), None),
+            })
+    return items
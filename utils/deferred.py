@@ -0,0 +1,278 @@
+"""
+Deferred execution of model calls through the OpenAI Batch API.
+
+For offline datasets interactive latency does not matter, and batch
+endpoints are much cheaper. A deferred client is an ordinary
+OpenAIChatCompletionClient whose HTTP transport does not send
+chat-completions requests: it parks them, and once no new request has
+arrived for a short collection window it submits everything parked as one
+batch job (JSONL upload to /v1/files, then /v1/batches), polls until the
+job is done and hands each conversation its response.
+
+Every group turn depends on the previous one, so with many tasks in flight
+the tasks advance in lock-step: each step's requests from all running group
+chats and debates go out in one batch, and all of them resume when it
+completes. The per-request overhead of a batch is amortised across all
+tasks in flight, so use many (see batch.py --deferred).
+
+Everything else (file uploads, streaming requests) goes over the network as
+usual. Failed lines of a batch come back as their HTTP status, so the
+client's normal retry handling applies.
+"""
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from autogen_core.models import ChatCompletionClient
+
+from config import (
+    OPENAI_BASE_URL,
+    DEFERRED_COLLECT_WINDOW,
+    DEFERRED_MAX_WAIT,
+    DEFERRED_MAX_BATCH_REQUESTS,
+    DEFERRED_POLL_INTERVAL,
+    DEFERRED_COMPLETION_WINDOW
+)
+from utils.model_client import create_model_client
+
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+FINAL_BATCH_STATES = ("completed", "failed", "expired", "cancelled")
+
+BatchResult = Tuple[int, Dict[str, Any]]  # (HTTP status, response body)
+
+
+def _error_body(message: str, error_type: str = "server_error") -> Dict[str, Any]:
+    return {"error": {"message": message, "type": error_type, "code": None}}
+
+
+class BatchAPI:
+    """Runs lists of chat-completions requests as OpenAI batch jobs."""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = OPENAI_BASE_URL,
+        poll_interval: float = DEFERRED_POLL_INTERVAL,
+        completion_window: str = DEFERRED_COMPLETION_WINDOW
+    ):
+        """
+        Initialize the submitter.
+
+        Args:
+            api_key: OpenAI API key
+            base_url: Alternative endpoint (e.g. the local stub server)
+            poll_interval: Seconds between batch status checks
+            completion_window: Batch completion window requested from the provider
+        """
+        from openai import AsyncOpenAI
+
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    async def run(self, bodies: List[Dict[str, Any]]) -> List[BatchResult]:
+        """
+        Submit one batch and wait for its results.
+
+        Args:
+            bodies: Chat-completions request bodies
+
+        Returns:
+            (status, response body) per request, in order. Requests the
+            provider did not process (e.g. an expired batch) get a 500.
+        """
+        lines = [
+            json.dumps({"custom_id": f"request-{i}", "method": "POST", "url": CHAT_ENDPOINT, "body": body})
+            for i, body in enumerate(bodies)
+        ]
+        upload = await self.client.files.create(
+            file=("batch.jsonl", ("\n".join(lines) + "\n").encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint=CHAT_ENDPOINT,
+            completion_window=self.completion_window
+        )
+        while batch.status not in FINAL_BATCH_STATES:
+            await asyncio.sleep(self.poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        results: Dict[str, BatchResult] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await self.client.files.content(file_id)
+                for line in content.text.splitlines():
+                    if line.strip():
+                        record = json.loads(line)
+                        results[record["custom_id"]] = self._line_result(record)
+
+        reason = f"Batch {batch.id} {batch.status}"
+        if batch.errors and batch.errors.data:
+            reason += ": " + "; ".join(error.message or error.code or "" for error in batch.errors.data)
+        return [
+            results.get(f"request-{i}", (500, _error_body(f"{reason} without a result for this request")))
+            for i in range(len(bodies))
+        ]
+
+    @staticmethod
+    def _line_result(record: Dict[str, Any]) -> BatchResult:
+        """(status, body) of one line of a batch output or error file."""
+        response = record.get("response")
+        if response:
+            return response.get("status_code", 200), response.get("body") or {}
+        error = record.get("error") or {}
+        return 500, _error_body(error.get("message", "Request failed in batch"), error.get("code") or "server_error")
+
+    async def close(self):
+        await self.client.close()
+
+
+class BatchingTransport:
+    """
+    HTTP transport that turns chat-completions requests into batch jobs.
+
+    Implements the async transport interface of the openai SDK's HTTP client
+    (handle_async_request / aclose); all other requests are sent through a
+    regular transport.
+    """
+
+    def __init__(
+        self,
+        api: BatchAPI,
+        collect_window: float = DEFERRED_COLLECT_WINDOW,
+        max_wait: float = DEFERRED_MAX_WAIT,
+        max_batch_requests: int = DEFERRED_MAX_BATCH_REQUESTS
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            api: Submitter for the collected batches
+            collect_window: Submit once no request has arrived for this many seconds
+            max_wait: Submit at the latest this many seconds after the first
+                parked request, even if requests keep arriving
+            max_batch_requests: Submit as soon as this many requests are parked
+        """
+        self.api = api
+        self.collect_window = collect_window
+        self.max_wait = max_wait
+        self.max_batch_requests = max_batch_requests
+
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._first_parked = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._submissions: set = set()
+        self._passthrough = None
+
+        self.batches = 0
+        self.batched_requests = 0
+
+    async def handle_async_request(self, request):
+        http = sys.modules[type(request).__module__.split(".")[0]]  # httpx (or the SDK's fork of it)
+        await request.aread()
+        body = json.loads(request.content) if request.method == "POST" and request.content else None
+        if not request.url.path.endswith("/chat/completions") or not body or body.get("stream"):
+            if self._passthrough is None:
+                self._passthrough = http.AsyncHTTPTransport()
+            return await self._passthrough.handle_async_request(request)
+
+        status, data = await self._park(body)
+        return http.Response(status, json=data, request=request)
+
+    def _park(self, body: Dict[str, Any]) -> asyncio.Future:
+        """Queue a request for the next batch and (re)arm the submission timer."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            self._first_parked = loop.time()
+        self._pending.append((body, future))
+
+        if len(self._pending) >= self.max_batch_requests:
+            self._submit()
+            return future
+        if self._timer is not None:
+            self._timer.cancel()
+        deadline = min(loop.time() + self.collect_window, self._first_parked + self.max_wait)
+        self._timer = loop.call_at(deadline, self._submit)
+        return future
+
+    def _submit(self):
+        """Send everything parked as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        parked, self._pending = self._pending, []
+        if not parked:
+            return
+        task = asyncio.ensure_future(self._run_batch(parked))
+        self._submissions.add(task)
+        task.add_done_callback(self._submissions.discard)
+
+    async def _run_batch(self, parked: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        self.batches += 1
+        self.batched_requests += len(parked)
+        number = self.batches
+        print(f"[DEFERRED] Batch {number}: submitting {len(parked)} requests")
+        started = time.perf_counter()
+        try:
+            results = await self.api.run([body for body, _ in parked])
+        except Exception as e:
+            print(f"[DEFERRED] Batch {number} failed: {type(e).__name__}: {e}")
+            results = [(500, _error_body(f"Batch submission failed: {e}"))] * len(parked)
+        print(f"[DEFERRED] Batch {number}: {len(parked)} results after {time.perf_counter() - started:.1f}s")
+        for (_, future), result in zip(parked, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        """Batches submitted, requests batched and the mean batch size."""
+        return {
+            "batches": self.batches,
+            "requests": self.batched_requests,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "parked": len(self._pending),
+        }
+
+    async def aclose(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for task in list(self._submissions):
+            task.cancel()
+        for _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        if self._passthrough is not None:
+            await self._passthrough.aclose()
+        await self.api.close()
+
+
+def create_deferred_client(
+    model_name: str,
+    api_key: Optional[str],
+    base_url: Optional[str] = OPENAI_BASE_URL,
+    **kwargs: Any
+) -> Tuple[ChatCompletionClient, BatchingTransport]:
+    """
+    Create a model client whose chat completions run as batch jobs.
+
+    Args:
+        model_name: OpenAI model name
+        api_key: OpenAI API key
+        base_url: Alternative endpoint (e.g. the local stub server)
+        **kwargs: BatchingTransport options (collect_window, max_wait,
+            max_batch_requests)
+
+    Returns:
+        (model client, transport); the transport reports batch statistics
+    """
+    from openai import DefaultAsyncHttpxClient
+
+    transport = BatchingTransport(BatchAPI(api_key, base_url=base_url), **kwargs)
+    # No HTTP timeout: a parked request waits for its whole batch
+    http_client = DefaultAsyncHttpxClient(transport=transport, timeout=None)
+    return create_model_client(model_name, api_key, base_url=base_url, http_client=http_client), transport
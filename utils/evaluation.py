@@ -0,0 +1,222 @@
+"""
+Vectorised evaluation of exported results against gold answers.
+
+Works on the column arrays from utils.results_table.read_table, so scoring
+hundreds of thousands of tasks is a handful of numpy operations rather than
+a Python loop over rows or a parse of every session_summary.txt.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import TOKEN_PRICES_PER_1M
+from utils.results_table import GROUP_COLUMNS, group_names
+
+
+PERCENTILES = (50, 90, 99)
+
+
+def _rate(mask: np.ndarray, among: np.ndarray) -> Optional[float]:
+    """Fraction of the rows in `among` where mask is set (None when there are none)."""
+    count = int(among.sum())
+    return float((mask & among).sum()) / count if count else None
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    """p50/p90/p99 and mean of a numeric column."""
+    if values.size == 0:
+        return {}
+    points = np.percentile(values, PERCENTILES)
+    summary = {f"p{p}": float(v) for p, v in zip(PERCENTILES, points)}
+    summary["mean"] = float(values.mean())
+    return summary
+
+
+def majority_answer(answers: np.ndarray) -> np.ndarray:
+    """
+    Most common non-empty answer per row (ties go to the earliest group).
+
+    Args:
+        answers: (rows, groups) array of normalised answers, "" for none
+
+    Returns:
+        (rows,) array of the majority answers ("" when no group answered)
+    """
+    stated = answers != ""
+    # votes[r, g] = number of groups in row r that gave the same answer as group g
+    votes = ((answers[:, :, None] == answers[:, None, :]) & stated[:, None, :]).sum(axis=2)
+    votes[~stated] = 0
+    winner = votes.argmax(axis=1)
+    return answers[np.arange(len(answers)), winner]
+
+
+def evaluate(
+    columns: Dict[str, np.ndarray],
+    prices: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Compute accuracy, agreement, cost and latency metrics.
+
+    Accuracy compares normalised answers with the normalised gold answer and
+    only counts completed tasks that have a gold answer.
+
+    Args:
+        columns: Column arrays from read_table
+        prices: USD per 1M prompt/completion tokens, and optionally cached_prompt
+            tokens (default: TOKEN_PRICES_PER_1M)
+
+    Returns:
+        Dictionary of metrics (see format_report)
+    """
+    prices = prices or TOKEN_PRICES_PER_1M
+    status = columns["status"]
+    total = len(status)
+    ok = status == "ok"
+    scored = ok & (columns["gold_answer"] != "")
+    gold = columns["gold_answer"]
+    final = columns["answer"]
+
+    groups = group_names(columns)
+    metrics: Dict[str, Any] = {
+        "tasks": total,
+        "completed": int(ok.sum()),
+        "failed": int(total - ok.sum()),
+        "scored": int(scored.sum()),
+        "cache_hits": int((columns["cache_hit"] & ok).sum()) if "cache_hit" in columns else 0,
+        "accuracy": _rate(final == gold, scored),
+        "answered": _rate(final != "", ok),
+        "consensus_rate": _rate(columns["consensus_reached"], ok),
+        "converged_rate": _rate(columns["converged"], ok),
+        "degraded_rate": _rate(columns["degraded"], ok) if "degraded" in columns else None,
+        "groups": {},
+    }
+
+    if groups:
+        answers = np.stack([columns[f"{name}_answer"] for name in groups], axis=1)
+        stated = answers != ""
+        majority = majority_answer(answers)
+        unanimous = stated.all(axis=1) & (answers == answers[:, :1]).all(axis=1)
+
+        metrics["majority_vote_accuracy"] = _rate(majority == gold, scored)
+        metrics["unanimous_groups"] = _rate(unanimous, ok)
+        metrics["final_matches_majority"] = _rate((final == majority) & (majority != ""), ok)
+        for i, name in enumerate(groups):
+            metrics["groups"][name] = {
+                "accuracy": _rate(answers[:, i] == gold, scored),
+                "agrees_with_final": _rate((answers[:, i] == final) & stated[:, i], ok),
+                "turns": _percentiles(columns[f"{name}_turns"][ok]),
+            }
+
+    prompt_tokens = columns["prompt_tokens"][ok]
+    completion_tokens = columns["completion_tokens"][ok]
+    # Prompt tokens served from the provider's prompt cache are billed at the cached rate
+    cached_tokens = columns["cached_tokens"][ok] if "cached_tokens" in columns else np.zeros_like(prompt_tokens)
+    cost = ((prompt_tokens - cached_tokens) * prices["prompt"]
+            + cached_tokens * prices.get("cached_prompt", prices["prompt"])
+            + completion_tokens * prices["completion"]) / 1e6
+    metrics["tokens"] = _percentiles(prompt_tokens + completion_tokens)
+    metrics["cached_prompt_share"] = (
+        float(cached_tokens.sum() / prompt_tokens.sum()) if "cached_tokens" in columns and prompt_tokens.sum() else None
+    )
+    metrics["cost_usd"] = _percentiles(cost)
+    metrics["total_cost_usd"] = float(cost.sum())
+    metrics["debate_turns"] = _percentiles(columns["debate_turns"][ok])
+    for key in ("phase1_seconds", "phase2_seconds", "total_seconds"):
+        metrics[key] = _percentiles(columns[key][ok])
+    return metrics
+
+
+def _fmt_rate(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.1%}"
+
+
+def _fmt_dist(summary: Dict[str, float], fmt: str = "{:.1f}") -> str:
+    if not summary:
+        return "n/a"
+    parts = [f"p{p} {fmt.format(summary[f'p{p}'])}" for p in PERCENTILES]
+    return ", ".join(parts) + f", mean {fmt.format(summary['mean'])}"
+
+
+def format_report(metrics: Dict[str, Any]) -> str:
+    """Render evaluate() metrics as a plain-text report."""
+    lines: List[str] = [
+        f"Tasks: {metrics['tasks']} ({metrics['completed']} completed, {metrics['failed']} failed, "
+        f"{metrics['cache_hits']} cache hits, {metrics['scored']} with gold answers)",
+        "",
+        f"Accuracy:               {_fmt_rate(metrics['accuracy'])}",
+        f"Answered:               {_fmt_rate(metrics['answered'])}",
+    ]
+    if metrics["groups"]:
+        lines += [
+            f"Majority-vote accuracy: {_fmt_rate(metrics['majority_vote_accuracy'])}",
+            "",
+            f"Groups unanimous:       {_fmt_rate(metrics['unanimous_groups'])}",
+            f"Final = group majority: {_fmt_rate(metrics['final_matches_majority'])}",
+        ]
+    lines += [
+        f"Consensus reached:      {_fmt_rate(metrics['consensus_rate'])}",
+        f"Converged early:        {_fmt_rate(metrics['converged_rate'])}",
+        f"Degraded (budget):      {_fmt_rate(metrics['degraded_rate'])}",
+        "",
+    ]
+    for name, group in metrics["groups"].items():
+        lines.append(f"{name}: accuracy {_fmt_rate(group['accuracy'])}, "
+                     f"agrees with final {_fmt_rate(group['agrees_with_final'])}, "
+                     f"turns {_fmt_dist(group['turns'], '{:.0f}')}")
+    if metrics["groups"]:
+        lines.append("")
+    lines += [
+        f"Debate turns:   {_fmt_dist(metrics['debate_turns'], '{:.0f}')}",
+        f"Tokens:         {_fmt_dist(metrics['tokens'], '{:,.0f}')}",
+        f"Cached prompt:  {_fmt_rate(metrics['cached_prompt_share'])}"
+        + (" of prompt tokens" if metrics["cached_prompt_share"] is not None else ""),
+        f"Cost (USD):     {_fmt_dist(metrics['cost_usd'], '{:.4f}')}, total {metrics['total_cost_usd']:.2f}",
+        f"Phase 1 (s):    {_fmt_dist(metrics['phase1_seconds'])}",
+        f"Phase 2 (s):    {_fmt_dist(metrics['phase2_seconds'])}",
+        f"Total (s):      {_fmt_dist(metrics['total_seconds'])}",
+    ]
+    return "\n".join(lines)
+
+
+def select_rows(columns: Dict[str, np.ndarray], mask: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Rows where mask is set, e.g. the rows of one config of a sweep.
+
+    Per-group columns of groups the selected rows do not have (a config with
+    fewer groups than others in the same file) are dropped.
+    """
+    selected = {name: column[mask] for name, column in columns.items()}
+    for name in group_names(selected):
+        if not (selected[f"{name}_stop_reason"] != "").any():
+            for suffix in GROUP_COLUMNS:
+                del selected[f"{name}_{suffix}"]
+    return selected
+
+
+def pareto_front(points: List[Dict[str, float]], maximize: str, minimize: List[str]) -> List[bool]:
+    """
+    Mark the points no other point dominates.
+
+    A point is dominated when another is at least as good on every objective
+    and strictly better on one. Points with a missing (None) value are never
+    on the front.
+
+    Args:
+        points: One dictionary of objective values per point
+        maximize: Objective to maximise (e.g. "accuracy")
+        minimize: Objectives to minimise (e.g. latency and cost)
+
+    Returns:
+        One flag per point, True when it is on the Pareto front
+    """
+    keys = [maximize] + list(minimize)
+    valid = np.array([all(p.get(k) is not None for k in keys) for p in points], dtype=bool)
+    # Negate the maximised objective so lower is better everywhere
+    values = np.array([
+        [-p[maximize]] + [p[k] for k in minimize] if ok else [np.inf] * len(keys)
+        for p, ok in zip(points, valid)
+    ], dtype=float).reshape(len(points), len(keys))
+    no_worse = (values[:, None, :] <= values[None, :, :]).all(axis=2)
+    better = (values[:, None, :] < values[None, :, :]).any(axis=2)
+    dominated = (no_worse & better & valid[:, None]).any(axis=0)
+    return (valid & ~dominated).tolist()
@@ -0,0 +1,297 @@
+"""
+Cache of code execution results.
+
+Groups often regenerate the same script, across the three groups and across
+repeated tasks. Results are keyed on the normalised code (its AST, so
+comments and formatting do not matter) plus a fingerprint of the input files
+in the group's work directory.
+
+Only deterministic scripts are cached: code that imports randomness, clock,
+network or process modules (checked on the full dotted module path, so
+numpy.random counts), refers to a URL, or writes files always runs. Only
+successful executions are stored. Entries are evicted least-recently-used
+once the cached output exceeds max_bytes.
+"""
+import ast
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import EXEC_CACHE_ENABLED, EXEC_CACHE_MAX_BYTES
+
+
+# Imports that make output depend on more than the code and its inputs
+NONDETERMINISTIC_MODULES = {
+    "random", "secrets", "uuid", "time", "datetime", "socket", "ssl",
+    "requests", "urllib", "urllib3", "http", "httpx", "aiohttp", "ftplib",
+    "smtplib", "serpapi", "webbrowser", "subprocess", "multiprocessing",
+    "threading", "asyncio", "shutil", "tempfile", "numpy.random",
+    "scipy.stats", "torch.random", "faker",
+}
+
+# Attribute names that read randomness, the clock or the environment
+NONDETERMINISTIC_ATTRS = {
+    "random", "urandom", "getrandom", "system", "popen", "getpid",
+    "environ", "getenv", "now", "today", "time", "perf_counter", "sample",
+    "rvs", "default_rng",
+}
+
+# Calls that write files (a cached result would not recreate them)
+WRITING_CALLS = {
+    "write_text", "write_bytes", "to_csv", "to_excel", "to_json", "to_parquet",
+    "to_pickle", "savefig", "save", "savez", "savetxt", "dump", "mkdir",
+    "makedirs", "remove", "unlink", "rename", "replace", "rmdir", "to_hdf",
+    "to_feather", "to_sql", "to_stata", "to_orc", "to_xml", "writelines",
+    "touch", "symlink_to", "chmod",
+}
+
+# Prefixes of further writing calls (write_image, save_model, ...)
+WRITING_PREFIXES = ("write_", "save")
+
+# String literals that point at remote data
+URL_PREFIXES = ("http://", "https://", "ftp://")
+
+# Modules whose open() takes the mode second, like the builtin
+OPEN_MODULES = {"io", "codecs", "gzip", "bz2", "lzma", "tarfile"}
+
+# A file mode string such as "r", "wb" or "a+"
+MODE_PATTERN = re.compile(r"[rwxabtU+]{1,4}")
+
+# Files above this size are fingerprinted by size and mtime instead of content
+HASH_CONTENT_LIMIT = 64 * 1024 * 1024
+
+
+def normalize_code(code: str) -> Optional[str]:
+    """
+    Normalise code to its AST dump, or return None if it does not parse.
+    """
+    try:
+        return ast.dump(ast.parse(code), annotate_fields=False, include_attributes=False)
+    except (SyntaxError, ValueError):
+        return None
+
+
+def is_cacheable(code: str) -> bool:
+    """
+    Whether a script looks deterministic and side-effect free.
+
+    Args:
+        code: Python source
+
+    Returns:
+        False if it uses randomness, the clock, the network, subprocesses or
+        writes files
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return False
+
+    # Names bound by "from x import *" are unknown, so any unsafe name may be one
+    star_import = any(
+        isinstance(node, ast.ImportFrom) and any(alias.name == "*" for alias in node.names)
+        for node in ast.walk(tree)
+    )
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            if any(_is_nondeterministic_module(alias.name) for alias in node.names):
+                return False
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            # from numpy import random -> numpy.random
+            if any(_is_nondeterministic_module(f"{module}.{alias.name}".lstrip("."))
+                   for alias in node.names):
+                return False
+            # from os import system, environ; from numpy import save
+            if any(_is_unsafe_name(alias.name) for alias in node.names):
+                return False
+        elif isinstance(node, ast.Attribute):
+            if _is_unsafe_name(node.attr):
+                return False
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if node.value.lstrip().lower().startswith(URL_PREFIXES):
+                return False
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id in {"input", "exec", "eval", "__import__"}:
+                return False
+            if node.func.id == "open" and _opens_for_writing(node):
+                return False
+            if star_import and _is_unsafe_name(node.func.id):
+                return False
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            if node.func.attr == "open" and _method_opens_for_writing(node):
+                return False
+    return True
+
+
+def _is_unsafe_name(name: str) -> bool:
+    """Whether a function or attribute name reads nondeterministic state or writes files."""
+    return name in NONDETERMINISTIC_ATTRS or name in WRITING_CALLS or name.startswith(WRITING_PREFIXES)
+
+
+def _is_nondeterministic_module(name: str) -> bool:
+    """Whether a dotted module path is, or is inside, a nondeterministic module."""
+    parts = name.split(".")
+    return any(".".join(parts[:i]) in NONDETERMINISTIC_MODULES for i in range(1, len(parts) + 1))
+
+
+def _opens_for_writing(call: ast.Call) -> bool:
+    """Whether an open(...) call uses a write, append or update mode."""
+    mode = call.args[1] if len(call.args) > 1 else None
+    for keyword in call.keywords:
+        if keyword.arg == "mode":
+            mode = keyword.value
+    if mode is None:
+        return False
+    if not isinstance(mode, ast.Constant) or not isinstance(mode.value, str):
+        return True
+    return any(flag in mode.value for flag in "wax+")
+
+
+def _method_opens_for_writing(call: ast.Call) -> bool:
+    """
+    Whether an x.open(...) call may write: Path.open("w"), gzip.open(f, "wt"),
+    os.open(f, flags), ...
+    """
+    owner = call.func.value
+    if isinstance(owner, ast.Name) and owner.id in OPEN_MODULES:
+        return _opens_for_writing(call)
+    if isinstance(owner, ast.Name) and owner.id == "os":
+        return True  # flags are rarely literal; assume they may write
+    modes = list(call.args[:2])
+    modes += [keyword.value for keyword in call.keywords if keyword.arg == "mode"]
+    return any(
+        isinstance(mode, ast.Constant) and isinstance(mode.value, str)
+        and MODE_PATTERN.fullmatch(mode.value) and any(flag in mode.value for flag in "wax+")
+        for mode in modes
+    )
+
+
+def workspace_fingerprint(work_dir: Path) -> str:
+    """
+    Hash the input files of a work directory.
+
+    Generated code files (tmp_code_*) are skipped; linked directories such as
+    shared_data/ contribute only their file paths, since their files never change.
+    """
+    digest = hashlib.sha256()
+    work_dir = Path(work_dir)
+    for root, dirs, files in os.walk(work_dir):
+        dirs.sort()
+        root_path = Path(root)
+        for name in list(dirs):
+            link = root_path / name
+            if link.is_symlink():
+                digest.update(f"link:{link.relative_to(work_dir)}:".encode())
+                digest.update("\0".join(sorted(
+                    str(path.relative_to(link)) for path in link.rglob("*") if path.is_file()
+                )).encode())
+        for name in sorted(files):
+            if name.startswith("tmp_code_"):
+                continue
+            path = root_path / name
+            stat = path.stat()
+            digest.update(f"file:{path.relative_to(work_dir)}:{stat.st_size}:".encode())
+            if stat.st_size > HASH_CONTENT_LIMIT:
+                digest.update(str(stat.st_mtime_ns).encode())
+                continue
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExecutionCache:
+    """
+    Thread-safe LRU cache of execution outputs, bounded by total output size.
+    """
+
+    def __init__(self, max_bytes: int = EXEC_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of cached outputs
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, code: str, work_dir: Path) -> Optional[str]:
+        """
+        Build the cache key for running code in a work directory.
+
+        Returns:
+            The key, or None if the script must not be cached
+        """
+        normalized = normalize_code(code)
+        if normalized is None or not is_cacheable(code):
+            with self._lock:
+                self.skipped += 1
+            return None
+        digest = hashlib.sha256(normalized.encode("utf-8"))
+        digest.update(workspace_fingerprint(work_dir).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached output for a key, if any."""
+        with self._lock:
+            output = self._entries.get(key)
+            if output is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return output
+
+    def put(self, key: str, output: str):
+        """Store the output of a successful execution."""
+        size = len(output.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.encode("utf-8"))
+            self._entries[key] = output
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.encode("utf-8"))
+
+    def stats(self) -> Dict[str, float]:
+        """Return entry count, size, hits, misses, skipped scripts and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = None
+
+
+def get_execution_cache() -> Optional[ExecutionCache]:
+    """Return the process-wide execution cache, or None when disabled."""
+    global _cache
+    if _cache is None and EXEC_CACHE_ENABLED:
+        _cache = ExecutionCache()
+    return _cache
@@ -0,0 +1,35 @@
+"""
+Lazy package exports (PEP 562).
+
+Packages list their public names and the submodule defining each; a
+submodule is only imported when one of its names is first accessed, so
+importing a package does not pull in autogen, numpy, etc.
+"""
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Build a package's module-level __getattr__ and __dir__.
+
+    Args:
+        package: The package's __name__
+        exports: Public name -> relative submodule (e.g. {"GroupTeam": ".group_team"})
+
+    Returns:
+        (__getattr__, __dir__) to assign in the package's __init__
+    """
+    module_globals = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(module_globals) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,187 @@
+"""
+In-memory cache of model responses shared between configurations.
+
+Configurations in a sweep often send identical requests: e.g. two configs
+that differ only in debate settings run the same Phase 1 conversations. A
+CachedChatClient per configuration, all on one LLMCache, answers those
+requests once.
+
+Keys cover the model name, the messages, the tools and the create()
+arguments. Identical requests from the SAME client are numbered (the 2nd
+identical request maps to the 2nd cached response), so a configuration
+still gets independent samples where it asks the same thing twice (e.g.
+a repeated task in the dataset). Concurrent identical requests share one
+model call.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import Counter, OrderedDict
+from typing import Any, AsyncGenerator, Dict, Sequence, Tuple, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from utils.model_client import ChatClientWrapper
+
+
+def request_key(model: str, messages: Sequence[LLMMessage], **kwargs: Any) -> str:
+    """Hash a create() request (the cancellation token is ignored)."""
+    kwargs.pop("cancellation_token", None)
+    tools = [
+        getattr(tool, "schema", tool) for tool in kwargs.pop("tools", None) or []
+    ]
+    payload = {
+        "model": model,
+        "messages": [msg.model_dump(mode="json") for msg in messages],
+        "tools": tools,
+        "kwargs": kwargs,
+    }
+    data = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _cancelling() -> bool:
+    """Whether cancellation of the current task was requested (Python 3.11+; False before)."""
+    task = asyncio.current_task()
+    return bool(task is not None and getattr(task, "cancelling", lambda: 0)())
+
+
+class LLMCache:
+    """
+    LRU cache of CreateResults with de-duplication of in-flight requests.
+
+    Bound to the event loop it is used from.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Responses kept before the least recently used are evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[CreateResult, float]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0  # requests that waited for an identical in-flight call
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_create(self, key: Tuple[str, int], create) -> Tuple[CreateResult, float, str]:
+        """
+        Return the cached response for key, calling create() on a miss.
+
+        Args:
+            key: (request hash, occurrence number)
+            create: Coroutine function making the model call
+
+        Returns:
+            (result, seconds the original call took, source), where source
+            is "hit", "shared" (waited for an identical in-flight call) or "miss"
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0], entry[1], "hit"
+
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                result, seconds = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled() or _cancelling():
+                    raise  # this request itself was cancelled
+                continue  # the other call was cancelled: wait for the next one or make our own
+            except Exception:
+                break  # the other call failed: make our own
+            self.shared += 1
+            return result, seconds, "shared"
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        started = time.perf_counter()
+        try:
+            result = await create()
+        except asyncio.CancelledError:
+            # Only the caller that made the call was cancelled; waiters retry
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        seconds = time.perf_counter() - started
+        future.set_result((result, seconds))
+
+        self._entries[key] = (result, seconds)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result, seconds, "miss"
+
+    def stats(self) -> Dict[str, float]:
+        """Return entry count, hits, misses, shared in-flight calls and hit rate."""
+        lookups = self.hits + self.shared + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "shared": self.shared,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.shared) / lookups if lookups else 0.0,
+        }
+
+
+class CachedChatClient(ChatClientWrapper):
+    """Model client that answers repeated requests from a shared LLMCache."""
+
+    def __init__(
+        self,
+        inner: ChatCompletionClient,
+        cache: LLMCache,
+        model: str,
+        replay_latency: bool = True
+    ):
+        """
+        Wrap a client.
+
+        Args:
+            inner: Client making the actual model calls
+            cache: Cache shared with other clients
+            model: Model name of the inner client (part of the cache key)
+            replay_latency: On a hit, wait as long as the original call took,
+                so wall-clock timings stay comparable between configurations
+        """
+        super().__init__(inner)
+        self.cache = cache
+        self.model = model
+        self.replay_latency = replay_latency
+        self._occurrences: Counter = Counter()
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        digest = request_key(self.model, messages, **kwargs)
+        occurrence = self._occurrences[digest]
+        self._occurrences[digest] += 1
+
+        result, seconds, source = await self.cache.get_or_create(
+            (digest, occurrence),
+            lambda: self.inner.create(messages, **kwargs)
+        )
+        if source == "miss":
+            return result
+        if source == "hit" and self.replay_latency:
+            await asyncio.sleep(seconds)
+        return result.model_copy(update={"cached": True})
+
+    def create_stream(
+        self, messages: Sequence[LLMMessage], **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        # Streaming is not cached
+        return self.inner.create_stream(messages, **kwargs)
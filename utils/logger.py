@@ -4,7 +4,9 @@ Transcript logger for saving debate conversations.
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from utils.messages import PayloadStore, serialize_content
 
 
 class TranscriptLogger:
@@ -12,13 +14,20 @@ class TranscriptLogger:
     Logger for saving conversation transcripts to files.
     """
 
-    def __init__(self, output_dir: Path = None):
+    def __init__(self, output_dir: Path = None, session_dir: Optional[Path] = None):
         """
         Initialize the transcript logger.
 
         Args:
             output_dir: Directory to save transcripts (default: tmp/transcripts)
+            session_dir: Existing session directory to reuse (e.g. when resuming a run)
         """
+        if session_dir is not None:
+            self.session_dir = Path(session_dir)
+            self.output_dir = self.session_dir.parent
+            self.session_dir.mkdir(parents=True, exist_ok=True)
+            return
+
         if output_dir is None:
             output_dir = Path("tmp/transcripts")
 
@@ -26,9 +35,17 @@ class TranscriptLogger:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         # Create timestamped session directory
+        # (suffixed when several sessions start within the same second)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.session_dir = self.output_dir / timestamp
-        self.session_dir.mkdir(parents=True, exist_ok=True)
+        suffix = 1
+        while True:
+            try:
+                self.session_dir.mkdir(parents=True)
+                break
+            except FileExistsError:
+                self.session_dir = self.output_dir / f"{timestamp}_{suffix}"
+                suffix += 1
 
     def _serialize_content(self, content: Any) -> str:
         """
@@ -41,14 +58,7 @@ class TranscriptLogger:
         Returns:
             String representation of the content
         """
-        if isinstance(content, str):
-            return content
-        elif isinstance(content, (list, tuple)):
-            # Handle lists of objects (e.g., FunctionCall objects)
-            return "\n".join(str(item) for item in content)
-        else:
-            # Convert any other object to string
-            return str(content)
+        return serialize_content(content)
 
     def save_group_transcript(
         self,
@@ -122,7 +132,8 @@ class TranscriptLogger:
         self,
         messages: List[Any],
         final_answer: str,
-        metadata: Dict[str, Any] = None
+        metadata: Dict[str, Any] = None,
+        name: str = "phase2_leader_debate"
     ) -> Path:
         """
         Save the Phase 2 debate transcript.
@@ -131,11 +142,13 @@ class TranscriptLogger:
             messages: List of messages from the debate
             final_answer: The final consensus answer
             metadata: Additional metadata to save
+            name: File name without extension (tournament sub-debates
+                use one file each)
 
         Returns:
             Path to the saved file
         """
-        filename = "phase2_leader_debate.txt"
+        filename = f"{name}.txt"
         filepath = self.session_dir / filename
 
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -170,7 +183,7 @@ class TranscriptLogger:
             f.write("=" * 80 + "\n")
 
         # Also save as JSON
-        json_filepath = self.session_dir / "phase2_leader_debate.json"
+        json_filepath = self.session_dir / f"{name}.json"
         with open(json_filepath, 'w', encoding='utf-8') as f:
             json_data = {
                 "phase": "phase2_debate",
@@ -248,6 +261,8 @@ class TranscriptLogger:
             final_answer = getattr(phase2_result, 'final_answer', 'No answer')
 
             f.write(f"Consensus Reached: {consensus_reached}\n")
+            if getattr(phase2_result, 'converged', False):
+                f.write(f"Stopped early on convergence ({phase2_result.turns_saved} turns saved)\n")
             f.write(f"Full transcript: phase2_leader_debate.txt\n\n")
 
             f.write("FINAL ANSWER\n")
@@ -260,10 +275,10 @@ class TranscriptLogger:
             f.write(f"Directory: {self.session_dir}/\n\n")
             f.write("Files:\n")
             f.write("  - session_summary.txt (this file)\n")
-            f.write("  - phase1_group1.txt/.json\n")
-            f.write("  - phase1_group2.txt/.json\n")
-            f.write("  - phase1_group3.txt/.json\n")
-            f.write("  - phase2_leader_debate.txt/.json\n")
+            for report in phase1_reports:
+                f.write(f"  - phase1_{getattr(report, 'group_name', 'unknown').lower()}.txt/.json\n")
+            for path in sorted(self.session_dir.glob("phase2_*.txt")):
+                f.write(f"  - {path.stem}.txt/.json\n")
             f.write("=" * 80 + "\n")
 
         return filepath
@@ -271,3 +286,7 @@ class TranscriptLogger:
     def get_session_dir(self) -> Path:
         """Get the current session directory."""
         return self.session_dir
+
+    def get_payload_store(self) -> PayloadStore:
+        """Store for large message payloads, kept next to the transcripts."""
+        return PayloadStore(self.session_dir / "payloads")
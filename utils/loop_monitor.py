@@ -0,0 +1,222 @@
+"""
+Event-loop stall detector for debugging blocking calls.
+
+A watchdog thread pings the event loop at a fixed interval. When a ping is
+not answered within the threshold, the loop thread's stack is captured, and
+when the loop finally responds the stall duration is recorded together with
+the owning asyncio task (e.g. "Group2") and agent.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+
+# Histogram bucket upper bounds (seconds)
+STALL_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf")]
+
+
+def _agent_types() -> tuple:
+    """Agent and group classes a stall can be attributed to (those imported so far)."""
+    types = []
+    agents = sys.modules.get("autogen_agentchat.agents")
+    if agents is not None:
+        types.append(agents.BaseChatAgent)
+    group_team = sys.modules.get("teams.group_team")
+    if group_team is not None:
+        types.append(group_team.GroupTeam)
+    return tuple(types)
+
+
+@dataclass
+class StallRecord:
+    """A single period during which the event loop was blocked."""
+    duration: float
+    owner: str
+    agent: str
+    stack: List[str] = field(default_factory=list)
+
+
+class LoopStallMonitor:
+    """
+    Watches an asyncio event loop and reports callbacks that block it.
+
+    Usage:
+        monitor = LoopStallMonitor(threshold=0.1)
+        monitor.start()          # from inside the running loop
+        ...
+        monitor.stop()
+        print(monitor.format_report())
+    """
+
+    def __init__(self, threshold: float = 0.1, verbose: bool = True):
+        """
+        Initialize the monitor.
+
+        Args:
+            threshold: Seconds the loop may be blocked before a stall is reported
+            verbose: Whether to print each stall as it is detected
+        """
+        self.threshold = threshold
+        self.verbose = verbose
+        self.stalls: List[StallRecord] = []
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Start watching the loop. Must be called from the loop's own thread.
+
+        Args:
+            loop: Loop to watch (defaults to the running loop)
+        """
+        if self._thread is not None:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="LoopStallMonitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watchdog thread."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _watch(self):
+        """Watchdog loop (runs in a background thread)."""
+        interval = self.threshold / 2
+        while not self._stopped.is_set():
+            answered = threading.Event()
+            sent = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                # Loop closed
+                return
+
+            if answered.wait(self.threshold):
+                self._stopped.wait(interval)
+                continue
+
+            # The loop is blocked: capture who is holding it
+            owner, agent, stack = self._capture_owner()
+            while not answered.wait(interval):
+                if self._stopped.is_set():
+                    return
+            duration = time.perf_counter() - sent
+
+            record = StallRecord(duration=duration, owner=owner, agent=agent, stack=stack)
+            self.stalls.append(record)
+            if self.verbose:
+                print(f"[LOOP] Event loop blocked for {duration:.3f}s "
+                      f"(task: {owner}, agent: {agent})")
+                print("".join(stack[-6:]))
+
+    def _capture_owner(self):
+        """Return (task name, agent name, formatted stack) of the loop thread."""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+
+        owner = "unknown"
+        try:
+            task = asyncio.current_task(self._loop)
+            if task is not None:
+                owner = task.get_name()
+        except RuntimeError:
+            pass
+
+        # Walk the stack for the innermost frame bound to an agent or group
+        agent = "unknown"
+        agent_types = _agent_types()
+        while frame is not None and agent_types:
+            obj = frame.f_locals.get("self")
+            if isinstance(obj, agent_types):
+                agent = getattr(obj, "name", None) or obj.group_name
+                break
+            frame = frame.f_back
+
+        return owner, agent, stack
+
+    def histogram(self) -> List[tuple]:
+        """
+        Bucket the recorded stall durations.
+
+        Returns:
+            List of (bucket upper bound, count) tuples
+        """
+        counts = [0] * len(STALL_BUCKETS)
+        for stall in self.stalls:
+            for i, bound in enumerate(STALL_BUCKETS):
+                if stall.duration <= bound:
+                    counts[i] += 1
+                    break
+        return list(zip(STALL_BUCKETS, counts))
+
+    def format_report(self, include_stacks: bool = True) -> str:
+        """
+        Format an end-of-run report with a histogram of stall durations.
+
+        Args:
+            include_stacks: Whether to append the captured stack of every stall
+
+        Returns:
+            The formatted report
+        """
+        lines = [
+            "=" * 80,
+            "EVENT LOOP STALL REPORT",
+            "=" * 80,
+            f"Threshold: {self.threshold:.3f}s",
+            f"Stalls detected: {len(self.stalls)}",
+        ]
+        if self.stalls:
+            total = sum(s.duration for s in self.stalls)
+            worst = max(self.stalls, key=lambda s: s.duration)
+            lines.append(f"Total blocked time: {total:.3f}s")
+            lines.append(f"Worst stall: {worst.duration:.3f}s "
+                         f"(task: {worst.owner}, agent: {worst.agent})")
+
+        lines.append("\nHistogram:")
+        peak = max((count for _, count in self.histogram()), default=0) or 1
+        lower = 0.0
+        for bound, count in self.histogram():
+            label = f"{lower:.2f}-{bound:.2f}s" if bound != float("inf") else f">{lower:.2f}s"
+            bar = "#" * int(40 * count / peak)
+            lines.append(f"  {label:>12} | {count:5d} {bar}")
+            lower = bound
+
+        for i, stall in enumerate(self.stalls if include_stacks else [], 1):
+            lines.append("\n" + "-" * 80)
+            lines.append(f"[Stall {i}] {stall.duration:.3f}s "
+                         f"task={stall.owner} agent={stall.agent}")
+            lines.append("".join(stall.stack))
+
+        lines.append("=" * 80)
+        return "\n".join(lines)
+
+    def save_report(self, path: Path) -> Path:
+        """
+        Write the report to a file.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Path to the saved file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.format_report() + "\n")
+        return path
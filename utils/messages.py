@@ -0,0 +1,196 @@
+"""
+Lightweight message records detached from autogen message objects.
+
+Records use __slots__ and interned source/type names, and content above a
+size threshold can be spilled to a PayloadStore on disk and read back on
+access, so finished tasks do not keep large tool outputs in memory.
+"""
+import hashlib
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from config import MESSAGE_SPILL_CHARS
+
+
+class PayloadStore:
+    """
+    Content-addressed directory of large message payloads.
+    """
+
+    def __init__(self, directory: Path, threshold: int = MESSAGE_SPILL_CHARS):
+        """
+        Initialize the store (the directory is created on the first write).
+
+        Args:
+            directory: Directory holding the payload files
+            threshold: Content longer than this many characters is stored here
+        """
+        self.directory = Path(directory)
+        self.threshold = threshold
+
+    def put(self, content: str) -> str:
+        """Store content and return the path of its payload file."""
+        data = content.encode("utf-8")
+        path = self.directory / f"{hashlib.sha1(data).hexdigest()}.txt"
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+        return str(path)
+
+
+class MessageRecord:
+    """A plain, serialisable copy of a conversation message."""
+
+    __slots__ = ("source", "type", "_content", "_payload_path", "prompt_tokens", "completion_tokens",
+                 "cached_tokens")
+
+    def __init__(
+        self,
+        source: str,
+        content: str,
+        type: str = "TextMessage",
+        store: Optional[PayloadStore] = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0
+    ):
+        """
+        Create a record.
+
+        Args:
+            source: Name of the speaker (interned)
+            content: Message text
+            type: Message class name (interned)
+            store: Where to spill content above the store's threshold
+                (default: keep all content in memory)
+            prompt_tokens: Prompt tokens used to produce the message
+            completion_tokens: Completion tokens used to produce the message
+            cached_tokens: Prompt tokens the provider served from its prompt cache
+        """
+        self.source = sys.intern(source)
+        self.type = sys.intern(type)
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cached_tokens = cached_tokens
+        if store is not None and len(content) > store.threshold:
+            self._content = None
+            self._payload_path = store.put(content)
+        else:
+            self._content = content
+            self._payload_path = None
+
+    @property
+    def content(self) -> str:
+        """Message text (read from disk when it was spilled)."""
+        if self._payload_path is None:
+            return self._content
+        return Path(self._payload_path).read_text(encoding="utf-8")
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the content is stored on disk."""
+        return self._payload_path is not None
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MessageRecord):
+            return NotImplemented
+        return (self.source, self.type, self.content) == (other.source, other.type, other.content)
+
+    def __repr__(self) -> str:
+        preview = "<on disk>" if self.spilled else repr(self._content[:40])
+        return f"MessageRecord(source={self.source!r}, type={self.type!r}, content={preview})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to a JSON-serialisable dictionary."""
+        return {
+            "source": self.source,
+            "type": self.type,
+            "content": self.content,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], store: Optional[PayloadStore] = None) -> "MessageRecord":
+        """Rebuild a record from a dictionary produced by to_dict()."""
+        return cls(
+            source=data.get("source", "Unknown"),
+            content=data.get("content", ""),
+            type=data.get("type", "TextMessage"),
+            store=store,
+            prompt_tokens=data.get("prompt_tokens", 0),
+            completion_tokens=data.get("completion_tokens", 0),
+            cached_tokens=data.get("cached_tokens", 0)
+        )
+
+
+def serialize_content(content: Any) -> str:
+    """
+    Safely serialize message content to string format.
+    Handles complex objects like FunctionCall that can't be JSON serialized.
+
+    Args:
+        content: The content to serialize
+
+    Returns:
+        String representation of the content
+    """
+    if isinstance(content, str):
+        return content
+    elif isinstance(content, (list, tuple)):
+        # Handle lists of objects (e.g., FunctionCall objects)
+        return "\n".join(str(item) for item in content)
+    else:
+        # Convert any other object to string
+        return str(content)
+
+
+def to_record(msg: Any, store: Optional[PayloadStore] = None) -> MessageRecord:
+    """
+    Convert an autogen message (or an existing record) to a MessageRecord.
+
+    Args:
+        msg: The message to convert
+        store: Where to spill large content (default: keep it in memory)
+
+    Returns:
+        MessageRecord with the message's source, type, content and token usage
+    """
+    if isinstance(msg, MessageRecord):
+        return msg
+    usage = getattr(msg, 'models_usage', None)
+    return MessageRecord(
+        source=getattr(msg, 'source', 'Unknown'),
+        content=serialize_content(getattr(msg, 'content', str(msg))),
+        type=type(msg).__name__,
+        store=store,
+        prompt_tokens=usage.prompt_tokens if usage else 0,
+        completion_tokens=usage.completion_tokens if usage else 0,
+        cached_tokens=getattr(usage, 'cached_tokens', 0) if usage else 0
+    )
+
+
+def token_usage(messages: Iterable[Any]) -> Dict[str, int]:
+    """
+    Sum the model token usage of messages (records or autogen messages).
+
+    Returns:
+        {"prompt_tokens": ..., "completion_tokens": ..., "cached_tokens": ...}
+    """
+    prompt_tokens = completion_tokens = cached = 0
+    for msg in messages:
+        if isinstance(msg, MessageRecord):
+            prompt_tokens += msg.prompt_tokens
+            completion_tokens += msg.completion_tokens
+            cached += msg.cached_tokens
+            continue
+        usage = getattr(msg, 'models_usage', None)
+        if usage:
+            prompt_tokens += usage.prompt_tokens
+            completion_tokens += usage.completion_tokens
+            cached += getattr(usage, 'cached_tokens', 0)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "cached_tokens": cached}
@@ -0,0 +1,105 @@
+"""
+Model client wrappers.
+
+ChatClientWrapper delegates every ChatCompletionClient method to an inner
+client, so cross-cutting behaviour (rate limiting, caching, accounting) can
+be layered on by overriding create()/create_stream() only.
+"""
+from typing import Any, AsyncGenerator, Optional, Sequence, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from config import OPENAI_BASE_URL
+
+
+def create_model_client(
+    model_name: str,
+    api_key: Optional[str],
+    base_url: Optional[str] = OPENAI_BASE_URL,
+    **kwargs: Any
+) -> ChatCompletionClient:
+    """
+    Create the OpenAI chat-completions client used by the system.
+
+    Args:
+        model_name: OpenAI model name (e.g., "gpt-4o")
+        api_key: OpenAI API key
+        base_url: Alternative endpoint (e.g. a local stub server)
+        **kwargs: Extra OpenAIChatCompletionClient arguments
+
+    Returns:
+        The model client (parallel tool calls enabled, cached prompt tokens
+        reported in each result's usage)
+    """
+    from openai import DefaultAsyncHttpxClient
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from utils.prompt_cache import PromptCacheClient, capture_cached_tokens
+
+    if base_url:
+        kwargs["base_url"] = base_url
+    # Cached prompt tokens are read from the raw responses of this HTTP client
+    http_client = kwargs.setdefault("http_client", DefaultAsyncHttpxClient())
+    capture_cached_tokens(http_client)
+    # Parallel tool calls from one response are executed concurrently by the agents
+    return PromptCacheClient(OpenAIChatCompletionClient(
+        model=model_name,
+        api_key=api_key,
+        parallel_tool_calls=True,
+        **kwargs
+    ))
+
+
+class ChatClientWrapper(ChatCompletionClient):
+    """A ChatCompletionClient that forwards all calls to another client."""
+
+    def __init__(self, inner: ChatCompletionClient):
+        self.inner = inner
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        return await self.inner.create(messages, **kwargs)
+
+    def create_stream(
+        self, messages: Sequence[LLMMessage], **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self.inner.create_stream(messages, **kwargs)
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+    def actual_usage(self):
+        return self.inner.actual_usage()
+
+    def total_usage(self):
+        return self.inner.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], **kwargs: Any) -> int:
+        return self.inner.count_tokens(messages, **kwargs)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], **kwargs: Any) -> int:
+        return self.inner.remaining_tokens(messages, **kwargs)
+
+    @property
+    def capabilities(self):
+        return self.inner.capabilities
+
+    @property
+    def model_info(self):
+        return self.inner.model_info
+
+
+def find_wrapper(client: ChatCompletionClient, wrapper_type: type) -> Optional[ChatClientWrapper]:
+    """
+    Find a wrapper of the given type anywhere in a client's wrapper chain.
+
+    Args:
+        client: Outermost client
+        wrapper_type: ChatClientWrapper subclass to look for
+
+    Returns:
+        The first matching wrapper (outermost first), or None
+    """
+    while isinstance(client, ChatClientWrapper):
+        if isinstance(client, wrapper_type):
+            return client
+        client = client.inner
+    return None
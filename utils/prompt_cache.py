@@ -0,0 +1,104 @@
+"""
+Prompt-cache instrumentation: cached prompt tokens per model call.
+
+Providers cache prompt prefixes (OpenAI: prompts of 1024+ tokens, in
+128-token steps) and report the reused part as
+usage.prompt_tokens_details.cached_tokens. autogen's RequestUsage drops that
+field, so a response hook on the OpenAI client's HTTP client
+(capture_cached_tokens(), installed by create_model_client) reads it from the
+raw JSON response, and PromptCacheClient returns a CacheUsage with it. The
+hook finds the call it belongs to through a context variable, so concurrent
+calls do not mix. Messages keep the CacheUsage as their models_usage, so the
+count ends up in the message records, the run stats and the results table
+(see utils/messages.py).
+
+The prompts are laid out for this cache: static instructions first, group
+and task data last (teams/group_team.py, orchestration/phase2_debate.py).
+"""
+import contextvars
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, RequestUsage
+
+from utils.model_client import ChatClientWrapper
+
+
+@dataclass
+class CacheUsage(RequestUsage):
+    """RequestUsage with the prompt tokens the provider served from its cache."""
+    cached_tokens: int = 0
+
+
+def cached_tokens(usage: Any) -> int:
+    """Cached prompt tokens of a models_usage (0 when the provider reported none)."""
+    return getattr(usage, "cached_tokens", 0) or 0
+
+
+# Usage of the call in progress, filled in from its HTTP response
+_call_usage: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "prompt_cache_call_usage", default=None
+)
+
+
+async def _read_usage(response) -> None:
+    """HTTP response hook: copy the usage of a JSON chat completion into the current call's usage."""
+    usage = _call_usage.get()
+    if usage is None or "application/json" not in response.headers.get("content-type", ""):
+        return  # not inside PromptCacheClient.create, or a streamed response
+    await response.aread()
+    try:
+        body = json.loads(response.content)
+    except ValueError:
+        return
+    if isinstance(body, dict):
+        usage.update(body.get("usage") or {})
+
+
+def capture_cached_tokens(http_client) -> None:
+    """Install the usage hook on the (httpx) HTTP client of an OpenAI client (once)."""
+    hooks = http_client.event_hooks
+    if _read_usage not in hooks["response"]:
+        hooks["response"].append(_read_usage)
+        http_client.event_hooks = hooks
+
+
+class PromptCacheClient(ChatClientWrapper):
+    """Model client that reports cached prompt tokens per call and in total."""
+
+    def __init__(self, inner: ChatCompletionClient):
+        super().__init__(inner)
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.cache_hits = 0
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        usage: Dict[str, Any] = {}
+        token = _call_usage.set(usage)
+        try:
+            result = await self.inner.create(messages, **kwargs)
+        finally:
+            _call_usage.reset(token)
+
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        self.calls += 1
+        self.prompt_tokens += result.usage.prompt_tokens
+        self.cached_tokens += cached
+        self.cache_hits += cached > 0
+        return result.model_copy(update={"usage": CacheUsage(
+            prompt_tokens=result.usage.prompt_tokens,
+            completion_tokens=result.usage.completion_tokens,
+            cached_tokens=cached
+        )})
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls, prompt tokens and how many of them came from the provider's cache."""
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_share": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            "calls_with_hits": self.cache_hits,
+        }
@@ -0,0 +1,109 @@
+"""
+Cross-process rate limiting through a local SQLite store.
+
+Every worker process opens the same database file, so a single token bucket
+bounds the request rate of the whole batch, not of each process.
+"""
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, Sequence, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from utils.model_client import ChatClientWrapper
+
+
+class SharedRateLimiter:
+    """
+    Token bucket shared by all processes using the same database file.
+    """
+
+    def __init__(self, db_path: Path, requests_per_minute: float, burst: int = 10, name: str = "llm"):
+        """
+        Initialize the limiter.
+
+        Args:
+            db_path: SQLite file shared by all workers
+            requests_per_minute: Sustained request rate across all processes
+            burst: Maximum number of requests that may be issued back-to-back
+            name: Bucket name (several limiters can share one file)
+        """
+        self.db_path = Path(db_path)
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst
+        self.name = name
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit "
+                "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _try_acquire(self) -> float:
+        """
+        Take one token if available.
+
+        Returns:
+            0 if a token was taken, otherwise the seconds to wait before retrying
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit WHERE name = ?", (self.name,)
+            ).fetchone()
+            now = time.time()
+            tokens, updated = row if row else (float(self.burst), now)
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+            wait = 0.0
+            if tokens >= 1.0:
+                tokens -= 1.0
+            else:
+                wait = (1.0 - tokens) / self.rate
+
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, tokens, now)
+            )
+            conn.execute("COMMIT")
+            return wait
+        finally:
+            conn.close()
+
+    async def acquire(self):
+        """Wait until a request may be issued."""
+        while True:
+            wait = await asyncio.to_thread(self._try_acquire)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class RateLimitedChatClient(ChatClientWrapper):
+    """Model client that takes a token from a SharedRateLimiter before every call."""
+
+    def __init__(self, inner: ChatCompletionClient, limiter: SharedRateLimiter):
+        super().__init__(inner)
+        self.limiter = limiter
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        await self.limiter.acquire()
+        return await self.inner.create(messages, **kwargs)
+
+    async def create_stream(
+        self, messages: Sequence[LLMMessage], **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        await self.limiter.acquire()
+        async for chunk in self.inner.create_stream(messages, **kwargs):
+            yield chunk
@@ -0,0 +1,201 @@
+"""
+Columnar export of run results.
+
+Each task becomes one flat row: the extracted answer, stop reason and turn
+count of every group, the final answer, the consensus flags, token usage and
+phase timings. Rows are written to Parquet (.parquet) or Arrow IPC
+(.arrow / .feather) with pyarrow, and read back as one numpy array per
+column for vectorised evaluation (see utils/evaluation.py).
+
+pyarrow is only needed for the columnar formats; JSONL rows (e.g. a batch
+results.jsonl) can be read without it.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.answers import answer_key
+
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+ARROW_SUFFIXES = {".arrow", ".feather", ".ipc"}
+
+GROUP_COLUMNS = ("answer", "stop_reason", "turns")
+
+# Free-text columns that scoring does not need (and that would be large as
+# fixed-width numpy strings)
+TEXT_COLUMNS = ("task", "gold", "final_answer", "log_directory", "error")
+
+
+def result_row(
+    result: Dict[str, Any],
+    task_id: Optional[str] = None,
+    gold: Any = None
+) -> Dict[str, Any]:
+    """
+    Flatten a MultiAgentDebateSystem.run() result into one table row.
+
+    Args:
+        result: Result dictionary returned by run() (or by the pipeline)
+        task_id: Dataset id of the task
+        gold: Gold answer, if the dataset has one
+
+    Returns:
+        Dictionary of scalar columns; per-group columns are named
+        "<group>_answer", "<group>_stop_reason" and "<group>_turns"
+    """
+    stats = result.get("stats") or {}
+    debate = result.get("phase2_debate")
+    row = {
+        "id": task_id,
+        "status": "error" if "error" in result else "ok",
+        "task": result.get("task", ""),
+        "gold": "" if gold is None else str(gold),
+        # Gold labels and solutions are reduced the same way, so they compare equal
+        "gold_answer": answer_key(gold),
+        "final_answer": result.get("final_answer") or "",
+        "answer": answer_key(result.get("final_answer")),
+        "consensus_reached": bool(debate.consensus_reached) if debate else False,
+        "converged": bool(debate.converged) if debate else False,
+        "degraded": bool(result.get("degraded", False)),
+        "debate_stop_reason": debate.stop_reason if debate else "",
+        "debate_turns": stats.get("debate_messages", 0),
+        "cache_hit": result.get("cache_hit") is not None,
+    }
+
+    group_turns = stats.get("group_turns", {})
+    for report in result.get("phase1_reports") or []:
+        row[f"{report.group_name}_answer"] = answer_key(report.solution)
+        row[f"{report.group_name}_stop_reason"] = report.stop_reason or ""
+        row[f"{report.group_name}_turns"] = group_turns.get(report.group_name, len(report.messages))
+
+    prompt_tokens = stats.get("prompt_tokens", 0)
+    completion_tokens = stats.get("completion_tokens", 0)
+    row.update({
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "model_calls": stats.get("model_calls", 0),
+        "cached_tokens": stats.get("cached_tokens", 0),
+        "phase1_seconds": stats.get("phase1_seconds", 0.0),
+        "phase2_seconds": stats.get("phase2_seconds", 0.0),
+        "total_seconds": stats.get("total_seconds", 0.0),
+        "log_directory": str(result["log_directory"]) if result.get("log_directory") else "",
+        "error": result.get("error", ""),
+    })
+    return row
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Parquet/Arrow export needs pyarrow: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def write_table(rows: Iterable[Dict[str, Any]], path: Path) -> Path:
+    """
+    Write result rows to a Parquet or Arrow IPC file (chosen by suffix).
+
+    Args:
+        rows: Rows from result_row (missing columns are filled with nulls)
+        path: Destination (.parquet, .arrow, .feather or .ipc)
+
+    Returns:
+        Path to the written file
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in PARQUET_SUFFIXES | ARROW_SUFFIXES:
+        raise ValueError(f"Unsupported table format {suffix!r} (use .parquet or .arrow)")
+
+    pa = _require_pyarrow()
+    rows = list(rows)
+    # Union of all columns: error rows have no per-group columns
+    names = dict.fromkeys(name for row in rows for name in row)
+    table = pa.table({name: [row.get(name) for row in rows] for name in names})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression="zstd")
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path, compression="zstd")
+    return path
+
+
+def _to_numpy(values: List[Any]) -> np.ndarray:
+    """Convert one column to numpy: strings to fixed-width unicode, nulls to ""/0."""
+    sample = next((v for v in values if v is not None), None)
+    if isinstance(sample, str) or sample is None:
+        return np.array(["" if v is None else v for v in values], dtype=str)
+    if isinstance(sample, bool):
+        return np.array([bool(v) for v in values], dtype=bool)
+    return np.array([0 if v is None else v for v in values], dtype=float)
+
+
+def _arrow_to_numpy(column) -> np.ndarray:
+    """Convert an Arrow column like _to_numpy, without going through Python objects."""
+    import pyarrow as pa
+    if pa.types.is_boolean(column.type):
+        return column.fill_null(False).to_numpy().astype(bool)
+    if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+        return column.fill_null(0).to_numpy().astype(float)
+    if pa.types.is_null(column.type):
+        return np.full(len(column), "", dtype=str)
+    return column.cast(pa.string()).fill_null("").to_numpy(zero_copy_only=False).astype(str)
+
+
+def read_table(
+    path: Path,
+    columns: Optional[List[str]] = None,
+    exclude: Iterable[str] = ()
+) -> Dict[str, np.ndarray]:
+    """
+    Read a results file into one numpy array per column.
+
+    Args:
+        path: Parquet, Arrow IPC or JSONL results file
+        columns: Columns to load (default: all)
+        exclude: Columns to skip, e.g. TEXT_COLUMNS when only scoring;
+            Parquet files do not even read them from disk
+
+    Returns:
+        Dictionary of column name -> numpy array (strings as fixed-width
+        unicode, numbers as float, flags as bool; nulls become "" or 0)
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in PARQUET_SUFFIXES | ARROW_SUFFIXES:
+        _require_pyarrow()
+        if suffix in PARQUET_SUFFIXES:
+            import pyarrow.parquet as pq
+            names = columns or pq.read_schema(path).names
+            table = pq.read_table(path, columns=[n for n in names if n not in exclude])
+        else:
+            import pyarrow.feather as feather
+            table = feather.read_table(path)
+            names = columns or table.column_names
+            table = table.select([n for n in names if n not in exclude])
+        return {name: _arrow_to_numpy(table.column(name)) for name in table.column_names}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    names = columns or list(dict.fromkeys(name for row in rows for name in row))
+    names = [name for name in names if name not in exclude]
+    return {name: _to_numpy([row.get(name) for row in rows]) for name in names}
+
+
+def group_names(columns: Iterable[str]) -> List[str]:
+    """Names of the groups that have per-group columns, in column order."""
+    columns = list(columns)
+    return [
+        name[:-len("_answer")] for name in columns
+        if name.endswith("_answer")
+        and all(f"{name[:-len('_answer')]}_{suffix}" in columns for suffix in GROUP_COLUMNS)
+    ]
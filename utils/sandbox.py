@@ -0,0 +1,316 @@
+"""
+Resource-governed code execution.
+
+SandboxedCodeExecutor is a drop-in replacement for LocalCommandLineCodeExecutor
+(same execute_code_blocks interface) that runs every script with per-execution
+limits, so one runaway script cannot starve the rest of the host:
+
+- CPU time (RLIMIT_CPU) and wall-clock timeout
+- Address space (RLIMIT_AS)
+- Number of processes and threads (RLIMIT_NPROC, best effort; see below)
+- Size of files written, including captured output (RLIMIT_FSIZE)
+
+The limits are applied by a small launcher that sets them and then execs the
+script (no preexec_fn, which is unsafe in this multithreaded process), and
+BLAS/OpenMP thread pools are pinned to one thread so they fit the process
+limit.
+
+RLIMIT_NPROC is checked by the kernel against all threads of the user, not
+of the script, so the limit is set to the user's current thread count plus
+max_processes. That makes it best effort: concurrent executions and other
+programs of the same user share the headroom, so a script may get more or
+fewer processes than max_processes, and the limit has no effect at all for
+root (or with CAP_SYS_RESOURCE). For a hard cap run the service as a
+dedicated unprivileged user or inside a container with a pids limit.
+
+Executions from all groups in a process share one bounded pool sized to the
+machine's cores, and each result ends with the script's resource usage
+(CPU, wall time, peak memory) so it shows up in the transcript.
+
+POSIX only (uses the resource module and os.wait4).
+"""
+import hashlib
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from autogen.coding import CodeBlock
+from autogen.coding.base import CommandLineCodeResult
+
+from config import (
+    CODE_EXECUTION_TIMEOUT,
+    SANDBOX_CPU_SECONDS,
+    SANDBOX_MEMORY_MB,
+    SANDBOX_MAX_PROCESSES,
+    SANDBOX_MAX_FILE_MB,
+    SANDBOX_MAX_OUTPUT_CHARS,
+    SANDBOX_CONCURRENCY
+)
+
+
+LANGUAGES = {
+    "python": [sys.executable],
+    "py": [sys.executable],
+    "sh": ["sh"],
+    "bash": ["bash"],
+    "shell": ["sh"],
+}
+
+# Exit code used by the `timeout` command on Linux
+TIMEOUT_EXIT_CODE = 124
+
+# Sets the rlimits given as arguments, then replaces itself with the command
+LIMITS_LAUNCHER = """
+import os, resource, sys
+cpu, memory, fsize, nproc = map(int, sys.argv[1:5])
+resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+resource.setrlimit(resource.RLIMIT_FSIZE, (fsize, fsize))
+resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+resource.setrlimit(resource.RLIMIT_NPROC, (nproc, nproc))
+os.execvp(sys.argv[5], sys.argv[5:])
+"""
+
+# Native thread pools of numpy/scipy, one thread each inside the sandbox
+SINGLE_THREAD_ENV = {
+    "OMP_NUM_THREADS": "1",
+    "OPENBLAS_NUM_THREADS": "1",
+    "MKL_NUM_THREADS": "1",
+    "NUMEXPR_NUM_THREADS": "1",
+}
+
+# Shared by every executor in the process
+_slots = threading.BoundedSemaphore(SANDBOX_CONCURRENCY)
+
+
+@dataclass
+class ResourceUsage:
+    """Resources consumed by one execution."""
+    cpu_seconds: float
+    wall_seconds: float
+    peak_memory_mb: Optional[float]
+    limit_hit: Optional[str] = None
+
+    def format(self) -> str:
+        """One-line summary for the transcript."""
+        memory = f"{self.peak_memory_mb:.1f} MB" if self.peak_memory_mb is not None else "n/a"
+        line = (f"Resources: cpu {self.cpu_seconds:.2f}s, wall {self.wall_seconds:.2f}s, "
+                f"peak memory {memory}")
+        if self.limit_hit:
+            line += f" ({self.limit_hit})"
+        return line
+
+
+def usage_cpu(rusage) -> float:
+    """User plus system CPU seconds of a rusage record."""
+    return rusage.ru_utime + rusage.ru_stime
+
+
+def _peak_rss_mb(pid: int) -> Optional[float]:
+    """
+    High-water RSS of a running process (Linux).
+
+    Sampled from /proc because ru_maxrss would include the memory of the
+    forked parent from before exec.
+    """
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _user_thread_count() -> int:
+    """
+    Number of threads owned by the current user (Linux; 0 elsewhere).
+
+    RLIMIT_NPROC is checked against the user's threads, not processes.
+    """
+    uid = os.getuid()
+    count = 0
+    try:
+        entries = list(os.scandir("/proc"))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.name.isdigit():
+            continue
+        try:
+            if entry.stat().st_uid == uid:
+                count += len(os.listdir(f"/proc/{entry.name}/task"))
+        except OSError:
+            continue  # exited meanwhile
+    return count
+
+
+class SandboxedCodeExecutor:
+    """
+    Runs code blocks in subprocesses under CPU, memory, process and file-size limits.
+    """
+
+    def __init__(
+        self,
+        work_dir: Path,
+        timeout: int = CODE_EXECUTION_TIMEOUT,
+        cpu_seconds: int = SANDBOX_CPU_SECONDS,
+        memory_mb: int = SANDBOX_MEMORY_MB,
+        max_processes: int = SANDBOX_MAX_PROCESSES,
+        max_file_mb: int = SANDBOX_MAX_FILE_MB,
+        max_output_chars: int = SANDBOX_MAX_OUTPUT_CHARS
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            work_dir: Directory where code files are written and run
+            timeout: Wall-clock limit per execution (seconds)
+            cpu_seconds: CPU-time limit per execution
+            memory_mb: Address-space limit per process
+            max_processes: Extra processes/threads a script may start
+                (best effort, not enforced for root)
+            max_file_mb: Largest file a script may write
+            max_output_chars: Output returned to the agent (the rest is cut)
+        """
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_processes = max_processes
+        self.max_file_mb = max_file_mb
+        self.max_output_chars = max_output_chars
+
+    def _launch_command(self, cmd: List[str], nproc: int) -> List[str]:
+        """Prefix a command with the launcher applying the rlimits."""
+        limits = [
+            self.cpu_seconds,
+            self.memory_mb * 1024 * 1024,
+            self.max_file_mb * 1024 * 1024,
+            # RLIMIT_NPROC counts all of the user's threads, so add the current ones
+            nproc,
+        ]
+        return [sys.executable, "-I", "-S", "-c", LIMITS_LAUNCHER, *map(str, limits), *cmd]
+
+    def execute_code_blocks(self, code_blocks: List[CodeBlock]) -> CommandLineCodeResult:
+        """
+        Execute code blocks in order, stopping at the first failure.
+
+        Args:
+            code_blocks: Code blocks to execute
+
+        Returns:
+            CommandLineCodeResult with exit code, output (including resource usage)
+            and the path of the first code file
+        """
+        outputs = []
+        code_file = None
+        exit_code = 0
+
+        for block in code_blocks:
+            lang = block.language.lower()
+            if lang not in LANGUAGES:
+                outputs.append(f"unknown language {lang}")
+                exit_code = 1
+                break
+
+            suffix = "py" if LANGUAGES[lang][0] == sys.executable else "sh"
+            code_hash = hashlib.md5(block.code.encode()).hexdigest()
+            path = self.work_dir / f"tmp_code_{code_hash}.{suffix}"
+            path.write_text(block.code, encoding="utf-8")
+            code_file = code_file or str(path)
+
+            with _slots:
+                exit_code, output, usage = self._run(LANGUAGES[lang] + [str(path)])
+            outputs.append(output + usage.format())
+            if exit_code != 0:
+                break
+
+        return CommandLineCodeResult(
+            exit_code=exit_code,
+            output="\n".join(outputs),
+            code_file=code_file
+        )
+
+    def _run(self, cmd: List[str]):
+        """Run one command under the limits; returns (exit code, output, usage)."""
+        nproc = _user_thread_count() + self.max_processes
+        with tempfile.TemporaryFile(dir=self.work_dir) as out:
+            started = time.perf_counter()
+            proc = subprocess.Popen(
+                self._launch_command(cmd, nproc),
+                cwd=self.work_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=out,
+                stderr=subprocess.STDOUT,
+                env={**os.environ, **SINGLE_THREAD_ENV},
+                start_new_session=True
+            )
+
+            # Poll with wait4 (rather than Popen.wait) to get the child's rusage
+            deadline = started + self.timeout
+            timed_out = False
+            peak = None
+            while True:
+                pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+                if pid:
+                    break
+                if time.perf_counter() > deadline:
+                    timed_out = True
+                    os.killpg(proc.pid, signal.SIGKILL)
+                    pid, status, rusage = os.wait4(proc.pid, 0)
+                    break
+                sample = _peak_rss_mb(proc.pid)
+                if sample is not None:
+                    peak = max(peak or 0.0, sample)
+                time.sleep(0.02)
+            wall = time.perf_counter() - started
+
+            exit_code = os.waitstatus_to_exitcode(status)
+            proc.returncode = exit_code
+            # Stop leftover children of the script
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+            out.seek(0)
+            raw = out.read(self.max_output_chars * 4 + 1)
+            total = out.seek(0, os.SEEK_END)
+
+        output = raw.decode("utf-8", errors="replace")
+        if len(output) > self.max_output_chars or total > len(raw):
+            output = output[:self.max_output_chars]
+            output += f"\n[output truncated: {total} bytes in total]"
+        if output and not output.endswith("\n"):
+            output += "\n"
+
+        limit_hit = None
+        if timed_out:
+            limit_hit = f"timed out after {self.timeout}s"
+            exit_code = TIMEOUT_EXIT_CODE
+        elif exit_code == -signal.SIGXCPU or (
+            exit_code == -signal.SIGKILL and usage_cpu(rusage) >= self.cpu_seconds
+        ):
+            limit_hit = f"CPU limit of {self.cpu_seconds}s exceeded"
+        elif exit_code == -signal.SIGXFSZ:
+            limit_hit = f"file size limit of {self.max_file_mb} MB exceeded"
+        elif exit_code != 0 and "MemoryError" in output:
+            limit_hit = f"memory limit of {self.memory_mb} MB exceeded"
+
+        usage = ResourceUsage(
+            cpu_seconds=usage_cpu(rusage),
+            wall_seconds=wall,
+            peak_memory_mb=peak,
+            limit_hit=limit_hit
+        )
+        return exit_code, output, usage
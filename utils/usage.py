@@ -0,0 +1,105 @@
+"""
+Per-task accounting of model calls.
+
+The models_usage of the messages a run produces misses speaker-selection
+calls, failed selection attempts and the inner iterations of tool calls.
+UsageCountingClient instead adds the usage of every create() to the
+TaskUsage of the task that made the call. The TaskUsage is found through a
+context variable: MultiAgentDebateSystem.run() and the pipeline workers set
+it with track_usage(), and the asyncio tasks autogen starts for a team run
+inherit it, so concurrent tasks sharing one client are counted separately.
+"""
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from utils.messages import token_usage
+from utils.model_client import ChatClientWrapper, find_wrapper
+
+
+@dataclass
+class TaskUsage:
+    """Model calls and tokens of one task."""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    def add(self, usage: Any):
+        """Add the usage of one model call (a RequestUsage)."""
+        self.calls += 1
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.cached_tokens += getattr(usage, "cached_tokens", 0) or 0
+
+    def add_messages(self, messages: Iterable[Any]):
+        """Add the usage recorded on messages (e.g. restored from a checkpoint)."""
+        usage = token_usage(messages)
+        self.prompt_tokens += usage["prompt_tokens"]
+        self.completion_tokens += usage["completion_tokens"]
+        self.cached_tokens += usage["cached_tokens"]
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "model_calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+        }
+
+
+# Usage of the task running in the current context
+_task_usage: contextvars.ContextVar[Optional[TaskUsage]] = contextvars.ContextVar(
+    "task_usage", default=None
+)
+
+
+@contextmanager
+def track_usage(usage: Optional[TaskUsage] = None) -> Iterator[TaskUsage]:
+    """
+    Count the model calls made in this context (and tasks started from it).
+
+    Args:
+        usage: Usage to add to (default: a new TaskUsage), e.g. one shared by
+            the pipeline jobs of a task
+
+    Yields:
+        The TaskUsage being filled in
+    """
+    usage = usage if usage is not None else TaskUsage()
+    token = _task_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _task_usage.reset(token)
+
+
+class UsageCountingClient(ChatClientWrapper):
+    """Model client that adds every call's usage to the current task's TaskUsage."""
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        result = await self.inner.create(messages, **kwargs)
+        usage = _task_usage.get()
+        if usage is not None:
+            usage.add(result.usage)
+        return result
+
+    async def create_stream(
+        self, messages: Sequence[LLMMessage], **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async for chunk in self.inner.create_stream(messages, **kwargs):
+            if isinstance(chunk, CreateResult):
+                usage = _task_usage.get()
+                if usage is not None:
+                    usage.add(chunk.usage)
+            yield chunk
+
+
+def count_usage(client: ChatCompletionClient) -> ChatCompletionClient:
+    """Wrap a client in a UsageCountingClient (unless its wrapper chain has one)."""
+    if find_wrapper(client, UsageCountingClient) is not None:
+        return client
+    return UsageCountingClient(client)
@@ -0,0 +1,171 @@
+"""
+Per-run code workspaces.
+
+Every Phase 1 run gets its own directory (with one subdirectory per group),
+so concurrent tasks never share scripts or data files. Directories are
+pre-created in a small pool, optionally placed on tmpfs (/dev/shm), and
+deleted in a background thread once the run is over.
+
+An optional shared data cache is linked into every group directory as
+``shared_data/`` (read-only files). Downloads are saved under the path of
+their source URL, ``downloads/<host>/<path>``, and promoted to the same path
+in the cache when the run is released, so the next run fetching that URL
+finds it in ``shared_data/<host>/<path>``. The cache is keyed by URL, not by
+file name: two tasks that each download a different ``data.csv`` never read
+each other's file. Files saved directly in ``downloads/`` have no known
+source and are not shared.
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Optional, Set
+
+from config import (
+    CODING_DIR,
+    WORKSPACE_USE_TMPFS,
+    WORKSPACE_POOL_SIZE,
+    WORKSPACE_KEEP,
+    SHARED_DATA_CACHE_DIR
+)
+
+
+TMPFS_ROOT = Path("/dev/shm")
+SHARED_DATA_LINK = "shared_data"
+DOWNLOADS_DIR = "downloads"
+
+
+class WorkspaceManager:
+    """
+    Hands out isolated run directories and cleans them up asynchronously.
+    """
+
+    def __init__(
+        self,
+        root: Path = CODING_DIR,
+        use_tmpfs: bool = WORKSPACE_USE_TMPFS,
+        pool_size: int = WORKSPACE_POOL_SIZE,
+        shared_cache_dir: Optional[Path] = SHARED_DATA_CACHE_DIR,
+        keep: bool = WORKSPACE_KEEP
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            root: Directory holding the run workspaces
+            use_tmpfs: Place workspaces on /dev/shm when available
+            pool_size: Number of empty run directories kept ready
+            shared_cache_dir: Directory of shared downloaded data (None disables it)
+            keep: Keep workspaces after the run instead of deleting them (debugging)
+        """
+        root = Path(root)
+        if use_tmpfs and TMPFS_ROOT.is_dir() and os.access(TMPFS_ROOT, os.W_OK):
+            # Distinct roots (e.g. <output>/coding/worker<N>/runs) stay distinct on tmpfs
+            digest = hashlib.sha1(str(root.resolve()).encode('utf-8')).hexdigest()[:12]
+            root = TMPFS_ROOT / "hierarchical-debate-mas" / f"{root.name}-{digest}"
+        self.root = root
+        self.pool_size = pool_size
+        self.keep = keep
+
+        self.shared_cache_dir = Path(shared_cache_dir) if shared_cache_dir else None
+        if self.shared_cache_dir:
+            self.shared_cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Pre-created on first acquire(), not at construction
+        self._ready = deque()
+        self._cleanups: Set[asyncio.Future] = set()
+
+    def _new_dir(self) -> Path:
+        path = self.root / f"run-{uuid.uuid4().hex[:12]}"
+        path.mkdir(parents=True)
+        return path
+
+    def _fill_pool(self):
+        while len(self._ready) < max(self.pool_size, 1):
+            self._ready.append(self._new_dir())
+
+    def acquire(self) -> Path:
+        """
+        Take an empty run directory.
+
+        Returns:
+            Path to a directory used by exactly one run
+        """
+        if not self._ready:
+            self._fill_pool()
+        return self._ready.popleft()
+
+    def group_dir(self, run_dir: Path, group_name: str) -> Path:
+        """
+        Create a group's subdirectory in a run workspace.
+
+        Args:
+            run_dir: Directory returned by acquire()
+            group_name: Name of the group
+
+        Returns:
+            The group's work directory
+        """
+        path = run_dir / group_name.lower()
+        (path / DOWNLOADS_DIR).mkdir(parents=True, exist_ok=True)
+        if self.shared_cache_dir:
+            link = path / SHARED_DATA_LINK
+            if not link.exists():
+                link.symlink_to(self.shared_cache_dir.resolve(), target_is_directory=True)
+        return path
+
+    def _promote_downloads(self, run_dir: Path):
+        """Copy newly downloaded files into the shared cache (same <host>/<path>) as read-only files."""
+        if not self.shared_cache_dir:
+            return
+        for downloads in run_dir.glob(f"*/{DOWNLOADS_DIR}"):
+            for path in downloads.rglob("*"):
+                relative = path.relative_to(downloads)
+                # Only files under a <host>/ directory can be attributed to a URL
+                if len(relative.parts) < 2 or "." not in relative.parts[0] or not path.is_file():
+                    continue
+                target = self.shared_cache_dir / relative
+                if target.exists():
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}")
+                shutil.copy2(path, tmp)
+                tmp.chmod(0o444)
+                tmp.replace(target)
+
+    def _dispose(self, run_dir: Path):
+        """Blocking part of release(): promote downloads, then delete."""
+        self._promote_downloads(run_dir)
+        if not self.keep:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    def release(self, run_dir: Path):
+        """
+        Return a run directory; it is cleaned up in a background thread.
+
+        Must be called from the event loop thread. The directory is renamed
+        first so the name can never be handed out again while deletion runs.
+        """
+        trash = run_dir.with_name(f".trash-{run_dir.name}")
+        try:
+            run_dir.rename(trash)
+        except OSError:
+            trash = run_dir
+
+        future = asyncio.get_running_loop().run_in_executor(None, self._dispose, trash)
+        self._cleanups.add(future)
+        future.add_done_callback(self._cleanups.discard)
+        self._fill_pool()
+
+    async def wait_cleanup(self):
+        """Wait for all pending background cleanups."""
+        if self._cleanups:
+            await asyncio.gather(*list(self._cleanups), return_exceptions=True)
+
+    def cleanup(self):
+        """Remove the unused pre-created directories."""
+        while self._ready:
+            shutil.rmtree(self._ready.popleft(), ignore_errors=True)